@@ -0,0 +1,65 @@
+import atexit
+import functools
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Optional
+
+from agents.state import AgentState
+
+##### Node execution #####
+# LangGraph already runs the nodes of one superstep (the analyst fan-out after
+# market_data) on a thread pool sized by the "max_concurrency" config key, and
+# applies their writes in a fixed order once all of them finish. That suits
+# nodes that wait on I/O or the LLM. CPU-bound pandas nodes would hold the GIL
+# and serialise the branches, so they are moved to a process pool instead.
+
+Node = Callable[[AgentState], Dict]
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared process pool, sized by HEDGE_FUND_PROCESS_WORKERS."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            workers = os.getenv("HEDGE_FUND_PROCESS_WORKERS")
+            _process_pool = ProcessPoolExecutor(max_workers=int(workers) if workers else None)
+            atexit.register(_process_pool.shutdown)
+    return _process_pool
+
+
+def process_node(node: Node, data_keys: Optional[Iterable[str]] = None) -> Node:
+    """
+    Wrap a graph node so it runs in the shared process pool
+
+    The node must be a module-level function, and the state it receives and
+    the update it returns must be picklable. The calling graph thread blocks
+    on the result, so other branches of the superstep keep running meanwhile.
+
+    Args:
+        node: Graph node function
+        data_keys: Keys of state["data"] the node reads; only these are sent
+            to the worker process. Defaults to the whole data dict.
+
+    Returns:
+        Node function with the same signature and result
+    """
+    data_keys = tuple(data_keys) if data_keys is not None else None
+
+    @functools.wraps(node)
+    def run(state: AgentState) -> Dict:
+        data = state["data"]
+        if data_keys is not None:
+            data = {key: data[key] for key in data_keys if key in data}
+        worker_state = {
+            "messages": list(state["messages"]),
+            "agent_messages": dict(state.get("agent_messages") or {}),
+            "data": data,
+            "metadata": state["metadata"],
+        }
+        return get_process_pool().submit(node, worker_state).result()
+
+    return run
@@ -1,19 +1,6 @@
 from langchain_core.messages import HumanMessage
-import google.generativeai as genai
-from agents.state import AgentState, show_agent_reasoning
+from agents.state import AgentState, agent_message_update, show_agent_reasoning
 import json
-import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-# Configure the Gemini API using environment variable
-api_key = os.getenv('GOOGLE_GEMINI_API_KEY')
-if not api_key:
-    raise ValueError("GOOGLE_GEMINI_API_KEY environment variable not set")
-genai.configure(api_key=api_key)
-model = genai.GenerativeModel('gemini-pro')
 
 ##### Fundamental Agent #####
 def fundamentals_agent(state: AgentState):
@@ -128,7 +115,4 @@ def fundamentals_agent(state: AgentState):
     if show_reasoning:
         show_agent_reasoning(message_content, "Fundamental Analysis Agent")
     
-    return {
-        "messages": [message],
-        "data": data,
-    }
\ No newline at end of file
+    return agent_message_update(message)
\ No newline at end of file
@@ -1,49 +1,50 @@
-import google.generativeai as genai
 from agents.state import AgentState
-from datetime import datetime
-import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-# Configure the Gemini API using environment variable
-genai.configure(api_key=os.getenv('GOOGLE_GEMINI_API_KEY'))
-model = genai.GenerativeModel('gemini-pro')
+from agents.streaming import StreamingTechnicals
+from agents.technicals import lookback_days, required_history
+from tools.point_in_time import MarketData
+from datetime import datetime, timedelta
 
 def market_data_agent(state: AgentState):
     """Responsible for gathering and preprocessing market data"""
-    messages = state["messages"]
     data = state["data"]
 
     # Set default dates
     end_date = data["end_date"] or datetime.now().strftime('%Y-%m-%d')
     if not data["start_date"]:
-        # Calculate 3 months before end_date
+        # Go back far enough to warm up every technical indicator
         end_date_obj = datetime.strptime(end_date, '%Y-%m-%d')
-        start_date = end_date_obj.replace(month=end_date_obj.month - 3) if end_date_obj.month > 3 else \
-            end_date_obj.replace(year=end_date_obj.year - 1, month=end_date_obj.month + 9)
+        start_date = end_date_obj - timedelta(days=lookback_days(required_history()))
         start_date = start_date.strftime('%Y-%m-%d')
     else:
         start_date = data["start_date"]
 
-    # Use the manually input data
-    prices = data["manual_data"]["prices"]
-    financial_metrics = data["manual_data"]["financial_metrics"]
-    insider_trades = data["manual_data"]["insider_trades"]
-    market_cap = data["manual_data"]["market_cap"]
+    # Use the manually input data as known on end_date, so no agent sees
+    # prices or filings from after the decision date
+    manual_data = MarketData.wrap(data["manual_data"]).as_of(end_date)
+
+    # Prices from start_date, reaching further back when that is fewer bars
+    # than the indicators need to warm up
+    prices = manual_data["prices"]
+    window = prices.slice(start_date, None)
+    warmup = prices.tail(required_history())
+    prices = window if len(window) > len(warmup) else warmup
 
-    # Update the state with the data
-    data.update({
-        "prices": prices,
-        "financial_metrics": financial_metrics,
-        "insider_trades": insider_trades,
-        "market_cap": market_cap,
-        "start_date": start_date,
-        "end_date": end_date
-    })
+    # Technical features streamed over the whole history as of end_date, as
+    # a Backtester keeps them, so a date gets the same technical signal live
+    # and in a backtest (EMA, ADX and ATR depend on where they are seeded)
+    technical_features = manual_data.get("technical_features")
+    if technical_features is None and len(manual_data["prices"]):
+        technical_features = StreamingTechnicals.from_prices(manual_data["prices"]).features()
 
+    # Return only the new keys; the datasets are shared by reference
     return {
-        "messages": messages,
-        "data": data,
-    }
\ No newline at end of file
+        "data": {
+            "prices": prices,
+            "financial_metrics": manual_data["financial_metrics"],
+            "insider_trades": manual_data["insider_trades"],
+            "market_cap": manual_data["market_cap"],
+            "technical_features": technical_features,
+            "start_date": start_date,
+            "end_date": end_date
+        }
+    }
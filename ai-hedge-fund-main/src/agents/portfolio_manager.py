@@ -1,17 +1,10 @@
 from langchain_core.messages import HumanMessage
-import google.generativeai as genai
 import json
 import os
-from dotenv import load_dotenv
 
-from agents.state import AgentState, show_agent_reasoning
-
-# Load environment variables
-load_dotenv()
-
-# Configure the Gemini API using environment variable
-genai.configure(api_key=os.getenv('GOOGLE_GEMINI_API_KEY'))
-model = genai.GenerativeModel('gemini-pro')
+from agents.state import AgentState, agent_message_update, get_agent_message, show_agent_reasoning
+from tools.llm import get_decision_model
+from tools.price_store import PriceSeries
 
 def normalize_confidence(value):
     """Normalize confidence value to be between 0 and 1"""
@@ -26,28 +19,112 @@ def normalize_confidence(value):
         pass
     return 0.0
 
+def signal_confidence(value):
+    """Normalize an analyst confidence that may be a fraction, a percentage or a "NN%" string"""
+    if isinstance(value, (int, float)) and value > 1:
+        value = value / 100
+    return normalize_confidence(value)
+
+##### Decision Policy #####
+class DecisionPolicy:
+    """
+    Deterministic fast path for decisions the LLM has no real say in.
+
+    When the risk manager calls for a full position (position_size 1.0) or an
+    exit (0.0) and at least `min_agreement` analyst signals agree, the prompt
+    already binds the LLM to the risk action and size. The decision is then
+    computed directly: buy as many shares as cash allows, or sell the whole
+    position. Everything else is escalated to the LLM.
+    """
+
+    def __init__(self, enabled: bool = True, min_agreement: int = 3):
+        self.enabled = enabled
+        self.min_agreement = min_agreement
+
+    def decide(self, risk: dict, signals: dict, portfolio: dict, current_price):
+        """
+        Return a rule-based decision, or None to escalate to the LLM
+
+        Args:
+            risk: Parsed risk management output
+            signals: Dict of agent name -> parsed analyst signal
+            portfolio: Portfolio with cash and stock
+            current_price: Latest close, or None if unknown
+        """
+        if not self.enabled or not risk:
+            return None
+        position_size = risk.get("position_size")
+        if position_size == 1.0 and risk.get("bullish_count", 0) >= self.min_agreement:
+            if not current_price or current_price <= 0:
+                return None
+            quantity = int(portfolio["cash"] // current_price)
+            action = "buy" if quantity > 0 else "hold"
+            reasoning = (f"Rule-based: {risk['bullish_count']} of {risk.get('signal_count', len(signals))} "
+                         f"signals bullish and risk management allows a full position; "
+                         f"buying the maximum affordable quantity at {current_price:.2f}")
+        elif position_size == 0.0 and risk.get("bearish_count", 0) >= self.min_agreement:
+            quantity = int(portfolio["stock"])
+            action = "sell" if quantity > 0 else "hold"
+            reasoning = (f"Rule-based: {risk['bearish_count']} of {risk.get('signal_count', len(signals))} "
+                         f"signals bearish and risk management calls for an exit; "
+                         f"selling the entire position")
+        else:
+            return None
+
+        return {
+            "action": action,
+            "quantity": quantity if action != "hold" else 0,
+            "confidence": normalize_confidence(risk.get("confidence", 0) / 100),
+            "agent_signals": [
+                {
+                    "agent": name,
+                    "signal": signal.get("signal", "neutral"),
+                    "confidence": signal_confidence(signal.get("confidence", 0))
+                }
+                for name, signal in signals.items()
+            ],
+            "reasoning": reasoning,
+            "decision_path": "rule"
+        }
+
+def policy_from_env() -> DecisionPolicy:
+    """
+    Build the default policy from DECISION_FAST_PATH (false disables it) and
+    DECISION_FAST_PATH_MIN_AGREEMENT (analyst signals that must agree).
+    """
+    return DecisionPolicy(
+        enabled=os.getenv('DECISION_FAST_PATH', 'true').lower() != 'false',
+        min_agreement=int(os.getenv('DECISION_FAST_PATH_MIN_AGREEMENT', 3))
+    )
+
+def parse_message(message):
+    """Parse a JSON message, returning an empty dict if it is not valid JSON"""
+    try:
+        return json.loads(message.content)
+    except (json.JSONDecodeError, TypeError):
+        return {}
+
+def latest_close(prices):
+    """Most recent close from the state's price data, or None if unavailable"""
+    if prices is None or not len(prices):
+        return None
+    # market_data_agent hands over a sorted PriceSeries; raw records are parsed
+    if not isinstance(prices, PriceSeries):
+        prices = PriceSeries.from_records(prices)
+    return float(prices.close[-1])
+
 ##### Portfolio Management Agent #####
 def portfolio_management_agent(state):
     """Makes final trading decisions and generates orders"""
     show_reasoning = state["metadata"]["show_reasoning"]
     portfolio = state["data"]["portfolio"]
 
-    def get_agent_message(messages, agent_name):
-        """Safely get agent message"""
-        try:
-            msg = next((msg for msg in messages if msg.name == agent_name), None)
-            if msg:
-                return msg
-        except:
-            pass
-        return None
-
     # Get all agent messages
-    technical_message = get_agent_message(state["messages"], "technical_analyst") or \
-                       get_agent_message(state["messages"], "technical_analyst_agent")
-    fundamentals_message = get_agent_message(state["messages"], "fundamentals_agent")
-    sentiment_message = get_agent_message(state["messages"], "sentiment_agent")
-    risk_message = get_agent_message(state["messages"], "risk_management_agent")
+    technical_message = get_agent_message(state, "technical_analyst") or \
+                       get_agent_message(state, "technical_analyst_agent")
+    fundamentals_message = get_agent_message(state, "fundamentals_agent")
+    sentiment_message = get_agent_message(state, "sentiment_agent")
+    risk_message = get_agent_message(state, "risk_management_agent")
 
     # Create default message if any are missing
     default_message = HumanMessage(
@@ -63,6 +140,27 @@ def portfolio_management_agent(state):
     sentiment_message = sentiment_message or default_message
     risk_message = risk_message or default_message
 
+    # Use the typed technical signal when available instead of parsing its message
+    technical_signal = state["data"].get("technical_signal")
+
+    # Clear-cut risk calls are decided by rule; only ambiguous cases reach the LLM
+    policy = state["metadata"].get("decision_policy") or policy_from_env()
+    rule_decision = policy.decide(
+        parse_message(risk_message),
+        {
+            "technical_analyst": technical_signal.to_dict() if technical_signal else parse_message(technical_message),
+            "fundamentals_agent": parse_message(fundamentals_message),
+            "sentiment_agent": parse_message(sentiment_message),
+        },
+        portfolio,
+        latest_close(state["data"].get("prices"))
+    )
+    if rule_decision is not None:
+        return emit_decision(state, json.dumps(rule_decision), show_reasoning)
+
+    # The technical report is only rendered to JSON for the prompt
+    technical_content = technical_signal.to_json() if technical_signal else technical_message.content
+
     # Create the prompt
     system_prompt = """You are a portfolio manager making final trading decisions.
     Your job is to make a trading decision based on the team's analysis while strictly adhering
@@ -108,7 +206,7 @@ def portfolio_management_agent(state):
 
     human_prompt = f"""Based on the team's analysis below, make your trading decision.
 
-    Technical Analysis Trading Signal: {technical_message.content}
+    Technical Analysis Trading Signal: {technical_content}
     Fundamental Analysis Trading Signal: {fundamentals_message.content}
     Sentiment Analysis Trading Signal: {sentiment_message.content}
     Risk Management Trading Signal: {risk_message.content}
@@ -125,7 +223,7 @@ def portfolio_management_agent(state):
     You can only sell if you have shares in the portfolio to sell."""
 
     # Generate response using Gemini
-    response = model.generate_content([system_prompt, human_prompt])
+    response = get_decision_model().generate_content([system_prompt, human_prompt])
     result = response.text
 
     # Parse the response and normalize confidence values
@@ -137,6 +235,7 @@ def portfolio_management_agent(state):
             for signal in decision['agent_signals']:
                 if 'confidence' in signal:
                     signal['confidence'] = normalize_confidence(signal['confidence'])
+        decision['decision_path'] = "llm"
         result = json.dumps(decision)
     except json.JSONDecodeError:
         result = json.dumps({
@@ -144,9 +243,14 @@ def portfolio_management_agent(state):
             "quantity": 0,
             "confidence": 0.5,
             "reasoning": "Error parsing portfolio management decision",
-            "agent_signals": []
+            "agent_signals": [],
+            "decision_path": "llm"
         })
 
+    return emit_decision(state, result, show_reasoning)
+
+def emit_decision(state, result: str, show_reasoning: bool):
+    """Wrap a decision in the portfolio management message"""
     # Create the portfolio management message
     message = HumanMessage(
         content=result,
@@ -157,4 +261,4 @@ def portfolio_management_agent(state):
     if show_reasoning:
         show_agent_reasoning(message.content, "Portfolio Management Agent")
 
-    return {"messages": state["messages"] + [message]}
\ No newline at end of file
+    return agent_message_update(message)
\ No newline at end of file
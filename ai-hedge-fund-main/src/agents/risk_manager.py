@@ -2,7 +2,7 @@ import math
 
 from langchain_core.messages import HumanMessage
 
-from agents.state import AgentState, show_agent_reasoning
+from agents.state import AgentState, agent_message_update, get_agent_message, show_agent_reasoning
 from tools.api import prices_to_df
 
 import json
@@ -23,13 +23,20 @@ def risk_management_agent(state):
     show_reasoning = state["metadata"]["show_reasoning"]
     
     # Get the signals from other agents
-    messages = state["messages"]
     agent_signals = {}
     
-    for msg in messages:
-        if msg.name in ["technical_analyst", "fundamentals_agent", "sentiment_agent"]:
-            signal_data = json.loads(msg.content)
-            agent_signals[msg.name] = signal_data
+    for agent_name in ["fundamentals_agent", "sentiment_agent"]:
+        msg = get_agent_message(state, agent_name)
+        if msg is not None:
+            agent_signals[agent_name] = json.loads(msg.content)
+
+    # The technical signal is read from state data rather than re-parsed
+    technical_signal = state["data"].get("technical_signal")
+    if technical_signal is not None:
+        agent_signals["technical_analyst"] = {
+            "signal": technical_signal.signal,
+            "confidence": technical_signal.confidence
+        }
     
     # Risk assessment based on agent signals
     bearish_count = sum(1 for signal in agent_signals.values() if signal['signal'] == 'bearish')
@@ -63,6 +70,9 @@ def risk_management_agent(state):
         "signal": signal,
         "confidence": confidence * 100,  # Convert to percentage
         "position_size": position_size,
+        "bullish_count": bullish_count,
+        "bearish_count": bearish_count,
+        "signal_count": len(agent_signals),
         "reasoning": reasoning
     }
     
@@ -76,5 +86,5 @@ def risk_management_agent(state):
     if show_reasoning:
         show_agent_reasoning(message.content, "Risk Management Agent")
     
-    return {"messages": state["messages"] + [message]}
+    return agent_message_update(message)
 
@@ -1,7 +1,7 @@
 from langchain_core.messages import HumanMessage
 import json
 
-from agents.state import show_agent_reasoning
+from agents.state import agent_message_update, show_agent_reasoning
 
 def sentiment_agent(state):
     """Analyzes market sentiment and news impact"""
@@ -70,4 +70,4 @@ def sentiment_agent(state):
     if show_reasoning:
         show_agent_reasoning(message.content, "Sentiment Analysis Agent")
     
-    return {"messages": state["messages"] + [message]}
+    return agent_message_update(message)
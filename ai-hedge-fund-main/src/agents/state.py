@@ -1,9 +1,9 @@
-from typing import Annotated, Any, Dict, Sequence, TypedDict
+from dataclasses import dataclass, field
+from typing import Annotated, Any, Dict, List, Optional, Sequence, TypedDict
 
 import operator
 from langchain_core.messages import BaseMessage
 
-
 import json
 
 
@@ -13,10 +13,67 @@ def merge_dicts(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
 # Define agent state
 class AgentState(TypedDict):
     messages: Annotated[Sequence[BaseMessage], operator.add]
+    # Latest message of each agent, keyed by message name
+    agent_messages: Annotated[Dict[str, BaseMessage], merge_dicts]
     data: Annotated[Dict[str, Any], merge_dicts]
     metadata: Annotated[Dict[str, Any], merge_dicts]
 
 
+def agent_message_update(message: BaseMessage) -> Dict[str, Any]:
+    """
+    State update publishing an agent's message
+
+    Nodes return only their new message: the messages reducer appends it to
+    the history, and agent_messages keeps it under the agent's name.
+    """
+    return {"messages": [message], "agent_messages": {message.name: message}}
+
+
+def get_agent_message(state: AgentState, agent_name: str) -> Optional[BaseMessage]:
+    """Latest message of an agent, or None if it has not run"""
+    return (state.get("agent_messages") or {}).get(agent_name)
+
+
+@dataclass
+class AgentSignal:
+    """
+    Typed agent output carried in AgentState["data"].
+
+    Downstream agents read the fields directly instead of parsing the agent's
+    message. Metrics are last values only; history holds optional downsampled
+    series. The JSON rendering used for messages and prompts is built on first
+    use and cached.
+    """
+    signal: str
+    confidence: float
+    metrics: Dict[str, float] = field(default_factory=dict)
+    components: Dict[str, "AgentSignal"] = field(default_factory=dict)
+    history: Dict[str, List[float]] = field(default_factory=dict)
+    reasoning: Optional[str] = None
+    _json: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            "signal": self.signal,
+            "confidence": f"{round(self.confidence * 100)}%",
+        }
+        if self.metrics:
+            result["metrics"] = self.metrics
+        if self.history:
+            result["history"] = self.history
+        if self.components:
+            result["strategy_signals"] = {
+                name: component.to_dict() for name, component in self.components.items()
+            }
+        if self.reasoning is not None:
+            result["reasoning"] = self.reasoning
+        return result
+
+    def to_json(self) -> str:
+        if self._json is None:
+            self._json = json.dumps(self.to_dict())
+        return self._json
+
 
 def show_agent_reasoning(output, agent_name):
     print(f"\n{'=' * 10} {agent_name.center(28)} {'=' * 10}")
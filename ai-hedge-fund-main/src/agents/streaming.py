@@ -0,0 +1,402 @@
+import math
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from agents.technicals import calculate_hurst_exponent, required_history
+
+##### Streaming (incremental) indicators #####
+# Each class holds the running state of one indicator from agents/technicals.py
+# and accepts one new bar per update() call in O(1), returning the same value
+# the batch function would produce for the last row of the series seen so far.
+
+NAN = float("nan")
+
+
+class EMAState:
+    """
+    Exponential moving average, matching ewm(span=span, adjust=False).mean()
+    as used by calculate_ema and calculate_macd.
+    """
+
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = NAN
+
+    def update(self, value: float) -> float:
+        if math.isnan(value):
+            return self.value
+        if math.isnan(self.value):
+            self.value = float(value)
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+
+class AdjustedEWMState:
+    """
+    Bias-adjusted exponential moving average, matching ewm(span=span).mean()
+    (adjust=True, ignore_na=False) as used by calculate_adx.
+    """
+
+    def __init__(self, span: int):
+        self.decay = 1.0 - 2.0 / (span + 1.0)
+        self._weighted_sum = 0.0
+        self._weight = 0.0
+        self.value = NAN
+
+    def update(self, value: float) -> float:
+        # Older observations decay by position even when this bar is missing
+        self._weighted_sum *= self.decay
+        self._weight *= self.decay
+        if not math.isnan(value):
+            self._weighted_sum += value
+            self._weight += 1.0
+            self.value = self._weighted_sum / self._weight
+        return self.value
+
+
+class MACDState:
+    """MACD line and signal line, matching calculate_macd."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = EMAState(fast)
+        self.slow = EMAState(slow)
+        self.signal = EMAState(signal)
+
+    def update(self, close: float) -> Tuple[float, float]:
+        macd_line = self.fast.update(close) - self.slow.update(close)
+        return macd_line, self.signal.update(macd_line)
+
+
+class RollingStats:
+    """
+    Rolling count, sum, mean, std, skew and kurtosis over a fixed window,
+    matching pandas rolling(window) with the default min_periods=window.
+
+    Power sums are kept relative to a shift point, which is reset to the window
+    mean every `window` updates so the sums do not drift or lose precision
+    as prices move away from where the series started.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self._values = deque()
+        self._nan_count = 0
+        self._updates = 0
+        self._rebase(0.0)
+
+    def _rebase(self, shift: float) -> None:
+        self._shift = shift
+        self._sums = [0.0, 0.0, 0.0, 0.0]
+        for value in self._values:
+            self._add(value, 1.0)
+
+    def _add(self, value: float, sign: float) -> None:
+        if math.isnan(value):
+            self._nan_count += int(sign)
+            return
+        d = value - self._shift
+        d2 = d * d
+        self._sums[0] += sign * d
+        self._sums[1] += sign * d2
+        self._sums[2] += sign * d2 * d
+        self._sums[3] += sign * d2 * d2
+
+    def update(self, value: float) -> "RollingStats":
+        value = float(value)
+        self._values.append(value)
+        self._add(value, 1.0)
+        if len(self._values) > self.window:
+            self._add(self._values.popleft(), -1.0)
+
+        self._updates += 1
+        if self._updates % self.window == 0 and self.ready:
+            self._rebase(self.mean)
+        return self
+
+    @property
+    def ready(self) -> bool:
+        return len(self._values) == self.window and self._nan_count == 0
+
+    def _moments(self) -> Tuple[float, float, float, float]:
+        """Return (A, B, C, D): mean and central moments of the shifted values"""
+        n = float(self.window)
+        s1, s2, s3, s4 = (s / n for s in self._sums)
+        a = s1
+        b = s2 - a * a
+        c = s3 - a * a * a - 3 * a * b
+        d = s4 - a ** 4 - 6 * b * a * a - 4 * c * a
+        return a, b, c, d
+
+    @property
+    def sum(self) -> float:
+        if not self.ready:
+            return NAN
+        return self.window * self._shift + self._sums[0]
+
+    @property
+    def mean(self) -> float:
+        if not self.ready:
+            return NAN
+        return self._shift + self._sums[0] / self.window
+
+    @property
+    def std(self) -> float:
+        if not self.ready or self.window < 2:
+            return NAN
+        n = self.window
+        variance = (self._sums[1] - self._sums[0] * self._sums[0] / n) / (n - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    @property
+    def skew(self) -> float:
+        if not self.ready or self.window < 3:
+            return NAN
+        n = float(self.window)
+        _, b, c, _ = self._moments()
+        if b <= 1e-14:
+            return NAN
+        return math.sqrt(n * (n - 1)) * c / ((n - 2) * b ** 1.5)
+
+    @property
+    def kurt(self) -> float:
+        if not self.ready or self.window < 4:
+            return NAN
+        n = float(self.window)
+        _, b, _, d = self._moments()
+        if b <= 1e-14:
+            return NAN
+        k = (n * n - 1) * d / (b * b) - 3 * (n - 1) ** 2
+        return k / ((n - 2) * (n - 3))
+
+
+class ReturnsState:
+    """Close-to-close percentage return, matching close.pct_change()."""
+
+    def __init__(self):
+        self._prev_close: Optional[float] = None
+
+    def update(self, close: float) -> float:
+        prev, self._prev_close = self._prev_close, close
+        if prev is None or math.isnan(prev) or math.isnan(close):
+            return NAN
+        if prev == 0:
+            return math.copysign(math.inf, close) if close else NAN
+        return close / prev - 1
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    """Float division with pandas semantics for zero denominators"""
+    if denominator == 0:
+        if numerator == 0 or math.isnan(numerator):
+            return NAN
+        return math.copysign(math.inf, numerator)
+    return numerator / denominator
+
+
+class RSIState:
+    """Relative Strength Index over simple rolling means, matching calculate_rsi."""
+
+    def __init__(self, period: int = 14):
+        self._gains = RollingStats(period)
+        self._losses = RollingStats(period)
+        self._prev_close: Optional[float] = None
+
+    def update(self, close: float) -> float:
+        delta = NAN if self._prev_close is None else close - self._prev_close
+        self._prev_close = close
+        # The batch version turns missing deltas into zero gains and losses
+        self._gains.update(delta if delta > 0 else 0.0)
+        self._losses.update(-delta if delta < 0 else 0.0)
+        rs = _ratio(self._gains.mean, self._losses.mean)
+        return 100 - 100 / (1 + rs)
+
+
+def _true_range(high: float, low: float, prev_close: Optional[float]) -> float:
+    ranges = [high - low]
+    if prev_close is not None:
+        ranges += [abs(high - prev_close), abs(low - prev_close)]
+    ranges = [r for r in ranges if not math.isnan(r)]
+    return max(ranges) if ranges else NAN
+
+
+class ATRState:
+    """Average True Range over a simple rolling mean, matching calculate_atr."""
+
+    def __init__(self, period: int = 14):
+        self._true_ranges = RollingStats(period)
+        self._prev_close: Optional[float] = None
+
+    def update(self, high: float, low: float, close: float) -> float:
+        self._true_ranges.update(_true_range(high, low, self._prev_close))
+        self._prev_close = close
+        return self._true_ranges.mean
+
+
+class ADXState:
+    """Average Directional Index with +DI and -DI, matching calculate_adx."""
+
+    def __init__(self, period: int = 14):
+        self._tr = AdjustedEWMState(period)
+        self._plus_dm = AdjustedEWMState(period)
+        self._minus_dm = AdjustedEWMState(period)
+        self._dx = AdjustedEWMState(period)
+        self._prev: Optional[Tuple[float, float, float]] = None
+
+    def update(self, high: float, low: float, close: float) -> Tuple[float, float, float]:
+        """Returns (adx, +di, -di) for the new bar"""
+        if self._prev is None:
+            up_move = down_move = NAN
+            prev_close = None
+        else:
+            prev_high, prev_low, prev_close = self._prev
+            up_move = high - prev_high
+            down_move = prev_low - low
+        self._prev = (high, low, close)
+
+        true_range = _true_range(high, low, prev_close)
+        plus_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+        minus_dm = down_move if down_move > up_move and down_move > 0 else 0.0
+        # Bars with no data stay missing, as in the batch version
+        if math.isnan(true_range):
+            plus_dm = minus_dm = NAN
+
+        tr = self._tr.update(true_range)
+        plus_di = 100 * _ratio(self._plus_dm.update(plus_dm), tr)
+        minus_di = 100 * _ratio(self._minus_dm.update(minus_dm), tr)
+        dx = 100 * _ratio(abs(plus_di - minus_di), plus_di + minus_di)
+        return self._dx.update(dx), plus_di, minus_di
+
+
+class StreamingTechnicals:
+    """
+    Running state of every technical strategy feature for one ticker.
+
+    update() takes one OHLCV bar and advances each indicator in O(1);
+    features() returns the latest value of every feature per strategy, as
+    latest_features() gives for the batch features of all bars seen so far.
+    The Hurst exponent is the exception: it is taken over the last
+    `hurst_window` closes, the input window the technical analyst sees in a
+    backtest, and only computed when features() is called.
+    """
+
+    def __init__(self, hurst_window: int = None, hurst_max_lag: int = 20):
+        self.bars = 0
+        self._closes = deque(maxlen=hurst_window or required_history())
+        self._hurst_max_lag = hurst_max_lag
+        self._last: Dict[str, float] = {}
+
+        # Trend following
+        self._ema = {span: EMAState(span) for span in (8, 21, 55)}
+        self._adx = ADXState(14)
+        # Mean reversion
+        self._close_stats = {window: RollingStats(window) for window in (20, 50)}
+        self._rsi = {period: RSIState(period) for period in (14, 28)}
+        # Momentum, volatility and statistical arbitrage
+        self._returns = ReturnsState()
+        self._return_sums = {window: RollingStats(window) for window in (21, 63, 126)}
+        self._volume = RollingStats(21)
+        self._return_stats = RollingStats(63)
+        self._volatility = RollingStats(63)
+        self._atr = ATRState(14)
+
+    @classmethod
+    def from_prices(cls, prices, hurst_window: int = None) -> "StreamingTechnicals":
+        """Indicators advanced through every bar of a PriceSeries"""
+        technicals = cls(hurst_window)
+        technicals.feed(prices)
+        return technicals
+
+    def feed(self, prices, stop: int = None) -> None:
+        """
+        Advance through the bars of a growing PriceSeries not seen yet
+
+        Args:
+            prices: PriceSeries whose first `bars` bars were already fed
+            stop: Feed up to this bar, exclusive (defaults to all of them)
+        """
+        stop = len(prices) if stop is None else stop
+        for i in range(self.bars, stop):
+            self.update(prices.open[i], prices.high[i], prices.low[i], prices.close[i], prices.volume[i])
+
+    def update(self, open: float, high: float, low: float, close: float, volume: float) -> None:
+        """Advance every indicator by one bar (open is unused by the strategies)"""
+        self.bars += 1
+        self._closes.append(close)
+        ema = {span: state.update(close) for span, state in self._ema.items()}
+        adx, _, _ = self._adx.update(high, low, close)
+        for stats in self._close_stats.values():
+            stats.update(close)
+        rsi = {period: state.update(close) for period, state in self._rsi.items()}
+
+        returns = self._returns.update(close)
+        for stats in self._return_sums.values():
+            stats.update(returns)
+        self._return_stats.update(returns)
+        self._volume.update(volume)
+        # Annualized 21-bar volatility, itself tracked over 63 bars
+        hist_vol = self._return_sums[21].std * math.sqrt(252)
+        self._volatility.update(hist_vol)
+
+        self._last = {
+            'close': close,
+            'volume': volume,
+            'ema': ema,
+            'adx': adx,
+            'rsi': rsi,
+            'hist_vol': hist_vol,
+            'atr': self._atr.update(high, low, close),
+        }
+
+    def features(self) -> Dict[str, Dict[str, float]]:
+        """Latest feature values, keyed by strategy name as in STRATEGIES"""
+        last = self._last
+        close = last['close']
+        ema = last['ema']
+        adx = last['adx']
+
+        mean_50, std_50 = self._close_stats[50].mean, self._close_stats[50].std
+        mean_20, std_20 = self._close_stats[20].mean, self._close_stats[20].std
+        bb_upper, bb_lower = mean_20 + std_20 * 2, mean_20 - std_20 * 2
+
+        mom_1m, mom_3m, mom_6m = (self._return_sums[window].sum for window in (21, 63, 126))
+
+        hist_vol = last['hist_vol']
+        vol_ma = self._volatility.mean
+
+        return {
+            'trend': {
+                'short_trend': ema[8] > ema[21],
+                'medium_trend': ema[21] > ema[55],
+                'adx': adx,
+                'trend_strength': adx / 100.0,
+            },
+            'mean_reversion': {
+                'z_score': _ratio(close - mean_50, std_50),
+                'price_vs_bb': _ratio(close - bb_lower, bb_upper - bb_lower),
+                'rsi_14': last['rsi'][14],
+                'rsi_28': last['rsi'][28],
+            },
+            'momentum': {
+                'momentum_1m': mom_1m,
+                'momentum_3m': mom_3m,
+                'momentum_6m': mom_6m,
+                'volume_momentum': _ratio(last['volume'], self._volume.mean),
+                'momentum_score': 0.4 * mom_1m + 0.3 * mom_3m + 0.3 * mom_6m,
+            },
+            'volatility': {
+                'historical_volatility': hist_vol,
+                'volatility_regime': _ratio(hist_vol, vol_ma),
+                'volatility_z_score': _ratio(hist_vol - vol_ma, self._volatility.std),
+                'atr_ratio': _ratio(last['atr'], close),
+            },
+            'stat_arb': {
+                'hurst_exponent': calculate_hurst_exponent(
+                    np.fromiter(self._closes, dtype=float), self._hurst_max_lag
+                ),
+                'skewness': self._return_stats.skew,
+                'kurtosis': self._return_stats.kurt,
+            },
+        }
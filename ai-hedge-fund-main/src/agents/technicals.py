@@ -1,17 +1,43 @@
 import math
-from typing import Dict
+import warnings
+from typing import Dict, List
 
 from langchain_core.messages import HumanMessage
 
-from agents.state import AgentState, show_agent_reasoning
+from agents.state import AgentSignal, AgentState, agent_message_update, show_agent_reasoning
 
-import json
 import pandas as pd
 import numpy as np
 
 from tools.api import prices_to_df
 
 
+# Weights used to combine the strategy signals into the overall signal
+STRATEGY_WEIGHTS = {
+    'trend': 0.25,
+    'mean_reversion': 0.20,
+    'momentum': 0.25,
+    'volatility': 0.15,
+    'stat_arb': 0.15
+}
+
+# Strategy names as they appear in the technical analysis report
+REPORT_NAMES = {
+    'trend': 'trend_following',
+    'mean_reversion': 'mean_reversion',
+    'momentum': 'momentum',
+    'volatility': 'volatility',
+    'stat_arb': 'statistical_arbitrage'
+}
+
+# Numeric encoding of signals used by the vectorized decision rules
+SIGNAL_VALUES = {
+    'bullish': 1,
+    'neutral': 0,
+    'bearish': -1
+}
+SIGNAL_LABELS = {value: label for label, value in SIGNAL_VALUES.items()}
+
 ##### Technical Analyst #####
 def technical_analyst_agent(state: AgentState):
     """
@@ -23,454 +49,571 @@ def technical_analyst_agent(state: AgentState):
     5. Statistical Arbitrage Signals
     """
     show_reasoning = state["metadata"]["show_reasoning"]
+    # Points of downsampled metric history to attach (0 keeps last values only)
+    history_points = state["metadata"].get("technical_history_points", 0)
     data = state["data"]
-    prices = data["prices"]
-    prices_df = prices_to_df(prices)
-    
-    # Calculate indicators
-    # 1. MACD (Moving Average Convergence Divergence)
-    macd_line, signal_line = calculate_macd(prices_df)
-    
-    # 2. RSI (Relative Strength Index)
-    rsi = calculate_rsi(prices_df)
-    
-    # 3. Bollinger Bands (Bollinger Bands)
-    upper_band, lower_band = calculate_bollinger_bands(prices_df)
-    
-    # 4. OBV (On-Balance Volume)
-    obv = calculate_obv(prices_df)
-    
-    # Generate individual signals
-    signals = []
-    
-    # MACD signal
-    if macd_line.iloc[-2] < signal_line.iloc[-2] and macd_line.iloc[-1] > signal_line.iloc[-1]:
-        signals.append('bullish')
-    elif macd_line.iloc[-2] > signal_line.iloc[-2] and macd_line.iloc[-1] < signal_line.iloc[-1]:
-        signals.append('bearish')
-    else:
-        signals.append('neutral')
-    
-    # RSI signal
-    if rsi.iloc[-1] < 30:
-        signals.append('bullish')
-    elif rsi.iloc[-1] > 70:
-        signals.append('bearish')
-    else:
-        signals.append('neutral')
-    
-    # Bollinger Bands signal
-    current_price = prices_df['close'].iloc[-1]
-    if current_price < lower_band.iloc[-1]:
-        signals.append('bullish')
-    elif current_price > upper_band.iloc[-1]:
-        signals.append('bearish')
-    else:
-        signals.append('neutral')
-    
-    # OBV signal
-    obv_slope = obv.diff().iloc[-5:].mean()
-    if obv_slope > 0:
-        signals.append('bullish')
-    elif obv_slope < 0:
-        signals.append('bearish')
-    else:
-        signals.append('neutral')
-    
-    # Add reasoning collection
-    reasoning = {
-        "MACD": {
-            "signal": signals[0],
-            "details": f"MACD Line crossed {'above' if signals[0] == 'bullish' else 'below' if signals[0] == 'bearish' else 'neither above nor below'} Signal Line"
-        },
-        "RSI": {
-            "signal": signals[1],
-            "details": f"RSI is {rsi.iloc[-1]:.2f} ({'oversold' if signals[1] == 'bullish' else 'overbought' if signals[1] == 'bearish' else 'neutral'})"
-        },
-        "Bollinger": {
-            "signal": signals[2],
-            "details": f"Price is {'below lower band' if signals[2] == 'bullish' else 'above upper band' if signals[2] == 'bearish' else 'within bands'}"
-        },
-        "OBV": {
-            "signal": signals[3],
-            "details": f"OBV slope is {obv_slope:.2f} ({signals[3]})"
+
+    # 1. Trend Following, 2. Mean Reversion, 3. Momentum,
+    # 4. Volatility and 5. Statistical Arbitrage
+    streamed = data.get("technical_features")
+    if streamed is not None and not history_points:
+        # Latest features kept up to date bar by bar (see StreamingTechnicals)
+        strategy_signals = {
+            name: evaluate_features(name, streamed[name])
+            for name in STRATEGIES
         }
-    }
-    
-    # Determine overall signal
-    bullish_signals = signals.count('bullish')
-    bearish_signals = signals.count('bearish')
-    
-    if bullish_signals > bearish_signals:
-        overall_signal = 'bullish'
-    elif bearish_signals > bullish_signals:
-        overall_signal = 'bearish'
     else:
-        overall_signal = 'neutral'
-    
-    # Calculate confidence level based on the proportion of indicators agreeing
-    total_signals = len(signals)
-    confidence = max(bullish_signals, bearish_signals) / total_signals
-    
-    # Generate the message content
-    message_content = {
-        "signal": overall_signal,
-        "confidence": f"{round(confidence * 100)}%",
-        "reasoning": {
-            "MACD": reasoning["MACD"],
-            "RSI": reasoning["RSI"],
-            "Bollinger": reasoning["Bollinger"],
-            "OBV": reasoning["OBV"]
+        # Every indicator is computed once and shared by the strategies below
+        indicators = IndicatorEngine(prices_to_df(data["prices"]))
+        strategy_signals = {
+            name: evaluate_strategy(name, indicators, history_points)
+            for name in STRATEGIES
         }
-    }
-
-    # 1. Trend Following Strategy
-    trend_signals = calculate_trend_signals(prices_df)
-    
-    # 2. Mean Reversion Strategy
-    mean_reversion_signals = calculate_mean_reversion_signals(prices_df)
-    
-    # 3. Momentum Strategy
-    momentum_signals = calculate_momentum_signals(prices_df)
-    
-    # 4. Volatility Strategy
-    volatility_signals = calculate_volatility_signals(prices_df)
-    
-    # 5. Statistical Arbitrage Signals
-    stat_arb_signals = calculate_stat_arb_signals(prices_df)
     
     # Combine all signals using a weighted ensemble approach
-    strategy_weights = {
-        'trend': 0.25,
-        'mean_reversion': 0.20,
-        'momentum': 0.25,
-        'volatility': 0.15,
-        'stat_arb': 0.15
-    }
-    
     combined_signal = weighted_signal_combination({
-        'trend': trend_signals,
-        'mean_reversion': mean_reversion_signals,
-        'momentum': momentum_signals,
-        'volatility': volatility_signals,
-        'stat_arb': stat_arb_signals
-    }, strategy_weights)
-    
-    # Generate detailed analysis report
-    analysis_report = {
-        "signal": combined_signal['signal'],
-        "confidence": f"{round(combined_signal['confidence'] * 100)}%",
-        "strategy_signals": {
-            "trend_following": {
-                "signal": trend_signals['signal'],
-                "confidence": f"{round(trend_signals['confidence'] * 100)}%",
-                "metrics": normalize_pandas(trend_signals['metrics'])
-            },
-            "mean_reversion": {
-                "signal": mean_reversion_signals['signal'],
-                "confidence": f"{round(mean_reversion_signals['confidence'] * 100)}%",
-                "metrics": normalize_pandas(mean_reversion_signals['metrics'])
-            },
-            "momentum": {
-                "signal": momentum_signals['signal'],
-                "confidence": f"{round(momentum_signals['confidence'] * 100)}%",
-                "metrics": normalize_pandas(momentum_signals['metrics'])
-            },
-            "volatility": {
-                "signal": volatility_signals['signal'],
-                "confidence": f"{round(volatility_signals['confidence'] * 100)}%",
-                "metrics": normalize_pandas(volatility_signals['metrics'])
-            },
-            "statistical_arbitrage": {
-                "signal": stat_arb_signals['signal'],
-                "confidence": f"{round(stat_arb_signals['confidence'] * 100)}%",
-                "metrics": normalize_pandas(stat_arb_signals['metrics'])
-            }
+        name: {'signal': result.signal, 'confidence': result.confidence}
+        for name, result in strategy_signals.items()
+    }, STRATEGY_WEIGHTS)
+    
+    # Detailed analysis report, rendered to JSON only when a consumer needs it
+    technical_signal = AgentSignal(
+        signal=combined_signal['signal'],
+        confidence=combined_signal['confidence'],
+        components={
+            REPORT_NAMES[name]: result for name, result in strategy_signals.items()
         }
-    }
+    )
 
     # Create the technical analyst message
     message = HumanMessage(
-        content=json.dumps(analysis_report),
-        name="technical_analyst_agent",
+        content=technical_signal.to_json(),
+        name="technical_analyst",
     )
 
     if show_reasoning:
-        show_agent_reasoning(analysis_report, "Technical Analyst")
+        show_agent_reasoning(technical_signal.to_dict(), "Technical Analyst")
     
     return {
-        "messages": [message],
-        "data": data,
+        **agent_message_update(message),
+        "data": {"technical_signal": technical_signal},
     }
 
-def calculate_trend_signals(prices_df):
+class IndicatorEngine:
     """
-    Advanced trend following strategy using multiple timeframes and indicators
+    Indicator cache bound to a single price frame.
+
+    Each indicator is computed on first use and memoized by name and
+    parameters, so strategies that need the same series (RSI-14, Bollinger
+    bands, returns and their rolling statistics) share one computation.
     """
+
+    def __init__(self, prices_df: pd.DataFrame):
+        self.prices_df = prices_df
+        self._cache = {}
+
+    def _memo(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    @property
+    def close(self) -> pd.Series:
+        return self.prices_df['close']
+
+    @property
+    def volume(self) -> pd.Series:
+        return self.prices_df['volume']
+
+    def returns(self) -> pd.Series:
+        return self._memo(('returns',), lambda: self.close.pct_change())
+
+    def rolling_returns(self, stat: str, window: int) -> pd.Series:
+        """Rolling statistic (sum, std, skew, kurt, ...) of close-to-close returns"""
+        return self._memo(
+            ('rolling_returns', stat, window),
+            lambda: getattr(self.returns().rolling(window), stat)()
+        )
+
+    def rolling_mean(self, window: int) -> pd.Series:
+        return self._memo(('rolling_mean', window), lambda: self.close.rolling(window).mean())
+
+    def rolling_std(self, window: int) -> pd.Series:
+        return self._memo(('rolling_std', window), lambda: self.close.rolling(window).std())
+
+    def volume_mean(self, window: int) -> pd.Series:
+        return self._memo(('volume_mean', window), lambda: self.volume.rolling(window).mean())
+
+    def ema(self, window: int) -> pd.Series:
+        return self._memo(('ema', window), lambda: calculate_ema(self.prices_df, window))
+
+    def macd(self) -> tuple[pd.Series, pd.Series]:
+        return self._memo(('macd',), lambda: calculate_macd(self.prices_df))
+
+    def rsi(self, period: int = 14) -> pd.Series:
+        return self._memo(('rsi', period), lambda: calculate_rsi(self.prices_df, period))
+
+    def bollinger_bands(self, window: int = 20) -> tuple[pd.Series, pd.Series]:
+        def compute():
+            sma = self.rolling_mean(window)
+            std_dev = self.rolling_std(window)
+            return sma + (std_dev * 2), sma - (std_dev * 2)
+        return self._memo(('bollinger_bands', window), compute)
+
+    def adx(self, period: int = 14) -> pd.DataFrame:
+        return self._memo(('adx', period), lambda: calculate_adx(self.prices_df, period))
+
+    def atr(self, period: int = 14) -> pd.Series:
+        return self._memo(('atr', period), lambda: calculate_atr(self.prices_df, period))
+
+    def ichimoku(self) -> Dict[str, pd.Series]:
+        return self._memo(('ichimoku',), lambda: calculate_ichimoku(self.prices_df))
+
+    def obv(self) -> pd.Series:
+        return self._memo(('obv',), lambda: calculate_obv(self.prices_df))
+
+    def hurst_exponent(self, max_lag: int = 20) -> float:
+        return self._memo(
+            ('hurst_exponent', max_lag),
+            lambda: calculate_hurst_exponent(self.close, max_lag)
+        )
+
+    def rolling_hurst_exponent(self, window: int, max_lag: int = 20) -> pd.Series:
+        return self._memo(
+            ('rolling_hurst_exponent', window, max_lag),
+            lambda: rolling_hurst_exponent(self.close, window, max_lag)
+        )
+
+# Bars of history each indicator needs before it yields a (settled) value,
+# by IndicatorEngine method and parameters. EWM-based indicators have values
+# from the first bars but are only trusted after about one span.
+INDICATOR_WARMUP = {
+    'returns': lambda: 2,
+    'rolling_returns': lambda stat, window: window + 1,
+    'rolling_mean': lambda window: window,
+    'rolling_std': lambda window: window,
+    'volume_mean': lambda window: window,
+    'ema': lambda window: window,
+    'rsi': lambda period=14: period,
+    'bollinger_bands': lambda window=20: window,
+    'adx': lambda period=14: 2 * period,
+    'atr': lambda period=14: period,
+    'hurst_exponent': lambda max_lag=20: max_lag,
+}
+
+def indicator_warmup(name: str, *params) -> int:
+    """Bars of history the named indicator needs"""
+    return INDICATOR_WARMUP[name](*params)
+
+##### Strategies #####
+# Each strategy is split in two so the same logic serves a single ticker, a
+# cross-section of tickers and a full signal history:
+#   *_features(indicators) returns the full-history series the strategy looks
+#       at (Series for one ticker, dates x tickers DataFrames for a panel)
+#   *_rule(features) turns those inputs into (signal, confidence) elementwise,
+#       with signals encoded as -1/0/1, for scalars or whole arrays alike
+# The indicator windows are module constants shared with the strategy's
+# warm-up, the bars it needs before none of its features is NaN.
+
+TREND_EMA_SPANS = (8, 21, 55)
+TREND_ADX_PERIOD = 14
+
+def trend_features(indicators: IndicatorEngine) -> Dict[str, object]:
     # Calculate EMAs for multiple timeframes
-    ema_8 = calculate_ema(prices_df, 8)
-    ema_21 = calculate_ema(prices_df, 21)
-    ema_55 = calculate_ema(prices_df, 55)
+    ema_8, ema_21, ema_55 = (indicators.ema(span) for span in TREND_EMA_SPANS)
     
     # Calculate ADX for trend strength
-    adx = calculate_adx(prices_df, 14)
-    
-    # Calculate Ichimoku Cloud
-    ichimoku = calculate_ichimoku(prices_df)
-    
-    # Determine trend direction and strength
-    short_trend = ema_8 > ema_21
-    medium_trend = ema_21 > ema_55
-    
-    # Combine signals with confidence weighting
-    trend_strength = adx['adx'].iloc[-1] / 100.0
-    
-    if short_trend.iloc[-1] and medium_trend.iloc[-1]:
-        signal = 'bullish'
-        confidence = trend_strength
-    elif not short_trend.iloc[-1] and not medium_trend.iloc[-1]:
-        signal = 'bearish'
-        confidence = trend_strength
-    else:
-        signal = 'neutral'
-        confidence = 0.5
+    adx = indicators.adx(TREND_ADX_PERIOD)['adx']
     
     return {
-        'signal': signal,
-        'confidence': confidence,
-        'metrics': {
-            'adx': float(adx['adx'].iloc[-1]),
-            'trend_strength': float(trend_strength),
-            # 'ichimoku': ichimoku
-        }
+        # Determine trend direction and strength
+        'short_trend': ema_8 > ema_21,
+        'medium_trend': ema_21 > ema_55,
+        'adx': adx,
+        'trend_strength': adx / 100.0,
     }
 
-def calculate_mean_reversion_signals(prices_df):
-    """
-    Mean reversion strategy using statistical measures and Bollinger Bands
-    """
+TREND_WARMUP = max(
+    indicator_warmup('ema', max(TREND_EMA_SPANS)),
+    indicator_warmup('adx', TREND_ADX_PERIOD)
+)
+
+def trend_rule(features):
+    short_trend = np.asarray(features['short_trend'], dtype=bool)
+    medium_trend = np.asarray(features['medium_trend'], dtype=bool)
+    bullish = short_trend & medium_trend
+    bearish = ~short_trend & ~medium_trend
+    signal = np.select([bullish, bearish], [1, -1], 0)
+    # Combine signals with confidence weighting
+    confidence = np.where(bullish | bearish, features['trend_strength'], 0.5)
+    return signal, confidence
+
+MEAN_REVERSION_WINDOW = 50
+BOLLINGER_WINDOW = 20
+MEAN_REVERSION_RSI_PERIODS = (14, 28)
+
+def mean_reversion_features(indicators: IndicatorEngine) -> Dict[str, object]:
     # Calculate z-score of price relative to moving average
-    ma_50 = prices_df['close'].rolling(window=50).mean()
-    std_50 = prices_df['close'].rolling(window=50).std()
-    z_score = (prices_df['close'] - ma_50) / std_50
+    ma_50 = indicators.rolling_mean(MEAN_REVERSION_WINDOW)
+    std_50 = indicators.rolling_std(MEAN_REVERSION_WINDOW)
+    z_score = (indicators.close - ma_50) / std_50
     
     # Calculate Bollinger Bands
-    bb_upper, bb_lower = calculate_bollinger_bands(prices_df)
+    bb_upper, bb_lower = indicators.bollinger_bands(BOLLINGER_WINDOW)
     
     # Calculate RSI with multiple timeframes
-    rsi_14 = calculate_rsi(prices_df, 14)
-    rsi_28 = calculate_rsi(prices_df, 28)
-    
-    # Mean reversion signals
-    extreme_z_score = abs(z_score.iloc[-1]) > 2
-    price_vs_bb = (prices_df['close'].iloc[-1] - bb_lower.iloc[-1]) / (bb_upper.iloc[-1] - bb_lower.iloc[-1])
-    
-    # Combine signals
-    if z_score.iloc[-1] < -2 and price_vs_bb < 0.2:
-        signal = 'bullish'
-        confidence = min(abs(z_score.iloc[-1]) / 4, 1.0)
-    elif z_score.iloc[-1] > 2 and price_vs_bb > 0.8:
-        signal = 'bearish'
-        confidence = min(abs(z_score.iloc[-1]) / 4, 1.0)
-    else:
-        signal = 'neutral'
-        confidence = 0.5
+    rsi_14, rsi_28 = (indicators.rsi(period) for period in MEAN_REVERSION_RSI_PERIODS)
     
     return {
-        'signal': signal,
-        'confidence': confidence,
-        'metrics': {
-            'z_score': float(z_score.iloc[-1]),
-            'price_vs_bb': float(price_vs_bb),
-            'rsi_14': float(rsi_14.iloc[-1]),
-            'rsi_28': float(rsi_28.iloc[-1])
-        }
+        'z_score': z_score,
+        'price_vs_bb': (indicators.close - bb_lower) / (bb_upper - bb_lower),
+        'rsi_14': rsi_14,
+        'rsi_28': rsi_28,
     }
 
-def calculate_momentum_signals(prices_df):
-    """
-    Multi-factor momentum strategy
-    """
+MEAN_REVERSION_WARMUP = max(
+    indicator_warmup('rolling_mean', MEAN_REVERSION_WINDOW),
+    indicator_warmup('bollinger_bands', BOLLINGER_WINDOW),
+    indicator_warmup('rsi', max(MEAN_REVERSION_RSI_PERIODS))
+)
+
+def mean_reversion_rule(features):
+    z_score = np.asarray(features['z_score'], dtype=float)
+    price_vs_bb = np.asarray(features['price_vs_bb'], dtype=float)
+    bullish = (z_score < -2) & (price_vs_bb < 0.2)
+    bearish = (z_score > 2) & (price_vs_bb > 0.8)
+    signal = np.select([bullish, bearish], [1, -1], 0)
+    confidence = np.where(bullish | bearish, np.minimum(np.abs(z_score) / 4, 1.0), 0.5)
+    return signal, confidence
+
+MOMENTUM_WINDOWS = (21, 63, 126)
+MOMENTUM_VOLUME_WINDOW = 21
+
+def momentum_features(indicators: IndicatorEngine) -> Dict[str, object]:
     # Price momentum
-    returns = prices_df['close'].pct_change()
-    mom_1m = returns.rolling(21).sum()
-    mom_3m = returns.rolling(63).sum()
-    mom_6m = returns.rolling(126).sum()
+    mom_1m, mom_3m, mom_6m = (
+        indicators.rolling_returns('sum', window) for window in MOMENTUM_WINDOWS
+    )
     
     # Volume momentum
-    volume_ma = prices_df['volume'].rolling(21).mean()
-    volume_momentum = prices_df['volume'] / volume_ma
+    volume_ma = indicators.volume_mean(MOMENTUM_VOLUME_WINDOW)
     
     # Relative strength
     # (would compare to market/sector in real implementation)
     
-    # Calculate momentum score
-    momentum_score = (
-        0.4 * mom_1m +
-        0.3 * mom_3m +
-        0.3 * mom_6m
-    ).iloc[-1]
-    
-    # Volume confirmation
-    volume_confirmation = volume_momentum.iloc[-1] > 1.0
-    
-    if momentum_score > 0.05 and volume_confirmation:
-        signal = 'bullish'
-        confidence = min(abs(momentum_score) * 5, 1.0)
-    elif momentum_score < -0.05 and volume_confirmation:
-        signal = 'bearish'
-        confidence = min(abs(momentum_score) * 5, 1.0)
-    else:
-        signal = 'neutral'
-        confidence = 0.5
-    
     return {
-        'signal': signal,
-        'confidence': confidence,
-        'metrics': {
-            'momentum_1m': float(mom_1m.iloc[-1]),
-            'momentum_3m': float(mom_3m.iloc[-1]),
-            'momentum_6m': float(mom_6m.iloc[-1]),
-            'volume_momentum': float(volume_momentum.iloc[-1])
-        }
+        'momentum_1m': mom_1m,
+        'momentum_3m': mom_3m,
+        'momentum_6m': mom_6m,
+        'volume_momentum': indicators.volume / volume_ma,
+        # Calculate momentum score
+        'momentum_score': 0.4 * mom_1m + 0.3 * mom_3m + 0.3 * mom_6m,
     }
 
-def calculate_volatility_signals(prices_df):
-    """
-    Volatility-based trading strategy
-    """
-    # Calculate various volatility metrics
-    returns = prices_df['close'].pct_change()
-    
+MOMENTUM_WARMUP = max(
+    indicator_warmup('rolling_returns', 'sum', max(MOMENTUM_WINDOWS)),
+    indicator_warmup('volume_mean', MOMENTUM_VOLUME_WINDOW)
+)
+
+def momentum_rule(features):
+    momentum_score = np.asarray(features['momentum_score'], dtype=float)
+    # Volume confirmation
+    volume_confirmation = np.asarray(features['volume_momentum'], dtype=float) > 1.0
+    bullish = (momentum_score > 0.05) & volume_confirmation
+    bearish = (momentum_score < -0.05) & volume_confirmation
+    signal = np.select([bullish, bearish], [1, -1], 0)
+    confidence = np.where(bullish | bearish, np.minimum(np.abs(momentum_score) * 5, 1.0), 0.5)
+    return signal, confidence
+
+VOLATILITY_WINDOW = 21
+VOLATILITY_REGIME_WINDOW = 63
+VOLATILITY_ATR_PERIOD = 14
+
+def volatility_features(indicators: IndicatorEngine) -> Dict[str, object]:
     # Historical volatility
-    hist_vol = returns.rolling(21).std() * math.sqrt(252)
+    hist_vol = indicators.rolling_returns('std', VOLATILITY_WINDOW) * math.sqrt(252)
     
     # Volatility regime detection
-    vol_ma = hist_vol.rolling(63).mean()
-    vol_regime = hist_vol / vol_ma
-    
-    # Volatility mean reversion
-    vol_z_score = (hist_vol - vol_ma) / hist_vol.rolling(63).std()
-    
-    # ATR ratio
-    atr = calculate_atr(prices_df)
-    atr_ratio = atr / prices_df['close']
-    
-    # Generate signal based on volatility regime
-    current_vol_regime = vol_regime.iloc[-1]
-    vol_z = vol_z_score.iloc[-1]
-    
-    if current_vol_regime < 0.8 and vol_z < -1:
-        signal = 'bullish'  # Low vol regime, potential for expansion
-        confidence = min(abs(vol_z) / 3, 1.0)
-    elif current_vol_regime > 1.2 and vol_z > 1:
-        signal = 'bearish'  # High vol regime, potential for contraction
-        confidence = min(abs(vol_z) / 3, 1.0)
-    else:
-        signal = 'neutral'
-        confidence = 0.5
+    vol_ma = hist_vol.rolling(VOLATILITY_REGIME_WINDOW).mean()
     
     return {
-        'signal': signal,
-        'confidence': confidence,
-        'metrics': {
-            'historical_volatility': float(hist_vol.iloc[-1]),
-            'volatility_regime': float(current_vol_regime),
-            'volatility_z_score': float(vol_z),
-            'atr_ratio': float(atr_ratio.iloc[-1])
-        }
+        'historical_volatility': hist_vol,
+        'volatility_regime': hist_vol / vol_ma,
+        # Volatility mean reversion
+        'volatility_z_score': (hist_vol - vol_ma) / hist_vol.rolling(VOLATILITY_REGIME_WINDOW).std(),
+        # ATR ratio
+        'atr_ratio': indicators.atr(VOLATILITY_ATR_PERIOD) / indicators.close,
     }
 
-def calculate_stat_arb_signals(prices_df):
+# Regime statistics of the volatility series start once it has a value
+VOLATILITY_WARMUP = max(
+    indicator_warmup('rolling_returns', 'std', VOLATILITY_WINDOW) + VOLATILITY_REGIME_WINDOW - 1,
+    indicator_warmup('atr', VOLATILITY_ATR_PERIOD)
+)
+
+def volatility_rule(features):
+    vol_regime = np.asarray(features['volatility_regime'], dtype=float)
+    vol_z = np.asarray(features['volatility_z_score'], dtype=float)
+    bullish = (vol_regime < 0.8) & (vol_z < -1)  # Low vol regime, potential for expansion
+    bearish = (vol_regime > 1.2) & (vol_z > 1)  # High vol regime, potential for contraction
+    signal = np.select([bullish, bearish], [1, -1], 0)
+    confidence = np.where(bullish | bearish, np.minimum(np.abs(vol_z) / 3, 1.0), 0.5)
+    return signal, confidence
+
+STAT_ARB_WINDOW = 63
+HURST_MAX_LAG = 20
+
+def stat_arb_features(indicators: IndicatorEngine) -> Dict[str, object]:
+    # Correlation analysis
+    # (would include correlation with related securities in real implementation)
+    return {
+        # Test for mean reversion using Hurst exponent
+        'hurst_exponent': indicators.hurst_exponent(HURST_MAX_LAG),
+        # Skewness and kurtosis of returns
+        'skewness': indicators.rolling_returns('skew', STAT_ARB_WINDOW),
+        'kurtosis': indicators.rolling_returns('kurt', STAT_ARB_WINDOW),
+    }
+
+STAT_ARB_WARMUP = max(
+    indicator_warmup('rolling_returns', 'skew', STAT_ARB_WINDOW),
+    indicator_warmup('hurst_exponent', HURST_MAX_LAG)
+)
+
+def stat_arb_rule(features):
+    # Generate signal based on statistical properties
+    hurst = np.asarray(features['hurst_exponent'], dtype=float)
+    skew = np.asarray(features['skewness'], dtype=float)
+    bullish = (hurst < 0.4) & (skew > 1)
+    bearish = (hurst < 0.4) & (skew < -1)
+    signal = np.select([bullish, bearish], [1, -1], 0)
+    confidence = np.where(bullish | bearish, (0.5 - hurst) * 2, 0.5)
+    return signal, confidence
+
+# strategy -> (features, rule, metrics reported for the strategy, warm-up bars)
+STRATEGIES = {
+    'trend': (trend_features, trend_rule, ('adx', 'trend_strength'), TREND_WARMUP),
+    'mean_reversion': (mean_reversion_features, mean_reversion_rule, ('z_score', 'price_vs_bb', 'rsi_14', 'rsi_28'), MEAN_REVERSION_WARMUP),
+    'momentum': (momentum_features, momentum_rule, ('momentum_1m', 'momentum_3m', 'momentum_6m', 'volume_momentum'), MOMENTUM_WARMUP),
+    'volatility': (volatility_features, volatility_rule, ('historical_volatility', 'volatility_regime', 'volatility_z_score', 'atr_ratio'), VOLATILITY_WARMUP),
+    'stat_arb': (stat_arb_features, stat_arb_rule, ('hurst_exponent', 'skewness', 'kurtosis'), STAT_ARB_WARMUP),
+}
+
+# Bars of history each strategy needs before none of its features is NaN
+STRATEGY_WARMUP = {name: strategy[3] for name, strategy in STRATEGIES.items()}
+
+def required_history(strategies=None) -> int:
     """
-    Statistical arbitrage signals based on price action analysis
+    Minimal number of bars to hand the technical analyst
+
+    Args:
+        strategies: Strategy names to cover (defaults to all of STRATEGIES)
+
+    Returns:
+        Largest warm-up among the strategies
     """
-    # Calculate price distribution statistics
-    returns = prices_df['close'].pct_change()
-    
-    # Skewness and kurtosis
-    skew = returns.rolling(63).skew()
-    kurt = returns.rolling(63).kurt()
+    return max(STRATEGY_WARMUP[name] for name in (strategies or STRATEGIES))
+
+def lookback_days(bars: int) -> int:
+    """Calendar days that contain at least `bars` trading days (with holiday slack)"""
+    return math.ceil(bars * 7 / 5) + 10
+
+def latest_features(features: Dict[str, object]) -> Dict[str, object]:
+    """Take the last row of every series-valued feature"""
+    return {
+        name: value.iloc[-1] if isinstance(value, (pd.Series, pd.DataFrame)) else value
+        for name, value in features.items()
+    }
+
+def combine_rule(signals, confidences, weights):
+    """
+    Weighted combination of strategy signals, elementwise
     
-    # Test for mean reversion using Hurst exponent
-    hurst = calculate_hurst_exponent(prices_df['close'])
+    Args:
+        signals: Dict of strategy -> numeric signal (scalar or array)
+        confidences: Dict of strategy -> confidence (scalar or array)
+        weights: Dict of strategy -> weight
     
-    # Correlation analysis
-    # (would include correlation with related securities in real implementation)
+    Returns:
+        Tuple of (numeric signal, confidence)
+    """
+    weighted_sum = sum(signals[name] * weights[name] * confidences[name] for name in signals)
+    total_confidence = sum(weights[name] * confidences[name] for name in signals)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Normalize the weighted sum
+        final_score = np.where(total_confidence > 0, weighted_sum / total_confidence, 0.0)
+    # Convert back to signal
+    signal = np.select([final_score > 0.2, final_score < -0.2], [1, -1], 0)
+    return signal, np.abs(final_score)
+
+def downsample(series, points: int) -> List[float]:
+    """Evenly spaced values of a series, always ending with the last one"""
+    values = np.asarray(series, dtype=float)
+    if points <= 0 or not len(values):
+        return []
+    positions = np.unique(np.linspace(len(values) - 1, 0, points).round().astype(int))
+    return values[positions].tolist()
+
+def evaluate_strategy(name: str, indicators: IndicatorEngine, history_points: int = 0) -> AgentSignal:
+    """
+    Evaluate one strategy on the last bar of a single ticker's prices
     
-    # Generate signal based on statistical properties
-    if hurst < 0.4 and skew.iloc[-1] > 1:
-        signal = 'bullish'
-        confidence = (0.5 - hurst) * 2
-    elif hurst < 0.4 and skew.iloc[-1] < -1:
-        signal = 'bearish'
-        confidence = (0.5 - hurst) * 2
-    else:
-        signal = 'neutral'
-        confidence = 0.5
+    Args:
+        name: Strategy name in STRATEGIES
+        indicators: IndicatorEngine for the ticker's prices
+        history_points: Number of downsampled points of metric history to keep
     
-    return {
-        'signal': signal,
-        'confidence': confidence,
-        'metrics': {
-            'hurst_exponent': float(hurst),
-            'skewness': float(skew.iloc[-1]),
-            'kurtosis': float(kurt.iloc[-1])
+    Returns:
+        AgentSignal with the strategy's signal, confidence and last metric values
+    """
+    features, _, metric_names, _ = STRATEGIES[name]
+    values = features(indicators)
+    history = {}
+    if history_points:
+        history = {
+            metric: downsample(values[metric], history_points)
+            for metric in metric_names if isinstance(values[metric], pd.Series)
         }
-    }
+    return evaluate_features(name, latest_features(values), history)
 
-def weighted_signal_combination(signals, weights):
+def evaluate_features(name: str, latest: Dict[str, object], history: Dict[str, List[float]] = None) -> AgentSignal:
     """
-    Combines multiple trading signals using a weighted approach
+    Evaluate one strategy on feature values that are already at the last bar
+    
+    Args:
+        name: Strategy name in STRATEGIES
+        latest: Feature name -> last value, e.g. from StreamingTechnicals
+        history: Optional downsampled metric history to attach
+    
+    Returns:
+        AgentSignal with the strategy's signal, confidence and last metric values
     """
-    # Convert signals to numeric values
-    signal_values = {
-        'bullish': 1,
-        'neutral': 0,
-        'bearish': -1
-    }
+    _, rule, metric_names, _ = STRATEGIES[name]
+    signal, confidence = rule(latest)
+    return AgentSignal(
+        signal=SIGNAL_LABELS[int(signal)],
+        confidence=float(confidence),
+        metrics={metric: float(latest[metric]) for metric in metric_names},
+        history=history or {}
+    )
+
+def strategy_history(name: str, indicators: IndicatorEngine, hurst_window: int = None) -> pd.DataFrame:
+    """
+    Evaluate one strategy on every bar of a single ticker's prices
     
-    weighted_sum = 0
-    total_confidence = 0
+    Every feature is a trailing indicator, so each row only uses prices up to
+    that bar. The exception is the Hurst exponent, which the single-bar
+    evaluation takes over the whole input; here it is replaced by its value
+    over the trailing `hurst_window` bars. The default window is
+    required_history(), the input the technical analyst gets per decision,
+    so each row matches the agent's signal on that bar once the window is
+    full.
     
-    for strategy, signal in signals.items():
-        numeric_signal = signal_values[signal['signal']]
-        weight = weights[strategy]
-        confidence = signal['confidence']
-        
-        weighted_sum += numeric_signal * weight * confidence
-        total_confidence += weight * confidence
+    Args:
+        name: Strategy name in STRATEGIES
+        indicators: IndicatorEngine for the ticker's prices
+        hurst_window: Bars per trailing Hurst exponent window (defaults to
+            required_history())
     
-    # Normalize the weighted sum
-    if total_confidence > 0:
-        final_score = weighted_sum / total_confidence
-    else:
-        final_score = 0
+    Returns:
+        DataFrame indexed like the prices with signal (-1/0/1) and confidence
+    """
+    features, rule, _, _ = STRATEGIES[name]
+    values = features(indicators)
+    if 'hurst_exponent' in values:
+        window = hurst_window or required_history()
+        values = {**values, 'hurst_exponent': indicators.rolling_hurst_exponent(window)}
+    signal, confidence = rule(values)
+    return pd.DataFrame(
+        {'signal': signal, 'confidence': confidence},
+        index=indicators.prices_df.index
+    )
+
+def signal_history(
+    indicators: IndicatorEngine,
+    weights: Dict[str, float] = None,
+    hurst_window: int = None
+) -> pd.DataFrame:
+    """
+    Strategy and combined technical signals on every bar of a single ticker
     
-    # Convert back to signal
-    if final_score > 0.2:
-        signal = 'bullish'
-    elif final_score < -0.2:
-        signal = 'bearish'
-    else:
-        signal = 'neutral'
+    Args:
+        indicators: IndicatorEngine for the ticker's prices
+        weights: Strategy weights for the combined signal (defaults to
+            STRATEGY_WEIGHTS)
+        hurst_window: Bars per trailing Hurst exponent window (defaults to
+            required_history(), see strategy_history)
     
+    Returns:
+        DataFrame indexed like the prices with <strategy>_signal and
+        <strategy>_confidence columns per strategy, plus the combined
+        signal and confidence
+    """
+    weights = STRATEGY_WEIGHTS if weights is None else weights
+    histories = {name: strategy_history(name, indicators, hurst_window) for name in STRATEGIES}
+    signal, confidence = combine_rule(
+        {name: history['signal'].to_numpy() for name, history in histories.items()},
+        {name: history['confidence'].to_numpy() for name, history in histories.items()},
+        weights
+    )
+    columns = {}
+    for name, history in histories.items():
+        columns[f'{name}_signal'] = history['signal']
+        columns[f'{name}_confidence'] = history['confidence']
+    columns['signal'] = signal
+    columns['confidence'] = confidence
+    return pd.DataFrame(columns, index=indicators.prices_df.index)
+
+def _run_strategy(name: str, prices_df, indicators: IndicatorEngine = None):
+    result = evaluate_strategy(name, indicators or IndicatorEngine(prices_df))
     return {
-        'signal': signal,
-        'confidence': abs(final_score)
+        'signal': result.signal,
+        'confidence': result.confidence,
+        'metrics': result.metrics
     }
 
-def normalize_pandas(obj):
-    """Convert pandas Series/DataFrames to primitive Python types"""
-    if isinstance(obj, pd.Series):
-        return obj.tolist()
-    elif isinstance(obj, pd.DataFrame):
-        return obj.to_dict('records')
-    elif isinstance(obj, dict):
-        return {k: normalize_pandas(v) for k, v in obj.items()}
-    elif isinstance(obj, (list, tuple)):
-        return [normalize_pandas(item) for item in obj]
-    return obj
+def calculate_trend_signals(prices_df, indicators: IndicatorEngine = None):
+    """
+    Advanced trend following strategy using multiple timeframes and indicators
+    """
+    return _run_strategy('trend', prices_df, indicators)
+
+def calculate_mean_reversion_signals(prices_df, indicators: IndicatorEngine = None):
+    """
+    Mean reversion strategy using statistical measures and Bollinger Bands
+    """
+    return _run_strategy('mean_reversion', prices_df, indicators)
+
+def calculate_momentum_signals(prices_df, indicators: IndicatorEngine = None):
+    """
+    Multi-factor momentum strategy
+    """
+    return _run_strategy('momentum', prices_df, indicators)
+
+def calculate_volatility_signals(prices_df, indicators: IndicatorEngine = None):
+    """
+    Volatility-based trading strategy
+    """
+    return _run_strategy('volatility', prices_df, indicators)
+
+def calculate_stat_arb_signals(prices_df, indicators: IndicatorEngine = None):
+    """
+    Statistical arbitrage signals based on price action analysis
+    """
+    return _run_strategy('stat_arb', prices_df, indicators)
+
+def weighted_signal_combination(signals, weights):
+    """
+    Combines multiple trading signals using a weighted approach
+    """
+    signal, confidence = combine_rule(
+        {strategy: SIGNAL_VALUES[signal['signal']] for strategy, signal in signals.items()},
+        {strategy: signal['confidence'] for strategy, signal in signals.items()},
+        weights
+    )
+    return {
+        'signal': SIGNAL_LABELS[int(signal)],
+        'confidence': float(confidence)
+    }
 
 def calculate_macd(prices_df: pd.DataFrame) -> tuple[pd.Series, pd.Series]:
     ema_12 = prices_df['close'].ewm(span=12, adjust=False).mean()
@@ -512,47 +655,123 @@ def calculate_ema(df: pd.DataFrame, window: int) -> pd.Series:
     """
     return df['close'].ewm(span=window, adjust=False).mean()
 
+def _shift(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Shift an array along its first axis, filling vacated slots with NaN"""
+    shifted = np.full(values.shape, np.nan)
+    if periods > 0:
+        shifted[periods:] = values[:-periods]
+    elif periods < 0:
+        shifted[:periods] = values[-periods:]
+    else:
+        shifted[:] = values
+    return shifted
+
+def _rolling(values: np.ndarray, window: int, func) -> np.ndarray:
+    """Apply a reducer (np.mean, np.max, ...) over trailing windows along the first axis"""
+    result = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=0)
+        result[window - 1:] = func(windows, axis=-1)
+    return result
+
+def _ewm_mean(values: np.ndarray, span: int) -> np.ndarray:
+    """
+    Adjusted exponentially weighted mean along the first axis.
+
+    Equivalent to pandas' ewm(span=span).mean(); the array is wrapped without
+    copying so pandas' compiled kernel does the recursion.
+    """
+    wrapper = pd.Series if values.ndim == 1 else pd.DataFrame
+    return wrapper(values, copy=False).ewm(span=span).mean().to_numpy()
+
+def _true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True range; the first bar has no previous close and falls back to high - low"""
+    prev_close = _shift(close)
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+def adx_from_arrays(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int = 14
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Average Directional Index over NumPy arrays (time along the first axis)
+    
+    Returns:
+        Tuple of (adx, +di, -di) arrays shaped like the inputs
+    """
+    tr = _true_range(high, low, close)
+    up_move = high - _shift(high)
+    down_move = _shift(low) - low
+    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+    # Bars with no data (e.g. before a ticker's history starts in a panel)
+    # stay missing rather than counting as zero directional movement
+    plus_dm[np.isnan(tr)] = np.nan
+    minus_dm[np.isnan(tr)] = np.nan
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tr_ewm = _ewm_mean(tr, period)
+        plus_di = 100 * _ewm_mean(plus_dm, period) / tr_ewm
+        minus_di = 100 * _ewm_mean(minus_dm, period) / tr_ewm
+        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    return _ewm_mean(dx, period), plus_di, minus_di
+
+def atr_from_arrays(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int = 14
+) -> np.ndarray:
+    """Average True Range over NumPy arrays (time along the first axis)"""
+    return _rolling(_true_range(high, low, close), period, np.mean)
+
+def ichimoku_from_arrays(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """Ichimoku Cloud components over NumPy arrays (time along the first axis)"""
+    def midpoint(window):
+        return (_rolling(high, window, np.max) + _rolling(low, window, np.min)) / 2
+
+    # Tenkan-sen (Conversion Line): (9-period high + 9-period low)/2
+    tenkan_sen = midpoint(9)
+    # Kijun-sen (Base Line): (26-period high + 26-period low)/2
+    kijun_sen = midpoint(26)
+
+    return {
+        'tenkan_sen': tenkan_sen,
+        'kijun_sen': kijun_sen,
+        # Senkou Span A (Leading Span A): (Conversion Line + Base Line)/2
+        'senkou_span_a': _shift((tenkan_sen + kijun_sen) / 2, 26),
+        # Senkou Span B (Leading Span B): (52-period high + 52-period low)/2
+        'senkou_span_b': _shift(midpoint(52), 26),
+        # Chikou Span (Lagging Span): Close shifted back 26 periods
+        'chikou_span': _shift(close, -26),
+    }
+
+def _ohlc_arrays(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return (
+        df['high'].to_numpy(dtype=float),
+        df['low'].to_numpy(dtype=float),
+        df['close'].to_numpy(dtype=float),
+    )
+
 def calculate_adx(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
     """
     Calculate Average Directional Index (ADX)
     
     Args:
-        df: DataFrame with OHLC data
+        df: DataFrame with OHLC data (not modified)
         period: Period for calculations
     
     Returns:
-        DataFrame with ADX values
-    """
-    # Calculate True Range
-    df['high_low'] = df['high'] - df['low']
-    df['high_close'] = abs(df['high'] - df['close'].shift())
-    df['low_close'] = abs(df['low'] - df['close'].shift())
-    df['tr'] = df[['high_low', 'high_close', 'low_close']].max(axis=1)
-    
-    # Calculate Directional Movement
-    df['up_move'] = df['high'] - df['high'].shift()
-    df['down_move'] = df['low'].shift() - df['low']
-    
-    df['plus_dm'] = np.where(
-        (df['up_move'] > df['down_move']) & (df['up_move'] > 0),
-        df['up_move'],
-        0
-    )
-    df['minus_dm'] = np.where(
-        (df['down_move'] > df['up_move']) & (df['down_move'] > 0),
-        df['down_move'],
-        0
-    )
-    
-    # Calculate ADX
-    df['+di'] = 100 * (df['plus_dm'].ewm(span=period).mean() / 
-                       df['tr'].ewm(span=period).mean())
-    df['-di'] = 100 * (df['minus_dm'].ewm(span=period).mean() / 
-                       df['tr'].ewm(span=period).mean())
-    df['dx'] = 100 * abs(df['+di'] - df['-di']) / (df['+di'] + df['-di'])
-    df['adx'] = df['dx'].ewm(span=period).mean()
-    
-    return df[['adx', '+di', '-di']]
+        DataFrame with adx, +di and -di columns
+    """
+    adx, plus_di, minus_di = adx_from_arrays(*_ohlc_arrays(df), period)
+    return pd.DataFrame({'adx': adx, '+di': plus_di, '-di': minus_di}, index=df.index)
 
 def calculate_ichimoku(df: pd.DataFrame) -> Dict[str, pd.Series]:
     """
@@ -564,33 +783,9 @@ def calculate_ichimoku(df: pd.DataFrame) -> Dict[str, pd.Series]:
     Returns:
         Dictionary containing Ichimoku components
     """
-    # Tenkan-sen (Conversion Line): (9-period high + 9-period low)/2
-    period9_high = df['high'].rolling(window=9).max()
-    period9_low = df['low'].rolling(window=9).min()
-    tenkan_sen = (period9_high + period9_low) / 2
-
-    # Kijun-sen (Base Line): (26-period high + 26-period low)/2
-    period26_high = df['high'].rolling(window=26).max()
-    period26_low = df['low'].rolling(window=26).min()
-    kijun_sen = (period26_high + period26_low) / 2
-
-    # Senkou Span A (Leading Span A): (Conversion Line + Base Line)/2
-    senkou_span_a = ((tenkan_sen + kijun_sen) / 2).shift(26)
-
-    # Senkou Span B (Leading Span B): (52-period high + 52-period low)/2
-    period52_high = df['high'].rolling(window=52).max()
-    period52_low = df['low'].rolling(window=52).min()
-    senkou_span_b = ((period52_high + period52_low) / 2).shift(26)
-
-    # Chikou Span (Lagging Span): Close shifted back 26 periods
-    chikou_span = df['close'].shift(-26)
-
     return {
-        'tenkan_sen': tenkan_sen,
-        'kijun_sen': kijun_sen,
-        'senkou_span_a': senkou_span_a,
-        'senkou_span_b': senkou_span_b,
-        'chikou_span': chikou_span
+        name: pd.Series(values, index=df.index)
+        for name, values in ichimoku_from_arrays(*_ohlc_arrays(df)).items()
     }
 
 def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
@@ -604,49 +799,100 @@ def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
     Returns:
         pd.Series: ATR values
     """
-    high_low = df['high'] - df['low']
-    high_close = abs(df['high'] - df['close'].shift())
-    low_close = abs(df['low'] - df['close'].shift())
-    
-    ranges = pd.concat([high_low, high_close, low_close], axis=1)
-    true_range = ranges.max(axis=1)
-    
-    return true_range.rolling(period).mean()
+    return pd.Series(atr_from_arrays(*_ohlc_arrays(df), period), index=df.index)
 
-def calculate_hurst_exponent(price_series: pd.Series, max_lag: int = 20) -> float:
+def calculate_hurst_exponent(price_series, max_lag: int = 20):
     """
     Calculate Hurst Exponent to determine long-term memory of time series
     H < 0.5: Mean reverting series
     H = 0.5: Random walk
     H > 0.5: Trending series
     
+    All lags are evaluated at once from a strided lag matrix, and the log-log
+    fit is a closed-form least squares slope, so many series can be handled
+    in one call.
+    
     Args:
-        price_series: Array-like price data
+        price_series: Array-like price data. A 1-D input gives one exponent;
+            a 2-D input (observations x series) gives one exponent per column
         max_lag: Maximum lag for R/S calculation
     
     Returns:
-        float: Hurst exponent
+        float for 1-D input, np.ndarray of exponents for 2-D input
+    """
+    # Positional values: subtracting two shifted pd.Series would align them
+    # on the index and difference every price with itself
+    prices = np.asarray(price_series, dtype=float)
+    n = prices.shape[0]
+    lags = np.arange(2, max_lag)
+
+    # lagged[t, ..., k] = prices[t + k] - prices[t], NaN once t + k runs past the end
+    padding = np.full((max_lag,) + prices.shape[1:], np.nan)
+    padded = np.concatenate([prices, padding])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, max_lag, axis=0)[:n]
+    lagged = windows[..., lags] - windows[..., :1]
+
+    with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+        warnings.simplefilter('ignore', RuntimeWarning)
+        # Add small epsilon to avoid log(0); lags longer than the series also get it
+        tau = np.fmax(1e-8, np.sqrt(np.nanstd(lagged, axis=0)))
+        log_tau = np.log(tau)
+        log_lags = np.log(lags) - np.log(lags).mean()
+        # Hurst exponent is the slope of the linear fit
+        slope = (log_tau - log_tau.mean(axis=-1, keepdims=True)) @ log_lags / (log_lags @ log_lags)
+
+    # Return 0.5 (random walk) if calculation fails
+    slope = np.where(np.isfinite(slope), slope, 0.5)
+    return float(slope) if prices.ndim == 1 else slope
+
+def rolling_hurst_exponent(
+    price_series,
+    window: int,
+    max_lag: int = 20,
+    chunk_size: int = 256
+):
     """
-    lags = range(2, max_lag)
-    # Add small epsilon to avoid log(0)
-    tau = [max(1e-8, np.sqrt(np.std(np.subtract(price_series[lag:], price_series[:-lag])))) for lag in lags]
+    Hurst exponent over trailing windows, evaluated in batches of windows
+    
+    Args:
+        price_series: 1-D array-like price data
+        window: Number of observations per window
+        max_lag: Maximum lag for R/S calculation
+        chunk_size: Windows evaluated per batch, bounding peak memory
     
-    # Return the Hurst exponent from linear fit
-    try:
-        reg = np.polyfit(np.log(lags), np.log(tau), 1)
-        return reg[0] # Hurst exponent is the slope
-    except (ValueError, RuntimeWarning):
-        # Return 0.5 (random walk) if calculation fails
-        return 0.5
+    Returns:
+        Hurst values aligned with the input (NaN until the first full window),
+        as a pd.Series when given a Series and a np.ndarray otherwise
+    """
+    prices = np.asarray(price_series, dtype=float)
+    result = np.full(len(prices), np.nan)
+    if len(prices) >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(prices, window)
+        for start in range(0, len(windows), chunk_size):
+            batch = windows[start:start + chunk_size].T
+            result[window - 1 + start:window - 1 + start + batch.shape[1]] = \
+                calculate_hurst_exponent(batch, max_lag)
+    if isinstance(price_series, pd.Series):
+        return pd.Series(result, index=price_series.index)
+    return result
 
 def calculate_obv(prices_df: pd.DataFrame) -> pd.Series:
-    obv = [0]
-    for i in range(1, len(prices_df)):
-        if prices_df['close'].iloc[i] > prices_df['close'].iloc[i - 1]:
-            obv.append(obv[-1] + prices_df['volume'].iloc[i])
-        elif prices_df['close'].iloc[i] < prices_df['close'].iloc[i - 1]:
-            obv.append(obv[-1] - prices_df['volume'].iloc[i])
-        else:
-            obv.append(obv[-1])
-    prices_df['OBV'] = obv
-    return prices_df['OBV']
+    """
+    Calculate On-Balance Volume
+
+    Volume is added on up closes, subtracted on down closes and ignored on
+    unchanged closes, i.e. the cumulative sum of sign(close diff) * volume.
+
+    Args:
+        prices_df: DataFrame with close and volume columns
+
+    Returns:
+        pd.Series: OBV values, starting at 0
+    """
+    close = prices_df['close'].to_numpy(dtype=float)
+    volume = prices_df['volume'].to_numpy(dtype=float)
+    direction = np.zeros(len(close))
+    direction[1:] = np.nan_to_num(np.sign(np.diff(close)))
+    # Unchanged closes add nothing, even when their volume is missing
+    flow = np.where(direction != 0, direction * volume, 0.0)
+    return pd.Series(np.cumsum(flow), index=prices_df.index, name='OBV')
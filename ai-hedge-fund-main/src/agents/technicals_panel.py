@@ -0,0 +1,188 @@
+from typing import Any, Dict, Mapping
+
+import numpy as np
+import pandas as pd
+
+from agents.technicals import (
+    STRATEGIES,
+    STRATEGY_WEIGHTS,
+    IndicatorEngine,
+    adx_from_arrays,
+    atr_from_arrays,
+    calculate_hurst_exponent,
+    combine_rule,
+    ichimoku_from_arrays,
+)
+from tools.api import prices_to_df
+
+PANEL_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+# Labels indexed by numeric signal + 1
+_LABELS = np.array(['bearish', 'neutral', 'bullish'])
+
+
+def prices_to_panel(prices_by_ticker: Mapping[str, Any]) -> pd.DataFrame:
+    """
+    Build an OHLCV panel from per-ticker price data
+
+    Args:
+        prices_by_ticker: Dict of ticker -> price list (or PriceSeries / DataFrame)
+
+    Returns:
+        DataFrame indexed by date with (field, ticker) columns, aligned on the
+        union of all dates; bars a ticker does not have are NaN
+    """
+    frames = {
+        ticker: prices if isinstance(prices, pd.DataFrame) else prices_to_df(prices)
+        for ticker, prices in prices_by_ticker.items()
+    }
+    panel = pd.concat(
+        {field: pd.DataFrame({ticker: df[field] for ticker, df in frames.items()}) for field in PANEL_FIELDS},
+        axis=1
+    )
+    return panel.sort_index().astype(float)
+
+
+def align_to_last_bar(panel: pd.DataFrame) -> pd.DataFrame:
+    """
+    Re-index a panel by bar position, each ticker on its own dates
+
+    Every ticker's bars are packed, in order and without the dates it has no
+    data for, against the last row, so row -k holds each ticker's k-th most
+    recent bar and only the rows before a ticker's history are NaN. Returns,
+    rolling windows and EWMs then run over each ticker's own bars exactly as
+    in the single-ticker calculation, instead of across gaps in the union of
+    dates.
+
+    Args:
+        panel: OHLCV panel from prices_to_panel
+
+    Returns:
+        Panel with the same columns, indexed 0..n-1 by bar position
+    """
+    tickers = panel['close'].columns
+    # A ticker has a bar on a date when any of its fields is present
+    present = np.zeros((len(panel), len(tickers)), dtype=bool)
+    for field in PANEL_FIELDS:
+        present |= panel[field].notna().to_numpy()
+    bars = present.sum(axis=0)
+    rows = int(bars.max()) if len(tickers) else 0
+
+    fields = {}
+    for field in PANEL_FIELDS:
+        values = panel[field].to_numpy(dtype=float)
+        aligned = np.full((rows, len(tickers)), np.nan)
+        for j in range(len(tickers)):
+            aligned[rows - bars[j]:, j] = values[present[:, j], j]
+        fields[field] = pd.DataFrame(aligned, columns=tickers)
+    aligned_panel = pd.concat(fields, axis=1)
+    aligned_panel.index.name = 'bar'
+    return aligned_panel
+
+
+class PanelIndicatorEngine(IndicatorEngine):
+    """
+    IndicatorEngine over a dates x tickers panel.
+
+    Every indicator is a DataFrame with one column per ticker, so each
+    strategy's features and rules run once for the whole cross-section.
+    The panel is first aligned on each ticker's last bar (align_to_last_bar),
+    so a ticker missing some of the panel's dates is computed on its own
+    bars, as technical_analyst_agent would. Indicators built from pandas
+    rolling/ewm work on the aligned panel as is; the NumPy kernels get the
+    2-D field arrays directly.
+    """
+
+    def __init__(self, panel: pd.DataFrame):
+        super().__init__(align_to_last_bar(panel))
+        self.tickers = panel['close'].columns
+
+    def _field_arrays(self):
+        return tuple(self.prices_df[field].to_numpy(dtype=float) for field in ('high', 'low', 'close'))
+
+    def _frame(self, values: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(values, index=self.prices_df.index, columns=self.tickers)
+
+    def adx(self, period: int = 14) -> Dict[str, pd.DataFrame]:
+        def compute():
+            adx, plus_di, minus_di = adx_from_arrays(*self._field_arrays(), period)
+            return {'adx': self._frame(adx), '+di': self._frame(plus_di), '-di': self._frame(minus_di)}
+        return self._memo(('adx', period), compute)
+
+    def atr(self, period: int = 14) -> pd.DataFrame:
+        return self._memo(
+            ('atr', period),
+            lambda: self._frame(atr_from_arrays(*self._field_arrays(), period))
+        )
+
+    def ichimoku(self) -> Dict[str, pd.DataFrame]:
+        return self._memo(('ichimoku',), lambda: {
+            name: self._frame(values)
+            for name, values in ichimoku_from_arrays(*self._field_arrays()).items()
+        })
+
+    def obv(self) -> pd.DataFrame:
+        def compute():
+            # Same flow as calculate_obv: nothing on unchanged closes
+            direction = np.sign(self.close.diff()).fillna(0)
+            return (direction * self.volume).where(direction != 0, 0.0).cumsum()
+        return self._memo(('obv',), compute)
+
+    def hurst_exponent(self, max_lag: int = 20) -> pd.Series:
+        """Hurst exponent of each ticker's full history"""
+        return self._memo(
+            ('hurst_exponent', max_lag),
+            lambda: pd.Series(calculate_hurst_exponent(self.close, max_lag), index=self.tickers)
+        )
+
+
+def _cross_section(features: Dict[str, Any]) -> Dict[str, pd.Series]:
+    """Last row of every panel feature; per-ticker Series are already a cross-section"""
+    return {
+        name: value.iloc[-1] if isinstance(value, pd.DataFrame) else value
+        for name, value in features.items()
+    }
+
+
+def calculate_panel_signals(
+    panel: pd.DataFrame,
+    weights: Dict[str, float] = None
+) -> pd.DataFrame:
+    """
+    Run every technical strategy for all tickers of a panel in one pass
+
+    Produces the same signals, confidences and metrics as
+    technical_analyst_agent would for each ticker on its own, as of each
+    ticker's last bar in the panel.
+
+    Args:
+        panel: OHLCV panel from prices_to_panel
+        weights: Strategy weights for the overall signal (defaults to
+            STRATEGY_WEIGHTS)
+
+    Returns:
+        DataFrame indexed by ticker with signal/confidence columns, one
+        <strategy>_signal and <strategy>_confidence pair per strategy and
+        each strategy's metrics
+    """
+    weights = STRATEGY_WEIGHTS if weights is None else weights
+    indicators = PanelIndicatorEngine(panel)
+    tickers = indicators.tickers
+
+    columns: Dict[str, Any] = {}
+    signals, confidences = {}, {}
+    for name, (features, rule, metric_names, _) in STRATEGIES.items():
+        latest = _cross_section(features(indicators))
+        signal, confidence = rule(latest)
+        signals[name] = signal
+        confidences[name] = np.broadcast_to(confidence, signal.shape).astype(float)
+        columns[f'{name}_signal'] = _LABELS[signal + 1]
+        columns[f'{name}_confidence'] = confidences[name]
+        for metric in metric_names:
+            columns[metric] = np.broadcast_to(np.asarray(latest[metric], dtype=float), signal.shape)
+
+    overall, overall_confidence = combine_rule(signals, confidences, weights)
+    table = pd.DataFrame(columns, index=pd.Index(tickers, name='ticker'))
+    table.insert(0, 'signal', _LABELS[overall + 1])
+    table.insert(1, 'confidence', overall_confidence)
+    return table
@@ -1,26 +1,64 @@
+import json
 from datetime import datetime, timedelta
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
-from main import run_hedge_fund
-from tools.manual_input import get_price_data
+from agents.streaming import StreamingTechnicals
+from agents.technicals import (
+    STRATEGIES,
+    STRATEGY_WEIGHTS,
+    IndicatorEngine,
+    evaluate_features,
+    required_history,
+    signal_history,
+    weighted_signal_combination,
+)
+from main import backtest_agent, run_hedge_fund
+from tools.point_in_time import MarketData
+from tools.price_store import PriceSeries
 
 class Backtester:
-    def __init__(self, agent, ticker, start_date, end_date, initial_capital, manual_data):
+    """
+    Day-by-day backtest of an agent over one ticker.
+
+    The agent is called with (ticker, start_date, end_date, portfolio,
+    manual_data) and may return a decision dict (backtest_agent, which runs
+    the compiled graph with no per-day output) or a JSON string
+    (run_hedge_fund, which also writes a report and prints a summary per day).
+    Each day's decision is kept in self.decisions and, if decision_log is
+    set, appended to that JSONL file as it happens.
+    """
+
+    def __init__(self, agent, ticker, start_date, end_date, initial_capital, manual_data, decision_log=None, verbose=True):
         self.agent = agent
         self.ticker = ticker
         self.start_date = start_date
         self.end_date = end_date
         self.initial_capital = initial_capital
-        self.manual_data = manual_data
+        # Parse and sort the price history once; the agents and the daily
+        # price lookups below all share this series
+        self.price_series = PriceSeries.from_records(manual_data["prices"])
+        # The date indexes are built once here; each day's point-in-time
+        # slice is then a binary search
+        self.manual_data = MarketData.wrap(manual_data).replace(prices=self.price_series).indexed()
+        # Bars the agents need per decision, sized from the indicator warm-ups
+        self.lookback_bars = required_history()
+        # Technical features advanced one bar per day instead of recomputed
+        # over the whole lookback window on every decision
+        self.technicals = StreamingTechnicals(hurst_window=self.lookback_bars)
         self.portfolio = {"cash": initial_capital, "stock": 0}
         self.portfolio_values = []
+        self.decisions = []
+        self.decision_log = decision_log
+        self.verbose = verbose
 
     def parse_action(self, agent_output):
+        if isinstance(agent_output, dict):
+            return agent_output.get("action", "hold"), agent_output.get("quantity", 0)
         try:
             # Expect JSON output from agent
-            import json
             decision = json.loads(agent_output)
             return decision["action"], decision["quantity"]
         except:
@@ -55,46 +93,121 @@ class Backtester:
     def run_backtest(self):
         dates = pd.date_range(self.start_date, self.end_date, freq="B")
 
-        print("\nStarting backtest...")
-        print(f"{'Date':<12} {'Ticker':<6} {'Action':<6} {'Quantity':>8} {'Price':>8} {'Cash':>12} {'Stock':>8} {'Total Value':>12}")
-        print("-" * 100)
+        if self.verbose:
+            print("\nStarting backtest...")
+            print(f"{'Date':<12} {'Ticker':<6} {'Action':<6} {'Quantity':>8} {'Price':>8} {'Cash':>12} {'Stock':>8} {'Total Value':>12}")
+            print("-" * 100)
 
-        for current_date in dates:
-            lookback_start = (current_date - timedelta(days=30)).strftime("%Y-%m-%d")
-            current_date_str = current_date.strftime("%Y-%m-%d")
+        # One append-only log for the whole run instead of a report per day
+        log = open(self.decision_log, "a", encoding="utf-8") if self.decision_log else None
+        try:
+            for current_date in dates:
+                self.run_day(current_date, log)
+        finally:
+            if log:
+                log.close()
 
-            agent_output = self.agent(
-                ticker=self.ticker,
-                start_date=lookback_start,
-                end_date=current_date_str,
-                portfolio=self.portfolio,
-                manual_data=self.manual_data
-            )
+    def run_day(self, current_date, log=None):
+        self.apply_decision(current_date, self.decide(current_date), log)
+
+    def lookback_start(self, current_date):
+        """First date of the warm-up window of bars ending on current_date"""
+        window = self.price_series.slice(None, current_date.strftime("%Y-%m-%d")).tail(self.lookback_bars)
+        if not len(window):
+            return current_date.strftime("%Y-%m-%d")
+        return str(window.time[0])
+
+    def technical_features(self, current_date):
+        """
+        Latest technical features as of current_date, or None before the first bar
+
+        Feeds the streaming indicators every bar up to current_date that they
+        have not seen yet, so a run over consecutive days costs O(1) per day.
+        Going back in time starts the indicators over.
+        """
+        series = self.price_series
+        bars = int(np.searchsorted(series.time, np.datetime64(current_date.strftime("%Y-%m-%d")), side="right"))
+        if bars < self.technicals.bars:
+            self.technicals = StreamingTechnicals(hurst_window=self.lookback_bars)
+        self.technicals.feed(series, bars)
+        return self.technicals.features() if bars else None
+
+    def decide(self, current_date):
+        """Ask the agent for a decision on one day against the current portfolio"""
+        lookback_start = self.lookback_start(current_date)
+        current_date_str = current_date.strftime("%Y-%m-%d")
+        manual_data = self.manual_data
+        features = self.technical_features(current_date)
+        if features is not None:
+            manual_data = manual_data.replace(technical_features=features)
+
+        return self.agent(
+            ticker=self.ticker,
+            start_date=lookback_start,
+            end_date=current_date_str,
+            portfolio=self.portfolio,
+            manual_data=manual_data
+        )
+
+    def apply_decision(self, current_date, agent_output, log=None):
+        """Execute one day's decision at that day's close and record the result"""
+        current_date_str = current_date.strftime("%Y-%m-%d")
 
-            action, quantity = self.parse_action(agent_output)
-            df = get_price_data(self.manual_data["prices"], lookback_start, current_date_str)
-            if df.empty:
+        action, quantity = self.parse_action(agent_output)
+        window = self.price_series.slice(None, current_date_str)
+        if not len(window):
+            if self.verbose:
                 print(f"No price data available for {current_date_str}, skipping...")
-                continue
-            current_price = df.iloc[-1]['close']
+            return
+        current_price = float(window.close[-1])
 
-            # Execute the trade with validation
-            executed_quantity = self.execute_trade(action, quantity, current_price)
+        # Execute the trade with validation
+        executed_quantity = self.execute_trade(action, quantity, current_price)
 
-            # Update total portfolio value
-            total_value = self.portfolio["cash"] + self.portfolio["stock"] * current_price
-            self.portfolio["portfolio_value"] = total_value
+        # Update total portfolio value
+        total_value = self.portfolio["cash"] + self.portfolio["stock"] * current_price
+        self.portfolio["portfolio_value"] = total_value
 
-            # Log the current state with executed quantity
+        # Log the current state with executed quantity
+        if self.verbose:
             print(
-                f"{current_date.strftime('%Y-%m-%d'):<12} {self.ticker:<6} {action:<6} {executed_quantity:>8} {current_price:>8.2f} "
+                f"{current_date_str:<12} {self.ticker:<6} {action:<6} {executed_quantity:>8} {current_price:>8.2f} "
                 f"{self.portfolio['cash']:>12.2f} {self.portfolio['stock']:>8} {total_value:>12.2f}"
             )
 
-            # Record the portfolio value
-            self.portfolio_values.append(
-                {"Date": current_date, "Portfolio Value": total_value}
-            )
+        record = {
+            "date": current_date_str,
+            "ticker": self.ticker,
+            "action": action,
+            "quantity": quantity,
+            "executed_quantity": executed_quantity,
+            "price": current_price,
+            "cash": self.portfolio["cash"],
+            "stock": self.portfolio["stock"],
+            "portfolio_value": total_value,
+        }
+        if isinstance(agent_output, dict):
+            record["confidence"] = agent_output.get("confidence")
+            record["decision_path"] = agent_output.get("decision_path")
+        self.decisions.append(record)
+        if log:
+            log.write(json.dumps(record) + "\n")
+
+        # Record the portfolio value
+        self.portfolio_values.append(
+            {"Date": current_date, "Portfolio Value": total_value}
+        )
+
+    def write_report(self, path):
+        """Write every decision of the run to one JSON report"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "ticker": self.ticker,
+                "start_date": self.start_date,
+                "end_date": self.end_date,
+                "initial_capital": self.initial_capital,
+                "decisions": self.decisions,
+            }, f, indent=2)
 
     def analyze_performance(self):
         """Calculate and display performance metrics"""
@@ -108,26 +221,156 @@ class Backtester:
         # Calculate returns
         df['Returns'] = df['Portfolio Value'].pct_change()
 
-        # Calculate metrics
-        total_return = (df['Portfolio Value'].iloc[-1] - self.initial_capital) / self.initial_capital
-        annualized_return = (1 + total_return) ** (252 / len(df)) - 1
-        volatility = df['Returns'].std() * (252 ** 0.5)
-        sharpe_ratio = annualized_return / volatility if volatility != 0 else 0
-        max_drawdown = (df['Portfolio Value'] / df['Portfolio Value'].cummax() - 1).min()
+        metrics = performance_metrics(df['Portfolio Value'], self.initial_capital)
 
         print("\nPerformance Metrics:")
-        print(f"Total Return: {total_return:.2%}")
-        print(f"Annualized Return: {annualized_return:.2%}")
-        print(f"Annualized Volatility: {volatility:.2%}")
-        print(f"Sharpe Ratio: {sharpe_ratio:.2f}")
-        print(f"Maximum Drawdown: {max_drawdown:.2%}")
+        print(f"Total Return: {metrics['total_return']:.2%}")
+        print(f"Annualized Return: {metrics['annualized_return']:.2%}")
+        print(f"Annualized Volatility: {metrics['volatility']:.2%}")
+        print(f"Sharpe Ratio: {metrics['sharpe_ratio']:.2f}")
+        print(f"Maximum Drawdown: {metrics['max_drawdown']:.2%}")
 
         return df
 
+
+def performance_metrics(portfolio_value: pd.Series, initial_capital: float) -> dict:
+    """
+    Performance metrics of a daily portfolio value series
+
+    Returns:
+        dict with total_return, annualized_return, volatility, sharpe_ratio
+        and max_drawdown
+    """
+    returns = portfolio_value.pct_change()
+
+    # Calculate metrics
+    total_return = (portfolio_value.iloc[-1] - initial_capital) / initial_capital
+    annualized_return = (1 + total_return) ** (252 / len(portfolio_value)) - 1
+    volatility = returns.std() * (252 ** 0.5)
+    sharpe_ratio = annualized_return / volatility if volatility != 0 else 0
+    max_drawdown = (portfolio_value / portfolio_value.cummax() - 1).min()
+
+    return {
+        "total_return": float(total_return),
+        "annualized_return": float(annualized_return),
+        "volatility": float(volatility),
+        "sharpe_ratio": float(sharpe_ratio),
+        "max_drawdown": float(max_drawdown),
+    }
+
+def simulate_signals(
+    close: pd.Series,
+    signal: pd.Series,
+    initial_capital: float,
+    allow_short: bool = False,
+    cost: float = 0.0
+) -> pd.DataFrame:
+    """
+    Vectorized backtest of a signal history over a price series
+
+    A bullish signal goes fully long and a bearish one exits (or goes fully
+    short with allow_short); neutral keeps the previous position. Trades
+    fill at the close of the signal's bar, like the day-by-day Backtester,
+    but in fractional shares, so the whole run is a handful of array
+    operations.
+
+    Args:
+        close: Closing prices
+        signal: Signal per bar (-1/0/1), aligned with close
+        initial_capital: Starting cash
+        allow_short: Hold a short position on bearish signals
+        cost: Transaction cost as a fraction of the traded value
+
+    Returns:
+        DataFrame indexed like close with signal, position, shares, trade,
+        returns, strategy_returns and portfolio_value columns
+    """
+    prices = close.to_numpy(dtype=float)
+    signals = np.nan_to_num(signal.reindex(close.index).to_numpy(dtype=float))
+    targets = signals if allow_short else np.maximum(signals, 0)
+
+    # Forward-fill the last non-neutral signal into the held position
+    changed = signals != 0
+    last = np.maximum.accumulate(np.where(changed, np.arange(len(signals)), -1))
+    position = np.where(last >= 0, targets[np.maximum(last, 0)], 0.0)
+
+    returns = np.zeros(len(prices))
+    returns[1:] = prices[1:] / prices[:-1] - 1
+    held = np.concatenate([[0.0], position[:-1]])
+    turnover = np.abs(np.diff(position, prepend=0.0))
+    # Costs come out of the value after the bar's return, on the traded fraction
+    strategy_returns = (1 + held * returns) * (1 - turnover * cost) - 1
+    portfolio_value = initial_capital * np.cumprod(1 + strategy_returns)
+
+    return pd.DataFrame({
+        "close": prices,
+        "signal": signals,
+        "position": position,
+        "shares": position * portfolio_value / prices,
+        "trade": turnover > 0,
+        "returns": returns,
+        "strategy_returns": strategy_returns,
+        "portfolio_value": portfolio_value,
+    }, index=close.index)
+
+
+# Order size for "as many shares as possible": execute_trade caps a buy at
+# what the cash affords and a sell at the shares held
+ALL_SHARES = 10 ** 12
+
+
+def technical_signal_agent(ticker, start_date, end_date, portfolio, manual_data):
+    """
+    Rule-only agent trading the combined technical signal, without the graph
+
+    Goes all in on a bullish signal, sells everything on a bearish one and
+    holds otherwise, like simulate_signals without shorting. It reads the
+    technical features the Backtester streams into manual_data and never
+    looks at the portfolio, so its decisions can be generated out of date
+    order and replayed (see parallel_backtester's decision-only mode).
+
+    Returns:
+        dict: Decision with action, quantity, confidence and decision_path
+    """
+    features = manual_data.get("technical_features")
+    if features is None:
+        return {"action": "hold", "quantity": 0, "confidence": 0.0, "decision_path": "technical"}
+    strategy_signals = {name: evaluate_features(name, features[name]) for name in STRATEGIES}
+    combined = weighted_signal_combination({
+        name: {'signal': result.signal, 'confidence': result.confidence}
+        for name, result in strategy_signals.items()
+    }, STRATEGY_WEIGHTS)
+    action = {"bullish": "buy", "bearish": "sell"}.get(combined["signal"], "hold")
+    return {
+        "action": action,
+        "quantity": ALL_SHARES if action != "hold" else 0,
+        "confidence": combined["confidence"],
+        "decision_path": "technical",
+    }
+
+
+def run_vectorized_backtest(ticker, start_date, end_date, initial_capital, manual_data, **options):
+    """
+    Rule-only backtest over the technical signal history, without the graph
+
+    Indicators are computed once over the whole price history (so they are
+    warmed up at start_date), and every bar's signal only uses prices up to
+    that bar.
+
+    Returns:
+        DataFrame from simulate_signals for start_date..end_date
+    """
+    prices_df = PriceSeries.from_records(manual_data["prices"]).to_frame()
+    history = signal_history(IndicatorEngine(prices_df))
+    window = slice(pd.Timestamp(start_date), pd.Timestamp(end_date))
+    return simulate_signals(
+        prices_df["close"].loc[window], history["signal"].loc[window], initial_capital, **options
+    )
+
+
 ### Run the Backtest #####
 if __name__ == "__main__":
     import argparse
-    import json
     
     # Set up argument parser
     parser = argparse.ArgumentParser(description='Run backtesting simulation')
@@ -136,6 +379,12 @@ if __name__ == "__main__":
     parser.add_argument('--start_date', type=str, default=(datetime.now() - timedelta(days=90)).strftime('%Y-%m-%d'), help='Start date in YYYY-MM-DD format')
     parser.add_argument('--initial_capital', type=float, default=100000, help='Initial capital amount (default: 100000)')
     parser.add_argument('--manual_data', type=str, required=True, help='Path to JSON file containing manual financial data')
+    parser.add_argument('--full_reports', action='store_true', help='Run the full hedge fund per day, saving a report and printing a summary each day')
+    parser.add_argument('--decision_log', type=str, help='Append each day\'s decision to this JSONL file')
+    parser.add_argument('--report', type=str, help='Write all decisions to this JSON file at the end')
+    parser.add_argument('--quiet', action='store_true', help='Do not print a line per day')
+    parser.add_argument('--vectorized', action='store_true', help='Simulate the technical signal history only, without running the agents per day')
+    parser.add_argument('--allow_short', action='store_true', help='Go short on bearish signals in vectorized mode')
 
     args = parser.parse_args()
 
@@ -148,16 +397,33 @@ if __name__ == "__main__":
     except json.JSONDecodeError:
         raise ValueError(f"Invalid JSON format in manual data file: {args.manual_data}")
 
-    # Create an instance of Backtester
-    backtester = Backtester(
-        agent=run_hedge_fund,
-        ticker=args.ticker,
-        start_date=args.start_date,
-        end_date=args.end_date,
-        initial_capital=args.initial_capital,
-        manual_data=manual_data
-    )
+    if args.vectorized:
+        result = run_vectorized_backtest(
+            args.ticker, args.start_date, args.end_date, args.initial_capital, manual_data,
+            allow_short=args.allow_short
+        )
+        metrics = performance_metrics(result["portfolio_value"], args.initial_capital)
+        print(f"\nVectorized backtest: {len(result)} days, {int(result['trade'].sum())} trades")
+        print(f"Total Return: {metrics['total_return']:.2%}")
+        print(f"Annualized Return: {metrics['annualized_return']:.2%}")
+        print(f"Annualized Volatility: {metrics['volatility']:.2%}")
+        print(f"Sharpe Ratio: {metrics['sharpe_ratio']:.2f}")
+        print(f"Maximum Drawdown: {metrics['max_drawdown']:.2%}")
+    else:
+        # Create an instance of Backtester
+        backtester = Backtester(
+            agent=run_hedge_fund if args.full_reports else backtest_agent,
+            ticker=args.ticker,
+            start_date=args.start_date,
+            end_date=args.end_date,
+            initial_capital=args.initial_capital,
+            manual_data=manual_data,
+            decision_log=args.decision_log,
+            verbose=not args.quiet
+        )
 
-    # Run the backtesting process
-    backtester.run_backtest()
-    performance_df = backtester.analyze_performance()
+        # Run the backtesting process
+        backtester.run_backtest()
+        if args.report:
+            backtester.write_report(args.report)
+        performance_df = backtester.analyze_performance()
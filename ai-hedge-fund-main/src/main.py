@@ -1,41 +1,30 @@
 from langchain_core.messages import HumanMessage
 from langgraph.graph import END, StateGraph
 
+from agents.execution import process_node
 from agents.fundamentals import fundamentals_agent
 from agents.market_data import market_data_agent
 from agents.portfolio_manager import portfolio_management_agent
 from agents.technicals import technical_analyst_agent
 from agents.risk_manager import risk_management_agent
 from agents.sentiment import sentiment_agent
-from agents.state import AgentState
+from agents.state import AgentState, get_agent_message
+from tools.point_in_time import MarketData
 
 import argparse
+import asyncio
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import os
+from tools.rate_limiter import RateLimiter, get_llm_rate_limiter, set_llm_rate_limiter
 from tools.web_research import get_stock_data
 from dotenv import load_dotenv
-import google.generativeai as genai
 from pathlib import Path
 
 # Load environment variables
 load_dotenv()
 
-# Configure Gemini API
-api_key = os.getenv('GOOGLE_GEMINI_API_KEY')
-if not api_key:
-    print("\nError: GOOGLE_GEMINI_API_KEY environment variable not set!")
-    print("Please follow these steps:")
-    print("1. Create a .env file in the project root directory")
-    print("2. Add your Gemini API key to the file:")
-    print("   GOOGLE_GEMINI_API_KEY=your-api-key-here")
-    print("3. Make sure to get your API key from: https://ai.google.dev/")
-    exit(1)
-
-# Initialize Gemini
-genai.configure(api_key=api_key)
-model = genai.GenerativeModel('gemini-pro')
-
 def save_output(state, ticker, timestamp):
     """Save analysis results to a well-formatted text file"""
     
@@ -46,12 +35,12 @@ def save_output(state, ticker, timestamp):
     # Format filename with timestamp using Path
     filename = output_dir / f"{ticker}_analysis_{timestamp}.txt"
     
-    def get_agent_message(messages, agent_name):
+    def parse_agent_message(agent_name):
         """Safely get and parse an agent's message"""
         try:
-            msg = next((msg.content for msg in messages if msg.name == agent_name), None)
+            msg = get_agent_message(state, agent_name)
             if msg:
-                return json.loads(msg)
+                return json.loads(msg.content)
         except Exception:
             pass
         return {
@@ -66,11 +55,11 @@ def save_output(state, ticker, timestamp):
         f.write(f"Generated on: {timestamp}\n\n")
         
         # Get all agent messages
-        risk = get_agent_message(state["messages"], "risk_management_agent")
-        tech = get_agent_message(state["messages"], "technical_analyst")
-        fund = get_agent_message(state["messages"], "fundamentals_agent")
-        sent = get_agent_message(state["messages"], "sentiment_agent")
-        port = get_agent_message(state["messages"], "portfolio_management")
+        risk = parse_agent_message("risk_management_agent")
+        tech = get_technical_signal(state)
+        fund = parse_agent_message("fundamentals_agent")
+        sent = parse_agent_message("sentiment_agent")
+        port = parse_agent_message("portfolio_management")
         
         # Write overall decision section
         f.write("=== OVERALL DECISION ===\n")
@@ -127,10 +116,22 @@ def save_output(state, ticker, timestamp):
         f.write(f"Action: {port.get('action', 'N/A')}\n")
         f.write(f"Quantity: {port.get('quantity', 0)}\n")
         f.write(f"Confidence: {format_confidence(port.get('confidence', 0)):.1f}%\n")
+        f.write(f"Decision Path: {port.get('decision_path', 'llm')}\n")
         f.write(f"Reasoning: {port.get('reasoning', 'N/A')}\n")
     
     return filename
 
+def get_technical_signal(state):
+    """Return the technical analyst's signal as a dict, read from state data"""
+    technical_signal = state["data"].get("technical_signal")
+    if technical_signal is None:
+        return {
+            "signal": "N/A",
+            "confidence": 0,
+            "reasoning": "No analysis available"
+        }
+    return technical_signal.to_dict()
+
 def format_confidence(value):
     """Format confidence value as percentage, capped at 100%"""
     try:
@@ -145,8 +146,15 @@ def format_confidence(value):
         pass
     return 0.0
 
-def format_output(messages):
-    """Format the output messages into a clear structure"""
+def format_output(messages, technical_signal=None):
+    """
+    Format the output messages into a clear structure
+
+    Args:
+        messages: Messages from the final state
+        technical_signal: AgentSignal from state data; used instead of parsing
+            the technical analyst message when given
+    """
     output = {
         "summary": {},
         "detailed_analysis": {
@@ -160,6 +168,11 @@ def format_output(messages):
     
     # Process each message
     for msg in messages:
+        if msg.name == "technical_analyst" and technical_signal is not None:
+            content = technical_signal.to_dict()
+            content['confidence'] = format_confidence(technical_signal.confidence)
+            output["detailed_analysis"]["technical"] = content
+            continue
         try:
             # Try to parse as JSON first
             try:
@@ -172,7 +185,7 @@ def format_output(messages):
             if 'confidence' in content:
                 content['confidence'] = format_confidence(content['confidence'])
             
-            if msg.name == "technical_analyst_agent":
+            if msg.name == "technical_analyst":
                 output["detailed_analysis"]["technical"] = content
             elif msg.name == "fundamentals_agent":
                 output["detailed_analysis"]["fundamental"] = content
@@ -214,49 +227,59 @@ def format_output(messages):
     return output
 
 ##### Run the Hedge Fund #####
-def run_hedge_fund(ticker: str, start_date: str, end_date: str, portfolio: dict, manual_data: dict, show_reasoning: bool = False):
-    final_state = app.invoke(
-        {
-            "messages": [
-                HumanMessage(
-                    content="Make a trading decision based on the provided data.",
-                )
-            ],
-            "data": {
-                "ticker": ticker,
-                "portfolio": portfolio,
-                "start_date": start_date,
-                "end_date": end_date,
-                "manual_data": manual_data
-            },
-            "metadata": {
-                "show_reasoning": show_reasoning,
-            }
+def initial_state(ticker: str, start_date: str, end_date: str, portfolio: dict, manual_data: dict, show_reasoning: bool = False) -> AgentState:
+    """Build the graph input for one ticker"""
+    return {
+        "messages": [
+            HumanMessage(
+                content="Make a trading decision based on the provided data.",
+            )
+        ],
+        "agent_messages": {},
+        "data": {
+            "ticker": ticker,
+            "portfolio": portfolio,
+            "start_date": start_date,
+            "end_date": end_date,
+            "manual_data": MarketData.wrap(manual_data)
         },
-    )
-    
-    # Format and save the output
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = save_output(final_state, ticker, timestamp)
-    
-    def get_agent_signal(messages, agent_name):
-        """Get signal from agent message"""
-        try:
-            msg = next((msg.content for msg in messages if msg.name == agent_name), None)
-            if msg:
-                signal = json.loads(msg)
-                return signal
-        except:
-            pass
-        return None
-    
-    # Get all agent signals
-    tech = get_agent_signal(final_state["messages"], "technical_analyst")
-    fund = get_agent_signal(final_state["messages"], "fundamentals_agent")
-    sent = get_agent_signal(final_state["messages"], "sentiment_agent")
-    risk = get_agent_signal(final_state["messages"], "risk_management_agent")
-    port = get_agent_signal(final_state["messages"], "portfolio_management")
-    
+        "metadata": {
+            "show_reasoning": show_reasoning,
+            "technical_history_points": int(os.getenv('TECHNICAL_HISTORY_POINTS', 0)),
+        }
+    }
+
+def get_agent_signal(state, agent_name):
+    """Get signal from agent message"""
+    try:
+        msg = get_agent_message(state, agent_name)
+        if msg:
+            signal = json.loads(msg.content)
+            return signal
+    except:
+        pass
+    return None
+
+def collect_signals(final_state):
+    """Return each agent's parsed output from a final graph state (None if missing)"""
+    technical_signal = final_state["data"].get("technical_signal")
+    return {
+        "technical": technical_signal.to_dict() if technical_signal else None,
+        "fundamental": get_agent_signal(final_state, "fundamentals_agent"),
+        "sentiment": get_agent_signal(final_state, "sentiment_agent"),
+        "risk": get_agent_signal(final_state, "risk_management_agent"),
+        "portfolio": get_agent_signal(final_state, "portfolio_management"),
+    }
+
+def print_summary(final_state, ticker: str, output_file, show_reasoning: bool = False):
+    """Print the decision and supporting signals to the console"""
+    signals = collect_signals(final_state)
+    tech = signals["technical"]
+    fund = signals["fundamental"]
+    sent = signals["sentiment"]
+    risk = signals["risk"]
+    port = signals["portfolio"]
+
     # Calculate position size once
     position_size = risk.get('position_size', 0) * 100 if risk else 0
     
@@ -323,40 +346,197 @@ def run_hedge_fund(ticker: str, start_date: str, end_date: str, portfolio: dict,
             print(f"Reasoning: {risk.get('reasoning', 'N/A')}")
     
     print(f"\nFull analysis saved to: {output_file}")
+
+def run_hedge_fund(ticker: str, start_date: str, end_date: str, portfolio: dict, manual_data: dict, show_reasoning: bool = False):
+    final_state = app.invoke(
+        initial_state(ticker, start_date, end_date, portfolio, manual_data, show_reasoning)
+    )
+    
+    # Format and save the output
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = save_output(final_state, ticker, timestamp)
+    print_summary(final_state, ticker, output_file, show_reasoning)
     
-    return final_state["messages"][-1].content
+    return get_agent_message(final_state, "portfolio_management").content
+
+def decision_result(final_state, ticker: str) -> dict:
+    """Structured decision for one ticker, as returned by the async and batch APIs"""
+    signals = collect_signals(final_state)
+    port = signals["portfolio"] or {}
+    risk = signals["risk"] or {}
+    return {
+        "ticker": ticker,
+        "action": port.get("action", "hold"),
+        "quantity": port.get("quantity", 0),
+        "confidence": port.get("confidence", 0.0),
+        "position_size": risk.get("position_size", 0.0),
+        "reasoning": port.get("reasoning", ""),
+        "decision_path": port.get("decision_path"),
+        "signals": {
+            name: {"signal": signal.get("signal"), "confidence": signal.get("confidence")}
+            for name, signal in signals.items()
+            if signal and name != "portfolio"
+        },
+        "error": None
+    }
+
+def backtest_agent(ticker: str, start_date: str, end_date: str, portfolio: dict, manual_data: dict, show_reasoning: bool = False) -> dict:
+    """
+    Run the compiled graph for one backtest step, without console or file output
+
+    Returns:
+        dict: Structured decision (see decision_result)
+    """
+    final_state = app.invoke(
+        initial_state(ticker, start_date, end_date, portfolio, manual_data, show_reasoning)
+    )
+    return decision_result(final_state, ticker)
+
+async def arun_hedge_fund(ticker: str, start_date: str, end_date: str, portfolio: dict, manual_data: dict, show_reasoning: bool = False, config: dict = None) -> dict:
+    """
+    Async variant of run_hedge_fund without console or file output
+
+    Returns:
+        dict: Structured decision (see decision_result)
+    """
+    final_state = await app.ainvoke(
+        initial_state(ticker, start_date, end_date, portfolio, manual_data, show_reasoning),
+        config=config
+    )
+    return decision_result(final_state, ticker)
+
+async def arun_hedge_fund_batch(
+    tickers,
+    start_date: str,
+    end_date: str,
+    portfolio: dict,
+    manual_data: dict = None,
+    max_concurrency: int = 10
+) -> dict:
+    """
+    Run the graph for many tickers concurrently
+
+    Args:
+        tickers: Ticker symbols
+        start_date: Start date shared by all tickers
+        end_date: End date shared by all tickers
+        portfolio: Starting portfolio, copied for each ticker
+        manual_data: Optional dict of ticker -> market data; tickers without
+            an entry are fetched with get_stock_data
+        max_concurrency: Maximum number of tickers in flight
+
+    Returns:
+        dict: ticker -> structured decision; failed tickers have "error" set
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    manual_data = manual_data or {}
 
-# Define the new workflow
-workflow = StateGraph(AgentState)
+    async def run_one(ticker):
+        async with semaphore:
+            try:
+                ticker_data = manual_data.get(ticker)
+                if ticker_data is None:
+                    ticker_data = await asyncio.to_thread(get_stock_data, ticker)
+                if not ticker_data:
+                    raise ValueError(f"No market data available for {ticker}")
+                return await arun_hedge_fund(
+                    ticker, start_date, end_date, dict(portfolio), ticker_data
+                )
+            except Exception as e:
+                return {"ticker": ticker, "error": str(e)}
+
+    results = await asyncio.gather(*(run_one(ticker) for ticker in tickers))
+    return {result["ticker"]: result for result in results}
+
+def run_hedge_fund_batch(
+    tickers,
+    start_date: str,
+    end_date: str,
+    portfolio: dict,
+    manual_data: dict = None,
+    max_concurrency: int = 10,
+    llm_requests_per_minute: float = None
+) -> dict:
+    """
+    Blocking entry point for arun_hedge_fund_batch
+
+    Args:
+        llm_requests_per_minute: Cap on Gemini calls across the whole batch;
+            defaults to LLM_REQUESTS_PER_MINUTE (unset means no limit). The
+            shared limiter is restored when the batch returns.
+
+    See arun_hedge_fund_batch for the other arguments and the result.
+    """
+    async def run_batch():
+        # Sync graph nodes run on the loop's default executor; give it enough
+        # threads for every ticker in flight to run its analysts side by side
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=max_concurrency * 3)
+        )
+        return await arun_hedge_fund_batch(
+            tickers, start_date, end_date, portfolio, manual_data, max_concurrency
+        )
+
+    if not llm_requests_per_minute:
+        return asyncio.run(run_batch())
+
+    previous_limiter = get_llm_rate_limiter()
+    set_llm_rate_limiter(RateLimiter(llm_requests_per_minute))
+    try:
+        return asyncio.run(run_batch())
+    finally:
+        set_llm_rate_limiter(previous_limiter)
 
-# Add nodes for each agent
-workflow.add_node("market_data", market_data_agent)
-workflow.add_node("technical_analyst", technical_analyst_agent)
-workflow.add_node("fundamentals_agent", fundamentals_agent)
-workflow.add_node("sentiment_agent", sentiment_agent)
-workflow.add_node("risk_management_agent", risk_management_agent)
-workflow.add_node("portfolio_management", portfolio_management_agent)
+def build_workflow(parallel: bool = False):
+    """
+    Build and compile the agent workflow
 
-# Define the workflow
-workflow.set_entry_point("market_data")
+    Args:
+        parallel: Run the technical analyst in a worker process so the
+            pandas work does not hold the GIL while the other analysts run
+            on LangGraph's thread pool. Set the thread count per call with
+            config={"max_concurrency": n}.
 
-# Market data feeds into analysis agents
-workflow.add_edge("market_data", "technical_analyst")
-workflow.add_edge("market_data", "fundamentals_agent")
-workflow.add_edge("market_data", "sentiment_agent")
+    Returns:
+        Compiled LangGraph app
+    """
+    technical_node = technical_analyst_agent
+    if parallel:
+        technical_node = process_node(technical_analyst_agent, data_keys=["prices", "technical_features"])
 
-# Analysis agents feed into risk management
-workflow.add_edge("technical_analyst", "risk_management_agent")
-workflow.add_edge("fundamentals_agent", "risk_management_agent")
-workflow.add_edge("sentiment_agent", "risk_management_agent")
+    # Define the new workflow
+    workflow = StateGraph(AgentState)
 
-# Risk management feeds into portfolio management
-workflow.add_edge("risk_management_agent", "portfolio_management")
+    # Add nodes for each agent
+    workflow.add_node("market_data", market_data_agent)
+    workflow.add_node("technical_analyst", technical_node)
+    workflow.add_node("fundamentals_agent", fundamentals_agent)
+    workflow.add_node("sentiment_agent", sentiment_agent)
+    workflow.add_node("risk_management_agent", risk_management_agent)
+    workflow.add_node("portfolio_management", portfolio_management_agent)
 
-# Portfolio management is the final step
-workflow.add_edge("portfolio_management", END)
+    # Define the workflow
+    workflow.set_entry_point("market_data")
 
-app = workflow.compile()
+    # Market data feeds into analysis agents
+    workflow.add_edge("market_data", "technical_analyst")
+    workflow.add_edge("market_data", "fundamentals_agent")
+    workflow.add_edge("market_data", "sentiment_agent")
+
+    # Analysis agents feed into risk management
+    workflow.add_edge("technical_analyst", "risk_management_agent")
+    workflow.add_edge("fundamentals_agent", "risk_management_agent")
+    workflow.add_edge("sentiment_agent", "risk_management_agent")
+
+    # Risk management feeds into portfolio management
+    workflow.add_edge("risk_management_agent", "portfolio_management")
+
+    # Portfolio management is the final step
+    workflow.add_edge("portfolio_management", END)
+
+    return workflow.compile()
+
+app = build_workflow()
 
 # Add this at the bottom of the file
 if __name__ == "__main__":
@@ -364,10 +544,28 @@ if __name__ == "__main__":
     parser.add_argument('--show-reasoning', action='store_true', help='Show reasoning from each agent')
     parser.add_argument('--start-date', type=str, help='Start date (YYYY-MM-DD). Defaults to 3 months before end date')
     parser.add_argument('--end-date', type=str, help='End date (YYYY-MM-DD). Defaults to today')
+    parser.add_argument('--parallel', action='store_true', help='Run the technical analysis in a worker process alongside the other analysts')
+    parser.add_argument('--tickers', type=str, help='Comma-separated tickers to decide in one concurrent batch; prints the results as JSON')
+    parser.add_argument('--max-concurrency', type=int, default=10, help='Maximum tickers in flight in batch mode')
     
     args = parser.parse_args()
+
+    # The Gemini client itself is only created when a node first needs it
+    if not os.getenv('GOOGLE_GEMINI_API_KEY'):
+        print("\nError: GOOGLE_GEMINI_API_KEY environment variable not set!")
+        print("Please follow these steps:")
+        print("1. Create a .env file in the project root directory")
+        print("2. Add your Gemini API key to the file:")
+        print("   GOOGLE_GEMINI_API_KEY=your-api-key-here")
+        print("3. Make sure to get your API key from: https://ai.google.dev/")
+        exit(1)
+
+    if args.parallel or os.getenv('PARALLEL_ANALYSTS', 'false').lower() == 'true':
+        app = build_workflow(parallel=True)
     
-    while True:
+    tickers = [t.strip().upper() for t in args.tickers.split(',') if t.strip()] if args.tickers else None
+
+    while not tickers:
         # Get ticker input from user
         ticker = input("\nEnter stock ticker symbol (e.g., AAPL): ").upper().strip()
         
@@ -410,11 +608,21 @@ if __name__ == "__main__":
     # Use environment variable for show_reasoning if not provided as argument
     show_reasoning = args.show_reasoning or os.getenv('SHOW_REASONING', 'false').lower() == 'true'
     
-    result = run_hedge_fund(
-        ticker=ticker,
-        start_date=args.start_date,
-        end_date=args.end_date,
-        portfolio=portfolio,
-        manual_data=manual_data,
-        show_reasoning=show_reasoning
-    )
\ No newline at end of file
+    if tickers:
+        results = run_hedge_fund_batch(
+            tickers,
+            start_date=args.start_date,
+            end_date=args.end_date,
+            portfolio=portfolio,
+            max_concurrency=args.max_concurrency
+        )
+        print(json.dumps(results, indent=2))
+    else:
+        result = run_hedge_fund(
+            ticker=ticker,
+            start_date=args.start_date,
+            end_date=args.end_date,
+            portfolio=portfolio,
+            manual_data=manual_data,
+            show_reasoning=show_reasoning
+        )
\ No newline at end of file
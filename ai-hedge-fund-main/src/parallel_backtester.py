@@ -0,0 +1,206 @@
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from backtester import Backtester, performance_metrics, technical_signal_agent
+from main import backtest_agent
+
+##### Parallel Backtesting #####
+# Tickers are independent, so each one is backtested in its own worker
+# process. In decision-only mode the decisions for one ticker are also
+# generated in date chunks on separate workers, and the trades are then
+# replayed in date order in the parent so cash and position carry over as in
+# a sequential run. That is only exact for agents whose decisions ignore the
+# portfolio: backtest_agent puts cash and shares in its prompt and sizes its
+# sells from the shares held, so it cannot run in that mode.
+
+# Agents whose decisions do not depend on the portfolio they are given
+PORTFOLIO_INDEPENDENT_AGENTS = {technical_signal_agent}
+
+
+def backtest_ticker(ticker, start_date, end_date, initial_capital, manual_data, agent=backtest_agent):
+    """Run a full sequential backtest for one ticker (executed in a worker)"""
+    backtester = Backtester(
+        agent=agent,
+        ticker=ticker,
+        start_date=start_date,
+        end_date=end_date,
+        initial_capital=initial_capital,
+        manual_data=manual_data,
+        verbose=False
+    )
+    backtester.run_backtest()
+    return backtester.decisions, backtester.portfolio_values
+
+
+def generate_decisions(ticker, dates, initial_capital, manual_data, agent=technical_signal_agent):
+    """
+    Decide every date of a chunk with a portfolio-independent agent (executed in a worker)
+
+    Returns:
+        List of (date, decision) pairs in date order
+    """
+    backtester = Backtester(
+        agent=agent,
+        ticker=ticker,
+        start_date=None,
+        end_date=None,
+        initial_capital=initial_capital,
+        manual_data=manual_data,
+        verbose=False
+    )
+    return [(current_date, backtester.decide(current_date)) for current_date in dates]
+
+
+def replay_decisions(ticker, start_date, end_date, initial_capital, manual_data, decisions):
+    """Execute pre-computed decisions in date order, carrying the portfolio forward"""
+    backtester = Backtester(
+        agent=None,
+        ticker=ticker,
+        start_date=start_date,
+        end_date=end_date,
+        initial_capital=initial_capital,
+        manual_data=manual_data,
+        verbose=False
+    )
+    for current_date, decision in decisions:
+        backtester.apply_decision(current_date, decision)
+    return backtester.decisions, backtester.portfolio_values
+
+
+def split_dates(dates, chunks):
+    """Split a date range into at most `chunks` contiguous, non-empty pieces"""
+    size = -(-len(dates) // max(1, chunks))
+    return [dates[i:i + size] for i in range(0, len(dates), size)]
+
+
+def run_parallel_backtest(
+    manual_data_by_ticker,
+    start_date,
+    end_date,
+    initial_capital=100000,
+    agent=backtest_agent,
+    decision_only=False,
+    chunks=4,
+    max_workers=None
+):
+    """
+    Backtest many tickers across worker processes
+
+    Args:
+        manual_data_by_ticker: Dict of ticker -> manual data (as for Backtester)
+        start_date: Backtest start date (YYYY-MM-DD)
+        end_date: Backtest end date (YYYY-MM-DD)
+        initial_capital: Starting cash per ticker
+        agent: Module-level agent function to backtest (picklable, since it
+            is sent to the workers)
+        decision_only: Generate each ticker's decisions in `chunks` date ranges
+            concurrently, then replay them sequentially. The agent must be in
+            PORTFOLIO_INDEPENDENT_AGENTS (e.g. technical_signal_agent).
+        chunks: Number of date chunks per ticker in decision-only mode
+        max_workers: Worker processes (defaults to the CPU count)
+
+    Returns:
+        dict with "summary" (DataFrame of metrics per ticker) and
+        "decisions" (DataFrame of every day's record across tickers)
+
+    Raises:
+        ValueError: decision_only with an agent that reads the portfolio
+    """
+    if decision_only and agent not in PORTFOLIO_INDEPENDENT_AGENTS:
+        raise ValueError(
+            f"Decision-only mode needs a portfolio-independent agent, got {getattr(agent, '__name__', agent)}"
+        )
+    dates = pd.date_range(start_date, end_date, freq="B")
+    results = {}
+
+    # Spawned rather than forked workers: the parent may already hold the
+    # graph's and the LLM scheduler's thread pools, which do not survive a fork
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        if decision_only:
+            futures = {
+                ticker: [
+                    executor.submit(generate_decisions, ticker, list(chunk), initial_capital, data, agent)
+                    for chunk in split_dates(dates, chunks)
+                ]
+                for ticker, data in manual_data_by_ticker.items()
+            }
+            for ticker, chunk_futures in futures.items():
+                decisions = [pair for future in chunk_futures for pair in future.result()]
+                results[ticker] = replay_decisions(
+                    ticker, start_date, end_date, initial_capital,
+                    manual_data_by_ticker[ticker], decisions
+                )
+        else:
+            futures = {
+                ticker: executor.submit(backtest_ticker, ticker, start_date, end_date, initial_capital, data, agent)
+                for ticker, data in manual_data_by_ticker.items()
+            }
+            results = {ticker: future.result() for ticker, future in futures.items()}
+
+    return merge_results(results, initial_capital)
+
+
+def merge_results(results, initial_capital):
+    """Combine per-ticker backtests into one performance report"""
+    summary = {}
+    records = []
+    for ticker, (decisions, portfolio_values) in results.items():
+        records.extend(decisions)
+        if portfolio_values:
+            values = pd.DataFrame(portfolio_values).set_index("Date")["Portfolio Value"]
+            summary[ticker] = performance_metrics(values, initial_capital)
+            summary[ticker]["trades"] = sum(1 for d in decisions if d["executed_quantity"])
+
+    summary = pd.DataFrame.from_dict(summary, orient="index")
+    summary.index.name = "ticker"
+    return {"summary": summary, "decisions": pd.DataFrame(records)}
+
+
+### Run the Parallel Backtest #####
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run backtests for many tickers in parallel')
+    parser.add_argument('--manual_data', type=str, required=True, help='Path to JSON file mapping each ticker to its manual financial data')
+    parser.add_argument('--end_date', type=str, default=datetime.now().strftime('%Y-%m-%d'), help='End date in YYYY-MM-DD format')
+    parser.add_argument('--start_date', type=str, default=(datetime.now() - timedelta(days=90)).strftime('%Y-%m-%d'), help='Start date in YYYY-MM-DD format')
+    parser.add_argument('--initial_capital', type=float, default=100000, help='Initial capital per ticker (default: 100000)')
+    parser.add_argument('--agent', choices=['graph', 'technical'], default='graph', help='Agent to backtest: the full graph or the rule-only technical signal')
+    parser.add_argument('--decision_only', action='store_true', help='Generate decisions in parallel date chunks and replay the portfolio afterwards (technical agent only)')
+    parser.add_argument('--chunks', type=int, default=4, help='Date chunks per ticker in decision-only mode')
+    parser.add_argument('--workers', type=int, default=int(os.getenv('HEDGE_FUND_PROCESS_WORKERS', 0)) or None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--report', type=str, help='Write the merged report to this JSON file')
+
+    args = parser.parse_args()
+    if args.decision_only and args.agent != 'technical':
+        parser.error('--decision_only needs --agent technical, since the graph\'s decisions depend on the portfolio')
+
+    with open(args.manual_data, 'r') as f:
+        manual_data_by_ticker = json.load(f)
+
+    report = run_parallel_backtest(
+        manual_data_by_ticker,
+        start_date=args.start_date,
+        end_date=args.end_date,
+        initial_capital=args.initial_capital,
+        agent=technical_signal_agent if args.agent == 'technical' else backtest_agent,
+        decision_only=args.decision_only,
+        chunks=args.chunks,
+        max_workers=args.workers
+    )
+
+    print("\nPerformance Summary:")
+    print(report["summary"].to_string(float_format=lambda x: f"{x:.4f}"))
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({
+                "summary": report["summary"].reset_index().to_dict("records"),
+                "decisions": report["decisions"].to_dict("records"),
+            }, f, indent=2, default=str)
@@ -1,9 +1,33 @@
-import os
-from typing import Dict, Any, List
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Callable, Iterable, Optional, Union
 import pandas as pd
 import requests
 
-import requests
+from tools.cache import get_cache
+from tools.http_client import get_client
+from tools.price_store import PriceSeries, get_price_store
+
+def _cached_request(
+    endpoint: str,
+    params: Dict[str, Any],
+    send: Callable[[], requests.Response]
+) -> Dict[str, Any]:
+    """Return the JSON response for a request, serving it from the local cache when possible."""
+    cache = get_cache()
+    if cache is not None:
+        cached = cache.get(endpoint, params)
+        if cached is not None:
+            return cached
+    response = send()
+    if response.status_code != 200:
+        raise Exception(
+            f"Error fetching data: {response.status_code} - {response.text}"
+        )
+    data = response.json()
+    if cache is not None:
+        cache.set(endpoint, params, data)
+    return data
 
 def get_financial_metrics(
     ticker: str,
@@ -12,20 +36,16 @@ def get_financial_metrics(
     limit: int = 1
 ) -> List[Dict[str, Any]]:
     """Fetch financial metrics from the API."""
-    headers = {"X-API-KEY": os.environ.get("FINANCIAL_DATASETS_API_KEY")}
-    url = (
-        f"https://api.financialdatasets.ai/financial-metrics/"
-        f"?ticker={ticker}"
-        f"&report_period_lte={report_period}"
-        f"&limit={limit}"
-        f"&period={period}"
+    params = {
+        "ticker": ticker,
+        "report_period_lte": report_period,
+        "limit": limit,
+        "period": period,
+    }
+    data = _cached_request(
+        "financial_metrics", params,
+        lambda: get_client().get("/financial-metrics/", params=params)
     )
-    response = requests.get(url, headers=headers)
-    if response.status_code != 200:
-        raise Exception(
-            f"Error fetching data: {response.status_code} - {response.text}"
-        )
-    data = response.json()
     financial_metrics = data.get("financial_metrics")
     if not financial_metrics:
         raise ValueError("No financial metrics returned")
@@ -38,21 +58,16 @@ def search_line_items(
     limit: int = 1
 ) -> List[Dict[str, Any]]:
     """Fetch cash flow statements from the API."""
-    headers = {"X-API-KEY": os.environ.get("FINANCIAL_DATASETS_API_KEY")}
-    url = "https://api.financialdatasets.ai/financials/search/line-items"
-
     body = {
         "tickers": [ticker],
         "line_items": line_items,
         "period": period,
         "limit": limit
     }
-    response = requests.post(url, headers=headers, json=body)
-    if response.status_code != 200:
-        raise Exception(
-            f"Error fetching data: {response.status_code} - {response.text}"
-        )
-    data = response.json()
+    data = _cached_request(
+        "line_items", body,
+        lambda: get_client().post("/financials/search/line-items", json=body)
+    )
     search_results = data.get("search_results")
     if not search_results:
         raise ValueError("No search results returned")
@@ -66,19 +81,15 @@ def get_insider_trades(
     """
     Fetch insider trades for a given ticker and date range.
     """
-    headers = {"X-API-KEY": os.environ.get("FINANCIAL_DATASETS_API_KEY")}
-    url = (
-        f"https://api.financialdatasets.ai/insider-trades/"
-        f"?ticker={ticker}"
-        f"&filing_date_lte={end_date}"
-        f"&limit={limit}"
+    params = {
+        "ticker": ticker,
+        "filing_date_lte": end_date,
+        "limit": limit,
+    }
+    data = _cached_request(
+        "insider_trades", params,
+        lambda: get_client().get("/insider-trades/", params=params)
     )
-    response = requests.get(url, headers=headers)
-    if response.status_code != 200:
-        raise Exception(
-            f"Error fetching data: {response.status_code} - {response.text}"
-        )
-    data = response.json()
     insider_trades = data.get("insider_trades")
     if not insider_trades:
         raise ValueError("No insider trades returned")
@@ -88,18 +99,11 @@ def get_market_cap(
     ticker: str,
 ) -> List[Dict[str, Any]]:
     """Fetch market cap from the API."""
-    headers = {"X-API-KEY": os.environ.get("FINANCIAL_DATASETS_API_KEY")}
-    url = (
-        f'https://api.financialdatasets.ai/company/facts'
-        f'?ticker={ticker}'
+    params = {"ticker": ticker}
+    data = _cached_request(
+        "company_facts", params,
+        lambda: get_client().get("/company/facts", params=params)
     )
-
-    response = requests.get(url, headers=headers)
-    if response.status_code != 200:
-        raise Exception(
-            f"Error fetching data: {response.status_code} - {response.text}"
-        )
-    data = response.json()
     company_facts = data.get('company_facts')
     if not company_facts:
         raise ValueError("No company facts returned")
@@ -111,21 +115,17 @@ def get_prices(
     end_date: str
 ) -> List[Dict[str, Any]]:
     """Fetch price data from the API."""
-    headers = {"X-API-KEY": os.environ.get("FINANCIAL_DATASETS_API_KEY")}
-    url = (
-        f"https://api.financialdatasets.ai/prices/"
-        f"?ticker={ticker}"
-        f"&interval=day"
-        f"&interval_multiplier=1"
-        f"&start_date={start_date}"
-        f"&end_date={end_date}"
+    params = {
+        "ticker": ticker,
+        "interval": "day",
+        "interval_multiplier": 1,
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+    data = _cached_request(
+        "prices", params,
+        lambda: get_client().get("/prices/", params=params)
     )
-    response = requests.get(url, headers=headers)
-    if response.status_code != 200:
-        raise Exception(
-            f"Error fetching data: {response.status_code} - {response.text}"
-        )
-    data = response.json()
     prices = data.get("prices")
     if not prices:
         raise ValueError("No price data returned")
@@ -133,6 +133,9 @@ def get_prices(
 
 def prices_to_df(prices):
     """Convert price data to pandas DataFrame with proper date handling"""
+    if isinstance(prices, PriceSeries):
+        return prices.to_frame()
+
     df = pd.DataFrame(prices)
     
     # Handle different possible date/time column names
@@ -158,11 +161,75 @@ def prices_to_df(prices):
     
     return df
 
-# Update the get_price_data function to use the new functions
 def get_price_data(
     ticker: str,
     start_date: str,
     end_date: str
 ) -> pd.DataFrame:
-    prices = get_prices(ticker, start_date, end_date)
-    return prices_to_df(prices)
+    """Sync the local price store for the window and return it as a DataFrame."""
+    store = get_price_store()
+    store.sync(ticker, start_date, end_date, fetch=get_prices)
+    series = store.get_series(ticker, start_date, end_date)
+    if not len(series):
+        raise ValueError("No price data returned")
+    return series.to_frame()
+
+# Batch fetchers keyed by endpoint name, used by fetch_many
+FETCHERS = {
+    "prices": get_prices,
+    "financial_metrics": get_financial_metrics,
+    "line_items": search_line_items,
+    "insider_trades": get_insider_trades,
+    "market_cap": get_market_cap,
+}
+
+def fetch_many(
+    tickers: Iterable[str],
+    endpoints: Union[Iterable[str], Dict[str, Dict[str, Any]]],
+    max_workers: Optional[int] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch several endpoints for many tickers concurrently.
+
+    Args:
+        tickers: Ticker symbols to fetch
+        endpoints: Endpoint names from FETCHERS, or a mapping of endpoint name
+            to the keyword arguments for its fetcher (e.g. start_date/end_date)
+        max_workers: Thread pool size, defaults to the client's max concurrency
+
+    Returns:
+        Dict of ticker -> endpoint -> result. A request that failed holds the
+        raised exception instead of a result, so one bad ticker does not abort
+        the whole batch.
+
+    Raises:
+        ValueError: For an unknown endpoint, or when the keyword arguments
+            given for an endpoint do not match its fetcher (e.g. prices
+            without start_date/end_date). Only market_cap needs no arguments,
+            so the list form is limited to it.
+    """
+    if not isinstance(endpoints, dict):
+        endpoints = {endpoint: {} for endpoint in endpoints}
+    for endpoint, kwargs in endpoints.items():
+        if endpoint not in FETCHERS:
+            raise ValueError(f"Unknown endpoint: {endpoint}")
+        try:
+            inspect.signature(FETCHERS[endpoint]).bind("TICKER", **kwargs)
+        except TypeError as e:
+            raise ValueError(f"Invalid arguments for endpoint {endpoint}: {e}") from None
+
+    tickers = list(tickers)
+    jobs = [(ticker, endpoint) for ticker in tickers for endpoint in endpoints]
+    results = {ticker: {} for ticker in tickers}
+
+    def run(job):
+        ticker, endpoint = job
+        try:
+            return FETCHERS[endpoint](ticker, **endpoints[endpoint])
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=max_workers or get_client().max_concurrency) as executor:
+        for (ticker, endpoint), result in zip(jobs, executor.map(run, jobs)):
+            results[ticker][endpoint] = result
+    return results
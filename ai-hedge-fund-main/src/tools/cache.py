@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Default time-to-live per endpoint, in seconds
+DEFAULT_TTLS = {
+    "prices": 24 * 60 * 60,
+    "financial_metrics": 7 * 24 * 60 * 60,
+    "line_items": 7 * 24 * 60 * 60,
+    "insider_trades": 24 * 60 * 60,
+    "company_facts": 24 * 60 * 60,
+}
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class CacheMissError(Exception):
+    """Raised when an offline cache has no entry for a request."""
+
+
+class ResponseCache:
+    """
+    Persistent SQLite cache for API responses.
+
+    Entries are keyed by endpoint and the full set of request parameters, so
+    point-in-time parameters (report_period_lte, filing_date_lte, date ranges)
+    always map to distinct entries. Each endpoint has its own TTL and the
+    least recently used entries are evicted once the cache exceeds max_bytes
+    (None disables eviction). Endpoints without a TTL never expire.
+    In offline mode the cache is read-only and expired entries are still served.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttls: Optional[Dict[str, float]] = None,
+        max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+        offline: bool = False
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                params TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(endpoint: str, params: Dict[str, Any]) -> str:
+        """Build a stable key from the endpoint and request parameters."""
+        payload = json.dumps([endpoint, params], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, endpoint: str, params: Dict[str, Any]) -> Optional[Any]:
+        """Return the cached response, or None if missing or expired."""
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            ttl = self.ttls.get(endpoint)
+            expired = row is not None and ttl is not None and now - row[1] > ttl
+            if row is None or (expired and not self.offline):
+                self.misses += 1
+                if self.offline:
+                    raise CacheMissError(f"No cached {endpoint} response for {params}")
+                return None
+            self.hits += 1
+            if not self.offline:
+                self._conn.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                self._conn.commit()
+        return json.loads(row[0])
+
+    def set(self, endpoint: str, params: Dict[str, Any], value: Any) -> None:
+        """Store a response and evict old entries if the cache is too large."""
+        if self.offline:
+            return
+        key = self.make_key(endpoint, params)
+        encoded = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, endpoint, json.dumps(params, sort_keys=True, default=str),
+                 encoded, len(encoded), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        if self.max_bytes is None:
+            return
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        ).fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def clear(self, endpoint: Optional[str] = None) -> None:
+        """Remove all entries, or only those for one endpoint."""
+        with self._lock:
+            if endpoint is None:
+                self._conn.execute("DELETE FROM responses")
+            else:
+                self._conn.execute("DELETE FROM responses WHERE endpoint = ?", (endpoint,))
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """
+    Return the shared response cache configured from environment variables:
+    FINANCIAL_DATASETS_CACHE (set to 0 to disable), FINANCIAL_DATASETS_CACHE_DIR,
+    FINANCIAL_DATASETS_CACHE_MAX_MB and FINANCIAL_DATASETS_OFFLINE.
+    """
+    global _cache
+    if os.getenv("FINANCIAL_DATASETS_CACHE", "1").lower() in ("0", "false", "no"):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            cache_dir = os.getenv("FINANCIAL_DATASETS_CACHE_DIR", ".cache")
+            max_mb = float(os.getenv("FINANCIAL_DATASETS_CACHE_MAX_MB", DEFAULT_MAX_BYTES / (1024 * 1024)))
+            _cache = ResponseCache(
+                path=os.path.join(cache_dir, "financialdatasets.sqlite"),
+                max_bytes=int(max_mb * 1024 * 1024),
+                offline=os.getenv("FINANCIAL_DATASETS_OFFLINE", "false").lower() == "true"
+            )
+    return _cache
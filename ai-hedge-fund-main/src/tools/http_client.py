@@ -0,0 +1,94 @@
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+API_BASE_URL = "https://api.financialdatasets.ai"
+
+# Status codes that are worth retrying with backoff
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class FinancialDatasetsClient:
+    """
+    Shared HTTP client for the financialdatasets.ai API.
+
+    Uses one requests.Session with a connection pool so keep-alive connections
+    are reused across calls and threads, retries 429/5xx responses with
+    exponential backoff (honouring Retry-After), and caps the number of
+    requests in flight with a semaphore.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = API_BASE_URL,
+        max_concurrency: int = 10,
+        max_retries: int = 5,
+        backoff_factor: float = 0.5,
+        timeout: float = 30.0
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset({"GET", "POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=max_concurrency,
+            pool_maxsize=max_concurrency,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "X-API-KEY": api_key or os.environ.get("FINANCIAL_DATASETS_API_KEY") or ""
+        })
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
+        with self._semaphore:
+            return self.session.get(self.base_url + path, params=params, timeout=self.timeout)
+
+    def post(self, path: str, json: Optional[Dict[str, Any]] = None) -> requests.Response:
+        with self._semaphore:
+            return self.session.post(self.base_url + path, json=json, timeout=self.timeout)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> FinancialDatasetsClient:
+    """
+    Return the shared client, configured from FINANCIAL_DATASETS_BASE_URL and
+    FINANCIAL_DATASETS_MAX_CONCURRENCY.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = FinancialDatasetsClient(
+                base_url=os.getenv("FINANCIAL_DATASETS_BASE_URL", API_BASE_URL),
+                max_concurrency=int(os.getenv("FINANCIAL_DATASETS_MAX_CONCURRENCY", 10)),
+            )
+    return _client
+
+
+def set_client(client: Optional[FinancialDatasetsClient]) -> None:
+    """Replace the shared client, e.g. to point the fetchers at a local server."""
+    global _client
+    with _client_lock:
+        _client = client
@@ -0,0 +1,165 @@
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+from tools.cache import ResponseCache
+from tools.llm_scheduler import scheduler_from_env
+
+DEFAULT_MODEL = "gemini-pro"
+
+# Cache namespace for Gemini responses; entries never expire
+LLM_ENDPOINT = "gemini"
+
+
+class CachedResponse:
+    """Minimal stand-in for a Gemini response served from the cache."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class CachedModel:
+    """
+    Gemini model wrapper that answers repeated prompts from a persistent cache.
+
+    Responses are keyed on a hash of the model name, the prompt contents and
+    the generation settings, so identical calls (e.g. the portfolio manager
+    on a flat backtest day) are served without an API call. With a replay-only
+    cache (ResponseCache(offline=True)) a miss raises CacheMissError instead
+    of calling the model, which makes re-runs fully deterministic. Wrap an
+    LLMScheduler rather than the raw model so only misses are queued and
+    rate limited.
+    """
+
+    def __init__(
+        self,
+        model,
+        model_name: str,
+        cache: Optional[ResponseCache],
+        generation_config: Optional[Dict[str, Any]] = None,
+        safety_settings: Optional[Any] = None
+    ):
+        self.model = model
+        self.model_name = model_name
+        self.cache = cache
+        self.generation_config = generation_config
+        self.safety_settings = safety_settings
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def generate_content(self, contents):
+        params = {
+            "model": self.model_name,
+            "contents": contents,
+            "generation_config": self.generation_config,
+            "safety_settings": self.safety_settings,
+        }
+        if self.cache is not None:
+            # Raises CacheMissError on a miss in replay-only mode
+            text = self.cache.get(LLM_ENDPOINT, params)
+            if text is not None:
+                self._count(hit=True)
+                return CachedResponse(text)
+
+        self._count(hit=False)
+        kwargs = {}
+        if self.generation_config is not None:
+            kwargs["generation_config"] = self.generation_config
+        if self.safety_settings is not None:
+            kwargs["safety_settings"] = self.safety_settings
+        response = self.model.generate_content(contents, **kwargs)
+        if self.cache is not None:
+            self.cache.set(LLM_ENDPOINT, params, response.text)
+        return response
+
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[ResponseCache]:
+    """
+    Return the shared LLM response cache configured from environment variables:
+    LLM_CACHE (set to 0 to disable), LLM_CACHE_DIR, LLM_CACHE_MAX_MB (unset
+    keeps every entry) and LLM_REPLAY (true serves only cached responses).
+    """
+    global _llm_cache
+    if os.getenv("LLM_CACHE", "1").lower() in ("0", "false", "no"):
+        return None
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            cache_dir = os.getenv("LLM_CACHE_DIR", ".cache")
+            max_mb = os.getenv("LLM_CACHE_MAX_MB")
+            _llm_cache = ResponseCache(
+                path=os.path.join(cache_dir, "llm.sqlite"),
+                max_bytes=int(float(max_mb) * 1024 * 1024) if max_mb else None,
+                offline=os.getenv("LLM_REPLAY", "false").lower() == "true"
+            )
+    return _llm_cache
+
+
+##### Model registry #####
+# The Gemini SDK is imported and configured on the first call that needs a
+# model, so importing the agents (backtests in replay mode, worker processes,
+# tests) neither pays for the SDK import nor requires an API key.
+
+_models: Dict[str, Any] = {}
+_models_lock = threading.Lock()
+_configured = False
+
+
+def get_model(name: str = DEFAULT_MODEL):
+    """Return the shared Gemini model, configuring the SDK on first use."""
+    global _configured
+    with _models_lock:
+        if name not in _models:
+            import google.generativeai as genai
+
+            if not _configured:
+                load_dotenv()
+                api_key = os.getenv("GOOGLE_GEMINI_API_KEY")
+                if not api_key:
+                    raise ValueError("GOOGLE_GEMINI_API_KEY environment variable not set")
+                genai.configure(api_key=api_key)
+                _configured = True
+            _models[name] = genai.GenerativeModel(name)
+        return _models[name]
+
+
+class LazyModel:
+    """Model handle that resolves get_model(name) on its first call."""
+
+    def __init__(self, name: str = DEFAULT_MODEL):
+        self.name = name
+
+    def generate_content(self, contents, **kwargs):
+        return get_model(self.name).generate_content(contents, **kwargs)
+
+
+_decision_model = None
+
+
+def get_decision_model() -> CachedModel:
+    """
+    Return the portfolio manager's model: the response cache in front of the
+    shared scheduler in front of the lazily created Gemini model.
+    """
+    global _decision_model
+    with _models_lock:
+        if _decision_model is None:
+            _decision_model = CachedModel(
+                scheduler_from_env(LazyModel(DEFAULT_MODEL)), DEFAULT_MODEL, get_llm_cache()
+            )
+    return _decision_model
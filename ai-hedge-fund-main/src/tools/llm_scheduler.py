@@ -0,0 +1,98 @@
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from tools.rate_limiter import RateLimiter, throttle_llm
+
+
+def estimate_tokens(contents) -> int:
+    """Rough prompt size in tokens (about four characters per token)"""
+    if isinstance(contents, str):
+        return max(1, len(contents) // 4)
+    return sum(estimate_tokens(part) for part in contents)
+
+
+class LLMScheduler:
+    """
+    Shared dispatcher for Gemini calls made by many concurrent graph runs.
+
+    Every caller submits its prompt and gets a Future; a fixed pool of
+    dispatch threads sends the queued prompts with bounded concurrency,
+    waiting on the shared requests-per-minute limiter and an optional
+    tokens-per-minute budget before each call, and resolves the caller's
+    future with the response or the error. Throughput therefore grows with
+    the rate limit instead of with one round trip per decision.
+
+    generate_content() blocks on the future, so the scheduler can stand in
+    for a model anywhere (including under CachedModel, so cache hits never
+    queue).
+    """
+
+    def __init__(
+        self,
+        model,
+        max_concurrency: int = 8,
+        tokens_per_minute: Optional[float] = None,
+        expected_output_tokens: int = 512,
+        request_limiter: Optional[RateLimiter] = None,
+        token_estimator: Callable[[Any], int] = estimate_tokens
+    ):
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.expected_output_tokens = expected_output_tokens
+        self.request_limiter = request_limiter
+        self.token_limiter = RateLimiter(tokens_per_minute) if tokens_per_minute else None
+        self.token_estimator = token_estimator
+        self.submitted = 0
+        self.completed = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="llm-scheduler"
+        )
+
+    def _dispatch(self, contents, kwargs):
+        if self.request_limiter is not None:
+            self.request_limiter.acquire()
+        else:
+            throttle_llm()
+        if self.token_limiter is not None:
+            tokens = self.token_estimator(contents) + self.expected_output_tokens
+            # A single request larger than the budget waits for a full bucket
+            self.token_limiter.acquire(min(tokens, self.token_limiter.burst))
+        try:
+            return self.model.generate_content(contents, **kwargs)
+        finally:
+            with self._lock:
+                self.completed += 1
+
+    def submit(self, contents, **kwargs) -> Future:
+        """Queue a prompt and return a Future for its response"""
+        with self._lock:
+            self.submitted += 1
+        return self._executor.submit(self._dispatch, contents, kwargs)
+
+    def generate_content(self, contents, **kwargs):
+        return self.submit(contents, **kwargs).result()
+
+    @property
+    def pending(self) -> int:
+        """Prompts submitted but not yet answered"""
+        with self._lock:
+            return self.submitted - self.completed
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+def scheduler_from_env(model) -> LLMScheduler:
+    """
+    Build a scheduler for a model, configured from LLM_MAX_CONCURRENCY and
+    LLM_TOKENS_PER_MINUTE (requests per minute come from the shared limiter).
+    """
+    tpm = os.getenv("LLM_TOKENS_PER_MINUTE")
+    return LLMScheduler(
+        model,
+        max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", 8)),
+        tokens_per_minute=float(tpm) if tpm else None
+    )
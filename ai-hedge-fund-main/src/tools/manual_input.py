@@ -1,7 +1,9 @@
 import pandas as pd
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Union
 from datetime import datetime
 
+from tools.price_store import PriceSeries
+
 def get_manual_financial_metrics(data: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Process manually input financial metrics."""
     return [data]
@@ -27,8 +29,10 @@ def get_manual_prices(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     
     return sorted(data, key=lambda x: x["time"])
 
-def prices_to_df(prices: List[Dict[str, Any]]) -> pd.DataFrame:
+def prices_to_df(prices: Union[List[Dict[str, Any]], PriceSeries]) -> pd.DataFrame:
     """Convert prices to a DataFrame."""
+    if isinstance(prices, PriceSeries):
+        return prices.to_frame()
     df = pd.DataFrame(prices)
     df["Date"] = pd.to_datetime(df["time"])
     df.set_index("Date", inplace=True)
@@ -38,8 +42,11 @@ def prices_to_df(prices: List[Dict[str, Any]]) -> pd.DataFrame:
     df.sort_index(inplace=True)
     return df
 
-def get_price_data(prices: List[Dict[str, Any]], start_date: str, end_date: str) -> pd.DataFrame:
+def get_price_data(prices: Union[List[Dict[str, Any]], PriceSeries], start_date: str, end_date: str) -> pd.DataFrame:
     """Filter and return price data for the specified date range."""
+    if isinstance(prices, PriceSeries):
+        # Already sorted, so the window is a binary search instead of a mask
+        return prices.slice(start_date, end_date).to_frame()
     df = prices_to_df(prices)
     mask = (df.index >= start_date) & (df.index <= end_date)
     return df[mask] 
\ No newline at end of file
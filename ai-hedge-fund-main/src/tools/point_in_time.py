@@ -0,0 +1,161 @@
+from collections.abc import Sequence
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+import numpy as np
+
+from tools.price_store import PriceSeries
+
+# Date field of each dated dataset in the input data
+DATE_FIELDS = {
+    "insider_trades": "filing_date",
+    "financial_metrics": "report_period",
+    "financial_line_items": "report_date",
+}
+
+
+class DatedRecords(Sequence):
+    """
+    Records sorted newest first by a date field, as the API returns them,
+    with the dates held as a sort key.
+
+    The key is minus the day number, so it ascends as the dates descend and
+    slice() finds its bounds by binary search on it. A slice is a view over
+    the same sorted list, so taking a point-in-time slice every backtest day
+    costs O(log n) and copies nothing, and [0] is still the latest record.
+    Records missing the date field sort last and fall outside every bounded
+    slice.
+    """
+
+    __slots__ = ("records", "keys", "_start", "_stop")
+
+    def __init__(self, records: List[Dict[str, Any]], keys: np.ndarray, start: int = 0, stop: int = None):
+        self.records = records
+        self.keys = keys
+        self._start = start
+        self._stop = len(records) if stop is None else stop
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]], field: str) -> "DatedRecords":
+        """Sort records newest first by `field` (stable) and build the sort key."""
+        dates = np.array(
+            [str(record[field])[:10] if record.get(field) else "NaT" for record in records],
+            dtype="datetime64[D]"
+        )
+        keys = np.where(np.isnat(dates), np.inf, -dates.astype(np.int64).astype(float))
+        order = np.argsort(keys, kind="stable")
+        return cls([records[i] for i in order], keys[order])
+
+    @staticmethod
+    def _key(value) -> float:
+        return -float(np.datetime64(str(value)[:10], "D").astype(np.int64))
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.records[i] for i in range(self._start, self._stop)[index]]
+        return self.records[range(self._start, self._stop)[index]]
+
+    def slice(self, start_date=None, end_date=None) -> "DatedRecords":
+        """Return a view of the records dated within start_date..end_date (inclusive), newest first."""
+        keys = self.keys[self._start:self._stop]
+        if start_date is None and end_date is None:
+            return self
+        lo = 0 if end_date is None else np.searchsorted(
+            keys, self._key(end_date), side="left"
+        )
+        hi = np.searchsorted(
+            keys, np.inf if start_date is None else self._key(start_date),
+            side="left" if start_date is None else "right"
+        )
+        return DatedRecords(self.records, self.keys, self._start + int(lo), self._start + int(hi))
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """The records of this view, newest first"""
+        return self.records[self._start:self._stop]
+
+
+def index_dataset(name: str, value: Any) -> Any:
+    """
+    Build the sorted index for one dataset of the input data
+
+    Prices become a PriceSeries and dated record lists become DatedRecords;
+    anything without dates (a metrics snapshot, market cap) is returned as is.
+    """
+    if isinstance(value, (PriceSeries, DatedRecords)):
+        return value
+    if name == "prices" and isinstance(value, list):
+        return PriceSeries.from_records(value)
+    field = DATE_FIELDS.get(name)
+    if field and isinstance(value, list) and all(isinstance(record, Mapping) for record in value):
+        return DatedRecords.from_records(value, field)
+    return value
+
+
+def slice_as_of(value: Any, end_date) -> Any:
+    """Records of an indexed dataset dated on or before end_date (others unchanged)"""
+    if isinstance(value, (PriceSeries, DatedRecords)):
+        return value.slice(None, end_date)
+    return value
+
+
+class MarketData(Mapping):
+    """
+    Read-only handle on one ticker's input data (prices, financial metrics,
+    insider trades, market cap, sentiment).
+
+    The graph state holds the handle by reference and nodes only read from
+    it, so the data reducers never copy the datasets and every node returns
+    just its own small results. Build it once per ticker (the backtester
+    does so once per run) and reuse it across invocations.
+    """
+
+    __slots__ = ("_data", "_indexed")
+
+    def __init__(self, data: Optional[Mapping] = None, **changes):
+        self._data = {**(data or {}), **changes}
+        self._indexed = None
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"MarketData({sorted(self._data)})"
+
+    @classmethod
+    def wrap(cls, data: Mapping) -> "MarketData":
+        """Return data as a MarketData handle, reusing it if it already is one"""
+        return data if isinstance(data, cls) else cls(data)
+
+    def replace(self, **changes) -> "MarketData":
+        """New handle sharing every value except the given ones"""
+        return MarketData(self._data, **changes)
+
+    def indexed(self) -> "MarketData":
+        """
+        Handle whose prices and dated records carry sorted date indexes
+        (built on first call and kept with this handle)
+        """
+        if self._indexed is None:
+            self._indexed = MarketData({
+                name: index_dataset(name, value) for name, value in self._data.items()
+            })
+            self._indexed._indexed = self._indexed
+        return self._indexed
+
+    def as_of(self, end_date) -> "MarketData":
+        """
+        Point-in-time view: only prices and records dated on or before
+        end_date. Each dataset is a binary-search view, not a copy.
+        """
+        indexed = self.indexed()
+        return MarketData({
+            name: slice_as_of(value, end_date) for name, value in indexed.items()
+        })
@@ -0,0 +1,293 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+SERIES_COLUMNS = ("time",) + PRICE_COLUMNS
+
+PriceFetcher = Callable[[str, str, str], List[Dict[str, Any]]]
+
+
+def _to_date(value) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def _record_time(record: Dict[str, Any]) -> str:
+    for col in ("time", "date", "Date"):
+        if col in record:
+            return str(record[col])[:10]
+    raise ValueError("No date/time column found in price data")
+
+
+def _record_value(value, cast):
+    return None if np.isnan(value) else cast(value)
+
+
+class PriceSeries:
+    """
+    OHLCV history for one ticker held as contiguous typed arrays.
+
+    The time column is datetime64[D] sorted ascending and every price column
+    is float64 of the same length. Slicing by date range uses binary search and
+    returns views over the same buffers, so a series opened from memory-mapped
+    .npy files is never copied or re-parsed.
+    """
+
+    __slots__ = SERIES_COLUMNS + ("_frame",)
+
+    def __init__(self, time, open, high, low, close, volume):
+        self.time = time
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self._frame = None
+
+    @classmethod
+    def empty(cls) -> "PriceSeries":
+        return cls(
+            np.array([], dtype="datetime64[D]"),
+            *(np.array([], dtype=np.float64) for _ in PRICE_COLUMNS)
+        )
+
+    @classmethod
+    def from_records(cls, prices: List[Dict[str, Any]]) -> "PriceSeries":
+        """Build a sorted series from a list of price dicts."""
+        if not prices:
+            return cls.empty()
+        times = np.array([_record_time(p) for p in prices], dtype="datetime64[D]")
+        order = np.argsort(times, kind="stable")
+        # Missing or null values become NaN, as in prices_to_df
+        columns = [
+            np.array([p.get(col) for p in prices], dtype=np.float64)[order]
+            for col in PRICE_COLUMNS
+        ]
+        return cls(times[order], *columns)
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def slice(self, start_date=None, end_date=None) -> "PriceSeries":
+        """Return a zero-copy view of the bars within start_date..end_date (inclusive)."""
+        lo = 0 if start_date is None else np.searchsorted(
+            self.time, np.datetime64(_to_date(start_date)), side="left"
+        )
+        hi = len(self.time) if end_date is None else np.searchsorted(
+            self.time, np.datetime64(_to_date(end_date)), side="right"
+        )
+        return PriceSeries(*(getattr(self, col)[lo:hi] for col in SERIES_COLUMNS))
+
+    def tail(self, bars: int) -> "PriceSeries":
+        """Return a zero-copy view of the last `bars` bars."""
+        start = max(len(self.time) - bars, 0)
+        return PriceSeries(*(getattr(self, col)[start:] for col in SERIES_COLUMNS))
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Return a Date-indexed DataFrame backed by the price arrays.
+
+        Only the date index is materialised; the OHLCV columns wrap the
+        underlying arrays without copying. The frame is built once per series
+        and each call returns a shallow copy, so callers adding columns do not
+        leak them into each other.
+        """
+        if self._frame is None:
+            index = pd.DatetimeIndex(self.time.astype("datetime64[ns]"), name="Date")
+            self._frame = pd.DataFrame(
+                {col: getattr(self, col) for col in PRICE_COLUMNS}, index=index, copy=False
+            )
+        return self._frame.copy(deep=False)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Return the bars as price dicts in the API's format (None for missing values)."""
+        return [
+            {
+                "time": str(self.time[i]),
+                "open": _record_value(self.open[i], float),
+                "high": _record_value(self.high[i], float),
+                "low": _record_value(self.low[i], float),
+                "close": _record_value(self.close[i], float),
+                "volume": _record_value(self.volume[i], int),
+            }
+            for i in range(len(self.time))
+        ]
+
+
+class PriceStore:
+    """
+    On-disk columnar store of daily price history.
+
+    Each ticker lives in its own directory holding one .npy array per column
+    (time, open, high, low, close, volume) plus a meta.json recording which
+    calendar date ranges have already been synced. Syncing a window only
+    fetches the sub-ranges that are not covered yet (the new tail, or gaps
+    between earlier syncs) and merges them into the stored series.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, ticker: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _ticker_dir(self, ticker: str) -> Path:
+        return self.root / ticker.upper()
+
+    def coverage(self, ticker: str) -> List[Tuple[date, date]]:
+        """Return the sorted, non-overlapping date ranges already synced."""
+        meta_path = self._ticker_dir(ticker) / "meta.json"
+        if not meta_path.exists():
+            return []
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        return [(_to_date(start), _to_date(end)) for start, end in meta["coverage"]]
+
+    def last_date(self, ticker: str) -> Optional[date]:
+        """Return the last calendar date covered for a ticker, if any."""
+        coverage = self.coverage(ticker)
+        return coverage[-1][1] if coverage else None
+
+    def missing_ranges(self, ticker: str, start_date, end_date) -> List[Tuple[date, date]]:
+        """Return the sub-ranges of start_date..end_date not covered yet."""
+        start, end = _to_date(start_date), _to_date(end_date)
+        missing = []
+        cursor = start
+        for covered_start, covered_end in self.coverage(ticker):
+            if covered_end < cursor:
+                continue
+            if covered_start > end:
+                break
+            if covered_start > cursor:
+                missing.append((cursor, covered_start - timedelta(days=1)))
+            cursor = max(cursor, covered_end + timedelta(days=1))
+        if cursor <= end:
+            missing.append((cursor, end))
+        return missing
+
+    def load(self, ticker: str) -> PriceSeries:
+        """Open the stored series for a ticker as read-only memory-mapped arrays."""
+        ticker_dir = self._ticker_dir(ticker)
+        if not (ticker_dir / "time.npy").exists():
+            return PriceSeries.empty()
+        return PriceSeries(*(
+            np.load(ticker_dir / f"{col}.npy", mmap_mode="r")
+            for col in SERIES_COLUMNS
+        ))
+
+    def get_series(self, ticker: str, start_date=None, end_date=None) -> PriceSeries:
+        """Return a zero-copy view of the stored bars within start_date..end_date."""
+        return self.load(ticker).slice(start_date, end_date)
+
+    def get_prices(self, ticker: str, start_date, end_date) -> List[Dict[str, Any]]:
+        """Return stored bars within start_date..end_date as price dicts."""
+        return self.get_series(ticker, start_date, end_date).to_records()
+
+    def sync(self, ticker: str, start_date, end_date, fetch: PriceFetcher) -> int:
+        """
+        Fetch whatever part of start_date..end_date is missing and merge it in.
+
+        Today's bar may still be forming, so coverage is only recorded up to
+        yesterday and today is fetched again on the next sync.
+
+        Returns:
+            int: Number of bars fetched from the API
+        """
+        with self._lock(ticker):
+            missing = self.missing_ranges(ticker, start_date, end_date)
+            if not missing:
+                return 0
+
+            fetched = []
+            for start, end in missing:
+                try:
+                    fetched.extend(fetch(ticker, start.isoformat(), end.isoformat()))
+                except ValueError:
+                    # No bars in the range (weekend, holiday or pre-listing)
+                    pass
+
+            self._merge(ticker, fetched)
+
+            yesterday = date.today() - timedelta(days=1)
+            newly_covered = [(start, min(end, yesterday)) for start, end in missing]
+            self._write_coverage(
+                ticker,
+                self.coverage(ticker) + [(s, e) for s, e in newly_covered if s <= e]
+            )
+            return len(fetched)
+
+    def sync_many(
+        self,
+        tickers: Iterable[str],
+        start_date,
+        end_date,
+        fetch: PriceFetcher,
+        max_workers: int = 10
+    ) -> Dict[str, int]:
+        """Sync many tickers concurrently, returning bars fetched per ticker."""
+        tickers = list(tickers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            counts = executor.map(
+                lambda ticker: self.sync(ticker, start_date, end_date, fetch), tickers
+            )
+            return dict(zip(tickers, counts))
+
+    def _merge(self, ticker: str, prices: List[Dict[str, Any]]) -> None:
+        """Merge fetched bars into the stored columns, new bars winning on duplicate dates."""
+        if not prices:
+            return
+        existing = self.load(ticker)
+        fetched = PriceSeries.from_records(prices)
+        times = np.concatenate([fetched.time, existing.time])
+        # np.unique keeps the first occurrence, so fetched bars take precedence
+        times, first = np.unique(times, return_index=True)
+        merged = {"time": times}
+        for col in PRICE_COLUMNS:
+            merged[col] = np.concatenate([getattr(fetched, col), getattr(existing, col)])[first]
+        del existing
+
+        ticker_dir = self._ticker_dir(ticker)
+        ticker_dir.mkdir(parents=True, exist_ok=True)
+        for col, values in merged.items():
+            tmp_path = ticker_dir / f"{col}.tmp.npy"
+            np.save(tmp_path, values)
+            os.replace(tmp_path, ticker_dir / f"{col}.npy")
+
+    def _write_coverage(self, ticker: str, ranges: List[Tuple[date, date]]) -> None:
+        """Persist coverage ranges, merging overlapping and adjacent ones."""
+        merged: List[List[date]] = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1] + timedelta(days=1):
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        ticker_dir = self._ticker_dir(ticker)
+        ticker_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = ticker_dir / "meta.tmp.json"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"coverage": [[s.isoformat(), e.isoformat()] for s, e in merged]}, f)
+        os.replace(tmp_path, ticker_dir / "meta.json")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_price_store() -> PriceStore:
+    """Return the shared price store rooted at FINANCIAL_DATASETS_PRICE_STORE_DIR."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = PriceStore(os.getenv("FINANCIAL_DATASETS_PRICE_STORE_DIR", ".cache/prices"))
+    return _store
@@ -0,0 +1,79 @@
+import os
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at `rate` per `per` seconds up to `burst`;
+    acquire() blocks until enough tokens are available. Graph nodes run on
+    worker threads (also under ainvoke), so one limiter shared by every
+    call site caps the combined request rate of a batch.
+    """
+
+    def __init__(self, rate: float, per: float = 60.0, burst: Optional[float] = None):
+        self.rate = rate / per
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket, waiting for them if needed
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+_llm_limiter = None
+_llm_limiter_configured = False
+_llm_limiter_lock = threading.Lock()
+
+
+def get_llm_rate_limiter() -> Optional[RateLimiter]:
+    """
+    Return the shared limiter for Gemini calls, configured from
+    LLM_REQUESTS_PER_MINUTE (unset means no limit).
+    """
+    global _llm_limiter, _llm_limiter_configured
+    with _llm_limiter_lock:
+        if not _llm_limiter_configured:
+            rpm = os.getenv("LLM_REQUESTS_PER_MINUTE")
+            _llm_limiter = RateLimiter(float(rpm)) if rpm else None
+            _llm_limiter_configured = True
+    return _llm_limiter
+
+
+def set_llm_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    """Replace the shared LLM limiter, or pass None to disable limiting."""
+    global _llm_limiter, _llm_limiter_configured
+    with _llm_limiter_lock:
+        _llm_limiter = limiter
+        _llm_limiter_configured = True
+
+
+def throttle_llm() -> None:
+    """Wait for the shared LLM limiter, if one is configured."""
+    limiter = get_llm_rate_limiter()
+    if limiter is not None:
+        limiter.acquire()
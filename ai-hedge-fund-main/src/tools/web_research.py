@@ -1,16 +1,9 @@
-import google.generativeai as genai
 from datetime import datetime, timedelta
 import json
 import re
-import os
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
-
-# Configure Gemini AI using environment variable
-genai.configure(api_key=os.getenv('GOOGLE_GEMINI_API_KEY'))
-model = genai.GenerativeModel('gemini-pro')
+from tools.llm import get_model
+from tools.rate_limiter import throttle_llm
 
 def clean_json_string(text):
     """Clean and extract JSON from the response text"""
@@ -36,10 +29,10 @@ def get_stock_data(ticker):
         
         print(f"\nAnalyzing {ticker} using real-time web data...")
         
-        # Verify API key is configured
-        if not os.getenv('GOOGLE_GEMINI_API_KEY'):
-            raise ValueError("GOOGLE_GEMINI_API_KEY environment variable not set")
+        # Raises if GOOGLE_GEMINI_API_KEY is not configured
+        model = get_model()
             
+        throttle_llm()
         response = model.generate_content(prompt)
         
         # Clean and parse the response
@@ -0,0 +1,14 @@
+import pytest
+
+from fakes import FakeModel
+from tools import llm
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    """Serve every LLM call from a FakeModel, with no response cache"""
+    model = FakeModel(latency=0)
+    monkeypatch.setenv("LLM_CACHE", "0")
+    monkeypatch.setitem(llm._models, llm.DEFAULT_MODEL, model)
+    monkeypatch.setattr(llm, "_decision_model", None)
+    return model
@@ -0,0 +1,35 @@
+import threading
+import time
+from typing import Optional
+
+from tools.llm import CachedResponse
+
+
+class FakeModel:
+    """
+    Local stand-in for a Gemini model. Sleeps for `latency` seconds and returns
+    a fixed response text (a hold decision by default).
+    """
+
+    def __init__(self, latency: float = 0.5, text: Optional[str] = None):
+        self.latency = latency
+        self.text = text or (
+            '{"action": "hold", "quantity": 0, "confidence": 0.5, '
+            '"reasoning": "Fake model response", "agent_signals": []}'
+        )
+        self.calls = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, contents, **kwargs):
+        with self._lock:
+            self.calls += 1
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            time.sleep(self.latency)
+            return CachedResponse(self.text)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
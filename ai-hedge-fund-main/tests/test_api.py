@@ -0,0 +1,114 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from tools import api
+from tools.http_client import FinancialDatasetsClient, set_client
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers /company/facts, failing the first `failures` requests per ticker."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.client_address)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            ticker = self.path.split("ticker=")[-1]
+            attempt = server.attempts.get(ticker, 0)
+            server.attempts[ticker] = attempt + 1
+        try:
+            time.sleep(server.delay)
+            if attempt < len(server.failures):
+                self.send_json(server.failures[attempt], {"error": "try again"})
+            else:
+                self.send_json(200, {"company_facts": {"market_cap": 1000}})
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def send_json(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    monkeypatch.setenv("FINANCIAL_DATASETS_CACHE", "0")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.attempts = {}
+    server.failures = ()
+    server.delay = 0.0
+    server.in_flight = 0
+    server.max_in_flight = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    set_client(None)
+    server.shutdown()
+    server.server_close()
+
+
+def use_client(server, max_concurrency=10):
+    client = FinancialDatasetsClient(
+        api_key="test",
+        base_url=f"http://127.0.0.1:{server.server_address[1]}",
+        max_concurrency=max_concurrency,
+        backoff_factor=0.01,
+    )
+    set_client(client)
+    return client
+
+
+def test_retries_rate_limit_and_server_errors(stub_server):
+    stub_server.failures = (429, 503, 500)
+    use_client(stub_server)
+
+    assert api.get_market_cap("AAPL") == 1000
+    assert stub_server.attempts["AAPL"] == 4
+
+
+def test_reuses_one_connection_for_sequential_requests(stub_server):
+    use_client(stub_server)
+
+    for ticker in ("AAPL", "MSFT", "NVDA"):
+        api.get_market_cap(ticker)
+
+    assert len(stub_server.requests) == 3
+    assert len(set(stub_server.requests)) == 1
+
+
+def test_fetch_many_respects_client_concurrency(stub_server):
+    stub_server.delay = 0.05
+    use_client(stub_server, max_concurrency=2)
+    tickers = [f"T{i}" for i in range(8)]
+
+    results = api.fetch_many(tickers, ["market_cap"], max_workers=8)
+
+    assert {ticker: result["market_cap"] for ticker, result in results.items()} == dict.fromkeys(tickers, 1000)
+    assert stub_server.max_in_flight == 2
+
+
+def test_fetch_many_requires_endpoint_arguments(stub_server):
+    use_client(stub_server)
+
+    with pytest.raises(ValueError, match="prices"):
+        api.fetch_many(["AAPL"], ["prices"])
+    with pytest.raises(ValueError, match="insider_trades"):
+        api.fetch_many(["AAPL"], {"insider_trades": {"start_date": "2024-01-01"}})
+    assert stub_server.requests == []
@@ -0,0 +1,144 @@
+import json
+
+import pytest
+
+from tools import cache as cache_module
+from tools.cache import CacheMissError, ResponseCache
+
+
+class Clock:
+    """Stands in for time.time so entries can be aged without sleeping"""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    caches = []
+
+    def make(**options):
+        cache = ResponseCache(str(tmp_path / "responses.sqlite"), **options)
+        caches.append(cache)
+        return cache
+
+    yield make
+    for cache in caches:
+        cache.close()
+
+
+def entry_size(value):
+    return len(json.dumps(value))
+
+
+def test_entries_expire_after_their_endpoint_ttl(make_cache, clock):
+    cache = make_cache(ttls={"prices": 60, "financial_metrics": 600})
+    params = {"ticker": "AAPL"}
+    cache.set("prices", params, [1])
+    cache.set("financial_metrics", params, [2])
+
+    clock.now += 60
+    assert cache.get("prices", params) == [1]
+    clock.now += 1
+    assert cache.get("prices", params) is None
+    # The longer TTL of another endpoint still holds
+    assert cache.get("financial_metrics", params) == [2]
+    clock.now += 600
+    assert cache.get("financial_metrics", params) is None
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_endpoint_without_ttl_never_expires(make_cache, clock):
+    cache = make_cache()
+    cache.set("custom", {"ticker": "AAPL"}, {"a": 1})
+    clock.now += 10 * 365 * 24 * 60 * 60
+    assert cache.get("custom", {"ticker": "AAPL"}) == {"a": 1}
+
+
+def test_least_recently_used_entries_are_evicted(make_cache, clock):
+    value = "x" * 100
+    cache = make_cache(max_bytes=3 * entry_size(value))
+    for ticker in ("A", "B", "C"):
+        clock.now += 1
+        cache.set("prices", {"ticker": ticker}, value)
+
+    # Reading A makes B the least recently used entry
+    clock.now += 1
+    assert cache.get("prices", {"ticker": "A"}) == value
+    clock.now += 1
+    cache.set("prices", {"ticker": "D"}, value)
+
+    assert cache.get("prices", {"ticker": "B"}) is None
+    for ticker in ("A", "C", "D"):
+        assert cache.get("prices", {"ticker": ticker}) == value
+
+
+def test_eviction_frees_enough_for_a_large_entry(make_cache, clock):
+    small, large = "x" * 100, "y" * 150
+    cache = make_cache(max_bytes=3 * entry_size(small))
+    for ticker in ("A", "B", "C"):
+        clock.now += 1
+        cache.set("prices", {"ticker": ticker}, small)
+    clock.now += 1
+    cache.set("prices", {"ticker": "D"}, large)
+
+    assert cache.get("prices", {"ticker": "A"}) is None
+    assert cache.get("prices", {"ticker": "B"}) is None
+    assert cache.get("prices", {"ticker": "C"}) == small
+    assert cache.get("prices", {"ticker": "D"}) == large
+
+
+def test_no_max_bytes_disables_eviction(make_cache):
+    cache = make_cache(max_bytes=None)
+    for i in range(20):
+        cache.set("prices", {"ticker": str(i)}, "x" * 1000)
+    assert all(cache.get("prices", {"ticker": str(i)}) is not None for i in range(20))
+
+
+def test_offline_cache_raises_on_miss_and_serves_expired_entries(make_cache, clock):
+    params = {"ticker": "AAPL", "end_date": "2024-03-01"}
+    make_cache(ttls={"prices": 60}).set("prices", params, [1])
+
+    offline = make_cache(ttls={"prices": 60}, offline=True)
+    clock.now += 3600
+    assert offline.get("prices", params) == [1]
+    with pytest.raises(CacheMissError):
+        offline.get("prices", {**params, "end_date": "2024-03-02"})
+    assert offline.misses == 1
+
+
+def test_offline_cache_is_read_only(make_cache):
+    offline = make_cache(offline=True)
+    offline.set("prices", {"ticker": "AAPL"}, [1])
+    with pytest.raises(CacheMissError):
+        offline.get("prices", {"ticker": "AAPL"})
+
+
+def test_key_is_stable_across_parameter_order(make_cache):
+    forward = {"ticker": "AAPL", "start_date": "2024-01-01", "end_date": "2024-03-01"}
+    backward = dict(reversed(list(forward.items())))
+    assert list(forward) != list(backward)
+    assert ResponseCache.make_key("prices", forward) == ResponseCache.make_key("prices", backward)
+
+    cache = make_cache()
+    cache.set("prices", forward, [1])
+    assert cache.get("prices", backward) == [1]
+
+
+def test_key_separates_endpoints_and_point_in_time_params():
+    params = {"ticker": "AAPL", "report_period_lte": "2024-03-01"}
+    key = ResponseCache.make_key("financial_metrics", params)
+    assert key != ResponseCache.make_key("line_items", params)
+    assert key != ResponseCache.make_key(
+        "financial_metrics", {**params, "report_period_lte": "2024-03-02"}
+    )
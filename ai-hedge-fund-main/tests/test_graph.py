@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+import pytest
+from langchain_core.messages import HumanMessage
+
+import main
+from tools import rate_limiter
+from tools.rate_limiter import RateLimiter
+
+AGENT_NODES = [
+    "technical_analyst",
+    "fundamentals_agent",
+    "sentiment_agent",
+    "risk_management_agent",
+    "portfolio_management",
+]
+
+
+def manual_data(seed=0, n=300, end="2024-06-28"):
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range(end=end, periods=n)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.001, 0.02, n)))
+    return {
+        "prices": [
+            {"time": day.strftime("%Y-%m-%d"), "open": float(c), "high": float(c * 1.01),
+             "low": float(c * 0.99), "close": float(c), "volume": 1_000_000}
+            for day, c in zip(days, close)
+        ],
+        "financial_metrics": {
+            name: 0.2 for name in (
+                "return_on_equity", "net_margin", "operating_margin", "revenue_growth",
+                "earnings_growth", "book_value_growth", "current_ratio", "debt_to_equity",
+                "free_cash_flow_per_share", "earnings_per_share", "price_to_earnings_ratio",
+                "price_to_book_ratio", "price_to_sales_ratio",
+            )
+        },
+        "insider_trades": [],
+        "market_cap": 1_000_000_000,
+        "market_sentiment": {
+            "overall_sentiment": "neutral",
+            "confidence": 0.6,
+            "recent_news": [],
+            "market_trends": [],
+            "upcoming_events": [],
+            "analyst_ratings": {"strong_buy": 1, "buy": 2, "hold": 3, "sell": 1, "strong_sell": 0},
+        },
+    }
+
+
+@pytest.fixture(scope="module")
+def parallel_app():
+    return main.build_workflow(parallel=True)
+
+
+def run_graph(app, initial_messages=None):
+    state = main.initial_state(
+        "TEST", None, "2024-06-28", {"cash": 100000, "stock": 0}, manual_data()
+    )
+    if initial_messages is not None:
+        state["messages"] = initial_messages
+    return state, app.invoke(state)
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_each_agent_adds_exactly_one_message(fake_model, parallel_app, parallel):
+    app = parallel_app if parallel else main.app
+    state, final_state = run_graph(app)
+
+    initial = state["messages"]
+    messages = final_state["messages"]
+    assert len(messages) == len(initial) + len(AGENT_NODES)
+    assert messages[:len(initial)] == initial
+    added = [message.name for message in messages[len(initial):]]
+    assert sorted(added) == sorted(AGENT_NODES)
+    assert len({id(message) for message in messages}) == len(messages)
+    assert fake_model.calls == 1
+
+    assert sorted(final_state["agent_messages"]) == sorted(AGENT_NODES)
+    for name, message in final_state["agent_messages"].items():
+        assert message.name == name
+        assert message in messages
+
+
+def test_message_history_is_not_duplicated_by_earlier_messages(fake_model, parallel_app):
+    initial = [HumanMessage(content=f"context {i}") for i in range(3)]
+    for app in (main.app, parallel_app):
+        _, final_state = run_graph(app, initial)
+        assert len(final_state["messages"]) == len(initial) + len(AGENT_NODES)
+        assert len(final_state["agent_messages"]) == len(AGENT_NODES)
+
+
+def test_sequential_and_parallel_graphs_agree(fake_model, parallel_app):
+    _, sequential = run_graph(main.app)
+    _, parallel = run_graph(parallel_app)
+    assert sequential["data"]["technical_signal"] == parallel["data"]["technical_signal"]
+    for name in AGENT_NODES:
+        assert sequential["agent_messages"][name].content == parallel["agent_messages"][name].content
+
+
+def test_batch_restores_the_shared_llm_rate_limiter(fake_model, monkeypatch):
+    previous = RateLimiter(60)
+    monkeypatch.setattr(rate_limiter, "_llm_limiter", previous)
+    monkeypatch.setattr(rate_limiter, "_llm_limiter_configured", True)
+    seen = []
+
+    async def fake_batch(*args, **kwargs):
+        seen.append(rate_limiter.get_llm_rate_limiter())
+        if len(seen) == 2:
+            raise RuntimeError("batch failed")
+        return {}
+
+    monkeypatch.setattr(main, "arun_hedge_fund_batch", fake_batch)
+    args = (["TEST"], None, "2024-06-28", {"cash": 100000, "stock": 0})
+    main.run_hedge_fund_batch(*args, llm_requests_per_minute=1e6)
+    with pytest.raises(RuntimeError):
+        main.run_hedge_fund_batch(*args, llm_requests_per_minute=1e6)
+
+    assert all(limiter is not previous and limiter.rate == pytest.approx(1e6 / 60) for limiter in seen)
+    assert rate_limiter.get_llm_rate_limiter() is previous
+
+
+def test_batch_runs_every_ticker(fake_model):
+    data = {ticker: manual_data(seed) for seed, ticker in enumerate(("AAA", "BBB"))}
+    results = main.run_hedge_fund_batch(
+        list(data), None, "2024-06-28", {"cash": 100000, "stock": 0}, data,
+        max_concurrency=2, llm_requests_per_minute=1e6
+    )
+    assert sorted(results) == ["AAA", "BBB"]
+    assert all(result["error"] is None for result in results.values())
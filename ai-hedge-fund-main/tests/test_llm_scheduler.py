@@ -0,0 +1,152 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from fakes import FakeModel
+from tools.llm_scheduler import LLMScheduler
+from tools.rate_limiter import RateLimiter
+
+
+class EchoModel(FakeModel):
+    """FakeModel answering each prompt with itself after a random delay"""
+
+    def __init__(self, max_latency: float = 0.02, seed: int = 0):
+        super().__init__(latency=0)
+        self.max_latency = max_latency
+        self._random = random.Random(seed)
+        self.started = []
+
+    def generate_content(self, contents, **kwargs):
+        with self._lock:
+            self.started.append(time.monotonic())
+            self.latency = self._random.uniform(0, self.max_latency)
+        response = super().generate_content(contents, **kwargs)
+        response.text = contents
+        return response
+
+
+class FailingModel(FakeModel):
+    def generate_content(self, contents, **kwargs):
+        if contents == "fail":
+            raise RuntimeError("model unavailable")
+        return super().generate_content(contents, **kwargs)
+
+
+def unlimited():
+    # Keeps the tests independent of the shared LLM_REQUESTS_PER_MINUTE limiter
+    return RateLimiter(1e9, per=1.0)
+
+
+@pytest.fixture
+def make_scheduler():
+    schedulers = []
+
+    def make(model, **options):
+        options.setdefault("request_limiter", unlimited())
+        scheduler = LLMScheduler(model, **options)
+        schedulers.append(scheduler)
+        return scheduler
+
+    yield make
+    for scheduler in schedulers:
+        scheduler.close()
+
+
+def test_requests_per_minute_limit_is_enforced(make_scheduler):
+    # 1200 per minute is 20 per second, with room for a burst of 2
+    model = EchoModel(max_latency=0)
+    scheduler = make_scheduler(
+        model, max_concurrency=8, request_limiter=RateLimiter(1200, per=60.0, burst=2)
+    )
+    start = time.monotonic()
+    futures = [scheduler.submit(f"prompt {i}") for i in range(12)]
+    for future in futures:
+        future.result(timeout=10)
+
+    # Ten calls beyond the burst at 20 per second
+    assert time.monotonic() - start >= 10 / 20 * 0.9
+    started = sorted(t - start for t in model.started)
+    for i, t in enumerate(started):
+        assert t >= (i - 2 + 1) / 20 * 0.9
+
+
+def test_tokens_per_minute_limit_is_enforced(make_scheduler):
+    # 1200 tokens per minute (20 per second) hold 120 prompts of 10 tokens
+    model = EchoModel(max_latency=0)
+    scheduler = make_scheduler(
+        model,
+        max_concurrency=8,
+        tokens_per_minute=1200,
+        expected_output_tokens=0,
+        token_estimator=lambda contents: 10,
+    )
+    start = time.monotonic()
+    futures = [scheduler.submit(f"prompt {i}") for i in range(122)]
+    for future in futures:
+        future.result(timeout=10)
+
+    # The last two prompts each wait for 10 more tokens at 20 per second
+    assert time.monotonic() - start >= 2 * 10 / 20 * 0.9
+    started = sorted(t - start for t in model.started)
+    assert started[119] < 0.25
+    assert started[121] >= 1.0 * 0.9
+
+
+def test_oversized_prompt_waits_for_a_full_bucket_only(make_scheduler):
+    scheduler = make_scheduler(
+        EchoModel(max_latency=0),
+        tokens_per_minute=6000,
+        expected_output_tokens=0,
+        token_estimator=lambda contents: 10_000,
+    )
+    assert scheduler.generate_content("huge").text == "huge"
+
+
+def test_concurrent_submits_resolve_their_own_futures(make_scheduler):
+    model = EchoModel(max_latency=0.02)
+    scheduler = make_scheduler(model, max_concurrency=4)
+    prompts = [f"prompt {i}" for i in range(40)]
+
+    with ThreadPoolExecutor(max_workers=8) as callers:
+        futures = list(callers.map(scheduler.submit, prompts))
+    # Futures come back in submission order and each carries its own answer
+    assert [future.result(timeout=10).text for future in futures] == prompts
+    assert model.max_in_flight <= 4
+    assert scheduler.submitted == scheduler.completed == len(prompts)
+    assert scheduler.pending == 0
+
+
+def test_generate_content_blocks_for_the_response(make_scheduler):
+    scheduler = make_scheduler(FakeModel(latency=0.01, text="done"))
+    assert scheduler.generate_content("prompt").text == "done"
+
+
+def test_model_exception_reaches_the_caller(make_scheduler):
+    scheduler = make_scheduler(FailingModel(latency=0), max_concurrency=2)
+    failed = scheduler.submit("fail")
+    succeeded = scheduler.submit("ok")
+
+    assert isinstance(failed.exception(timeout=10), RuntimeError)
+    with pytest.raises(RuntimeError, match="model unavailable"):
+        scheduler.generate_content("fail")
+    # The failure is confined to its own future
+    assert succeeded.result(timeout=10).text == FakeModel().text
+    assert scheduler.pending == 0
+
+
+def test_exception_does_not_stop_other_callers(make_scheduler):
+    scheduler = make_scheduler(FailingModel(latency=0.005), max_concurrency=2)
+    prompts = ["fail" if i % 3 == 0 else "ok" for i in range(12)]
+
+    def call(contents):
+        try:
+            return scheduler.generate_content(contents).text
+        except RuntimeError as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=6) as callers:
+        results = list(callers.map(call, prompts))
+    for prompt, result in zip(prompts, results):
+        assert isinstance(result, RuntimeError) == (prompt == "fail")
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtester import Backtester, technical_signal_agent
+from main import backtest_agent
+from parallel_backtester import run_parallel_backtest
+
+START_DATE = "2021-01-04"
+END_DATE = "2021-06-30"
+
+
+def random_manual_data(seed, n=500, end=END_DATE):
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range(end=end, periods=n)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n)))
+    spread = np.abs(rng.normal(0, 0.01, n)) * close
+    volume = rng.integers(100_000, 1_000_000, n)
+    return {
+        "prices": [
+            {"time": day.strftime("%Y-%m-%d"), "open": float(c), "high": float(c + s),
+             "low": float(c - s), "close": float(c), "volume": int(v)}
+            for day, c, s, v in zip(days, close, spread, volume)
+        ]
+    }
+
+
+MANUAL_DATA_BY_TICKER = {"AAA": random_manual_data(0), "BBB": random_manual_data(1)}
+
+
+def sequential_decisions(ticker, manual_data):
+    backtester = Backtester(
+        agent=technical_signal_agent,
+        ticker=ticker,
+        start_date=START_DATE,
+        end_date=END_DATE,
+        initial_capital=100000,
+        manual_data=manual_data,
+        verbose=False
+    )
+    backtester.run_backtest()
+    return backtester.decisions
+
+
+@pytest.mark.parametrize("decision_only", [False, True])
+def test_parallel_matches_sequential_run(decision_only):
+    report = run_parallel_backtest(
+        MANUAL_DATA_BY_TICKER, START_DATE, END_DATE,
+        agent=technical_signal_agent, decision_only=decision_only, chunks=3, max_workers=2
+    )
+    decisions = report["decisions"]
+    for ticker, manual_data in MANUAL_DATA_BY_TICKER.items():
+        expected = pd.DataFrame(sequential_decisions(ticker, manual_data))
+        actual = decisions[decisions["ticker"] == ticker].reset_index(drop=True)
+        pd.testing.assert_frame_equal(actual[expected.columns], expected)
+        assert report["summary"].loc[ticker, "trades"] == (expected["executed_quantity"] > 0).sum()
+
+
+def test_technical_agent_ignores_the_portfolio():
+    backtester = Backtester(
+        agent=technical_signal_agent, ticker="AAA", start_date=START_DATE, end_date=END_DATE,
+        initial_capital=100000, manual_data=MANUAL_DATA_BY_TICKER["AAA"], verbose=False
+    )
+    for current_date in pd.date_range(START_DATE, END_DATE, freq="B")[::10]:
+        backtester.portfolio = {"cash": 100000, "stock": 0}
+        flat = backtester.decide(current_date)
+        backtester.portfolio = {"cash": 0, "stock": 500}
+        assert backtester.decide(current_date) == flat
+
+
+def test_decision_only_rejects_portfolio_dependent_agent():
+    with pytest.raises(ValueError, match="portfolio-independent"):
+        run_parallel_backtest(
+            MANUAL_DATA_BY_TICKER, START_DATE, END_DATE,
+            agent=backtest_agent, decision_only=True
+        )
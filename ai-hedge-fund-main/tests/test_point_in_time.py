@@ -0,0 +1,99 @@
+import pickle
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from tools.point_in_time import DatedRecords, MarketData
+from tools.price_store import PriceSeries
+
+
+def random_trades(seed, n=60):
+    """Insider trades newest first, as the API returns them, some sharing a date"""
+    rng = random.Random(seed)
+    days = sorted((date(2023, 1, 1) + timedelta(days=rng.randrange(365)) for _ in range(n)), reverse=True)
+    trades = [
+        {"filing_date": day.isoformat(), "transaction_shares": i}
+        for i, day in enumerate(days)
+    ]
+    trades.insert(rng.randrange(n), {"filing_date": None, "transaction_shares": -1})
+    return trades
+
+
+def dated(trades):
+    return [trade for trade in trades if trade["filing_date"]]
+
+
+def test_records_keep_newest_first_order():
+    trades = random_trades(0)
+    records = DatedRecords.from_records(trades, "filing_date")
+    assert records.to_list()[:-1] == dated(trades)
+    assert records[0] == dated(trades)[0]
+    # Undated records sort last
+    assert records[-1]["filing_date"] is None
+
+
+def test_unordered_input_is_sorted_newest_first():
+    trades = dated(random_trades(1))
+    shuffled = trades[:]
+    random.Random(1).shuffle(shuffled)
+    records = DatedRecords.from_records(shuffled, "filing_date")
+    assert [r["filing_date"] for r in records] == [t["filing_date"] for t in trades]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("bounds", [
+    (None, "2023-06-30"),
+    ("2023-03-01", None),
+    ("2023-03-01", "2023-06-30"),
+    ("2023-05-05", "2023-05-05"),
+    ("2024-01-01", None),
+    (None, "2022-12-31"),
+])
+def test_slice_matches_a_filter(seed, bounds):
+    start, end = bounds
+    trades = random_trades(seed)
+    expected = [
+        trade for trade in dated(trades)
+        if (start is None or trade["filing_date"] >= start) and (end is None or trade["filing_date"] <= end)
+    ]
+    view = DatedRecords.from_records(trades, "filing_date").slice(start, end)
+    assert view.to_list() == expected
+    assert list(view) == expected
+    assert len(view) == len(expected)
+    if expected:
+        assert view[0] == expected[0]
+
+
+def test_slices_nest():
+    trades = random_trades(2)
+    records = DatedRecords.from_records(trades, "filing_date")
+    nested = records.slice(None, "2023-09-30").slice("2023-03-01", None)
+    assert nested.to_list() == records.slice("2023-03-01", "2023-09-30").to_list()
+
+
+def test_market_data_as_of_hides_later_records():
+    trades = random_trades(3)
+    prices = [
+        {"time": (date(2023, 1, 2) + timedelta(days=i)).isoformat(), "open": 1.0, "high": 1.0,
+         "low": 1.0, "close": float(i), "volume": 1.0}
+        for i in range(300)
+    ]
+    data = MarketData.wrap({"prices": prices, "insider_trades": trades, "market_cap": 1})
+    view = data.as_of("2023-06-30")
+
+    assert isinstance(view["prices"], PriceSeries)
+    assert str(view["prices"].time[-1]) == "2023-06-30"
+    assert view["insider_trades"][0] == next(t for t in dated(trades) if t["filing_date"] <= "2023-06-30")
+    assert view["market_cap"] == 1
+    # The index is built once per handle
+    assert data.indexed() is data.indexed()
+
+
+def test_market_data_is_read_only_and_picklable():
+    data = MarketData.wrap({"insider_trades": random_trades(4)}).indexed()
+    with pytest.raises(TypeError):
+        data["insider_trades"] = []
+    restored = pickle.loads(pickle.dumps(data))
+    assert restored["insider_trades"].to_list() == data["insider_trades"].to_list()
+    assert MarketData.wrap(data) is data
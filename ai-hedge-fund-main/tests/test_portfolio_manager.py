@@ -0,0 +1,66 @@
+import json
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from agents.portfolio_manager import DecisionPolicy, latest_close, portfolio_management_agent
+from agents.state import AgentSignal, agent_message_update
+from tools.price_store import PriceSeries
+
+PRICES = [
+    {"time": "2024-01-03", "open": 11.0, "high": 11.0, "low": 11.0, "close": 11.0, "volume": 100},
+    {"time": "2024-01-02", "open": 10.0, "high": 10.0, "low": 10.0, "close": 10.0, "volume": 100},
+]
+
+
+class CountingSignal(AgentSignal):
+    renders = 0
+
+    def to_json(self) -> str:
+        CountingSignal.renders += 1
+        return super().to_json()
+
+
+def analyst_message(name, signal, confidence=0.8):
+    return HumanMessage(content=json.dumps({"signal": signal, "confidence": confidence}), name=name)
+
+
+def decision_state(technical_signal, risk):
+    state = {
+        "messages": [],
+        "agent_messages": {},
+        "data": {
+            "portfolio": {"cash": 1000.0, "stock": 0},
+            "prices": PriceSeries.from_records(PRICES),
+            "technical_signal": technical_signal,
+        },
+        "metadata": {"show_reasoning": False, "decision_policy": DecisionPolicy()},
+    }
+    for message in (
+        analyst_message("fundamentals_agent", "bullish"),
+        analyst_message("sentiment_agent", "bullish"),
+        HumanMessage(content=json.dumps(risk), name="risk_management_agent"),
+    ):
+        state["agent_messages"].update(agent_message_update(message)["agent_messages"])
+    return state
+
+
+def test_latest_close_reads_the_sorted_series():
+    assert latest_close(PriceSeries.from_records(PRICES)) == 11.0
+    assert latest_close(PRICES) == 11.0
+    assert latest_close(PriceSeries.empty()) is None
+    assert latest_close(None) is None
+
+
+def test_rule_decision_does_not_render_the_technical_report():
+    CountingSignal.renders = 0
+    risk = {"position_size": 1.0, "bullish_count": 3, "bearish_count": 0, "signal_count": 3, "confidence": 80}
+    update = portfolio_management_agent(decision_state(CountingSignal("bullish", 0.9), risk))
+
+    decision = json.loads(update["messages"][0].content)
+    assert decision["decision_path"] == "rule"
+    assert decision["action"] == "buy"
+    assert decision["quantity"] == 1000 // 11
+    technical = next(s for s in decision["agent_signals"] if s["agent"] == "technical_analyst")
+    assert technical == {"agent": "technical_analyst", "signal": "bullish", "confidence": pytest.approx(0.9)}
+    assert CountingSignal.renders == 0
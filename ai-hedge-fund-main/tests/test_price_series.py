@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools.api import prices_to_df
+from tools.price_store import PRICE_COLUMNS, PriceSeries
+
+RECORDS = [
+    {"time": f"2024-01-{day:02d}", "open": day + 0.1, "high": day + 0.5, "low": day - 0.5,
+     "close": float(day), "volume": day * 100}
+    for day in (2, 3, 4, 5, 8, 9, 10)
+]
+
+
+@pytest.fixture
+def series():
+    # Out of order input is sorted by date
+    return PriceSeries.from_records(RECORDS[::-1])
+
+
+def test_from_records_sorts_and_round_trips(series):
+    assert series.time.dtype == np.dtype("datetime64[D]")
+    assert np.all(np.diff(series.time.astype("int64")) > 0)
+    assert series.to_records() == RECORDS
+
+
+def test_missing_and_null_values_become_nan():
+    records = [
+        {"time": "2024-01-02", "open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": None},
+        {"time": "2024-01-03", "close": 2.0},
+    ]
+    series = PriceSeries.from_records(records)
+    assert np.isnan(series.volume).all()
+    assert np.isnan(series.open[1])
+
+    # Same values as the DataFrame path
+    expected = prices_to_df(records)
+    for col in PRICE_COLUMNS:
+        np.testing.assert_array_equal(series.to_frame()[col].to_numpy(), expected[col].to_numpy(dtype=float))
+
+    assert series.to_records() == [
+        {"time": "2024-01-02", "open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": None},
+        {"time": "2024-01-03", "open": None, "high": None, "low": None, "close": 2.0, "volume": None},
+    ]
+
+
+@pytest.mark.parametrize("start, end, expected", [
+    (None, None, [2, 3, 4, 5, 8, 9, 10]),
+    ("2024-01-04", "2024-01-08", [4, 5, 8]),
+    ("2024-01-06", "2024-01-07", []),
+    ("2024-01-06", None, [8, 9, 10]),
+    (None, "2024-01-03", [2, 3]),
+    ("2024-01-11", None, []),
+])
+def test_slice_is_inclusive(series, start, end, expected):
+    assert series.slice(start, end).close.tolist() == expected
+
+
+def test_tail(series):
+    assert series.tail(3).close.tolist() == [8, 9, 10]
+    assert series.tail(100).close.tolist() == series.close.tolist()
+    assert len(series.tail(0)) == 0
+
+
+def test_slices_share_memory(series):
+    window = series.slice("2024-01-04", "2024-01-09").tail(2)
+    for col in ("time",) + PRICE_COLUMNS:
+        assert np.shares_memory(getattr(window, col), getattr(series, col))
+
+
+def test_to_frame_wraps_the_arrays(series):
+    frame = series.to_frame()
+    assert frame.index.name == "Date"
+    assert list(frame.columns) == list(PRICE_COLUMNS)
+    pd.testing.assert_frame_equal(frame, prices_to_df(RECORDS)[list(PRICE_COLUMNS)].astype(float), check_freq=False, check_index_type=False)
+    for col in PRICE_COLUMNS:
+        assert np.shares_memory(frame[col].to_numpy(), getattr(series, col))
+
+
+def test_to_frame_copies_do_not_leak_columns(series):
+    frame = series.to_frame()
+    frame["extra"] = 1.0
+    assert "extra" not in series.to_frame().columns
+
+
+def test_empty_series():
+    series = PriceSeries.from_records([])
+    assert len(series) == 0
+    assert series.to_records() == []
+    assert len(series.slice("2024-01-01", "2024-12-31")) == 0
+    assert series.to_frame().empty
@@ -0,0 +1,140 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools import price_store
+from tools.price_store import PriceStore
+
+
+class FakeFetcher:
+    """Business-day bars for any range, recording each call"""
+
+    def __init__(self, version=0):
+        self.version = version
+        self.calls = []
+
+    def __call__(self, ticker, start_date, end_date):
+        self.calls.append((ticker, start_date, end_date))
+        days = pd.bdate_range(start_date, end_date)
+        if not len(days):
+            raise ValueError("No price data returned")
+        return [
+            {"time": day.strftime("%Y-%m-%d"), "open": 1.0, "high": 1.0, "low": 1.0,
+             "close": float(day.day + self.version), "volume": 100}
+            for day in days
+        ]
+
+
+class FixedDate(date):
+    @classmethod
+    def today(cls):
+        return cls(2024, 3, 13)
+
+
+def business_days(start, end):
+    return len(pd.bdate_range(start, end))
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(price_store, "date", FixedDate)
+    return PriceStore(str(tmp_path / "prices"))
+
+
+def test_missing_ranges_of_an_empty_store(store):
+    assert store.missing_ranges("AAPL", "2024-01-01", "2024-01-31") == [
+        (date(2024, 1, 1), date(2024, 1, 31))
+    ]
+
+
+def test_missing_ranges_around_covered_ranges(store):
+    fetch = FakeFetcher()
+    store.sync("AAPL", "2024-01-10", "2024-01-20", fetch)
+    store.sync("AAPL", "2024-02-01", "2024-02-10", fetch)
+    assert store.missing_ranges("AAPL", "2024-01-01", "2024-02-29") == [
+        (date(2024, 1, 1), date(2024, 1, 9)),
+        (date(2024, 1, 21), date(2024, 1, 31)),
+        (date(2024, 2, 11), date(2024, 2, 29)),
+    ]
+    assert store.missing_ranges("AAPL", "2024-01-12", "2024-01-18") == []
+
+
+def test_first_sync_fetches_the_window_and_resync_fetches_nothing(store):
+    fetch = FakeFetcher()
+    assert store.sync("AAPL", "2024-01-01", "2024-01-31", fetch) == business_days("2024-01-01", "2024-01-31")
+    assert len(store.get_series("AAPL")) == business_days("2024-01-01", "2024-01-31")
+
+    assert store.sync("AAPL", "2024-01-05", "2024-01-25", fetch) == 0
+    assert len(fetch.calls) == 1
+
+
+def test_tail_sync_fetches_only_new_bars(store):
+    fetch = FakeFetcher()
+    store.sync("AAPL", "2024-01-01", "2024-01-31", fetch)
+    fetched = store.sync("AAPL", "2024-01-01", "2024-02-15", fetch)
+
+    assert fetched == business_days("2024-02-01", "2024-02-15")
+    assert fetch.calls[-1] == ("AAPL", "2024-02-01", "2024-02-15")
+    assert store.coverage("AAPL") == [(date(2024, 1, 1), date(2024, 2, 15))]
+    assert len(store.get_series("AAPL")) == business_days("2024-01-01", "2024-02-15")
+
+
+def test_gap_sync_fetches_only_the_gap(store):
+    fetch = FakeFetcher()
+    store.sync("AAPL", "2024-01-01", "2024-01-15", fetch)
+    store.sync("AAPL", "2024-02-01", "2024-02-15", fetch)
+    fetched = store.sync("AAPL", "2024-01-01", "2024-02-15", fetch)
+
+    assert fetched == business_days("2024-01-16", "2024-01-31")
+    assert fetch.calls[-1] == ("AAPL", "2024-01-16", "2024-01-31")
+    assert store.coverage("AAPL") == [(date(2024, 1, 1), date(2024, 2, 15))]
+    times = store.get_series("AAPL").time
+    assert np.all(np.diff(times.astype("int64")) > 0)
+    assert len(times) == business_days("2024-01-01", "2024-02-15")
+
+
+def test_empty_range_is_still_covered(store):
+    fetch = FakeFetcher()
+    # A weekend: the fetcher raises ValueError for no bars
+    assert store.sync("AAPL", "2024-01-06", "2024-01-07", fetch) == 0
+    assert store.coverage("AAPL") == [(date(2024, 1, 6), date(2024, 1, 7))]
+    assert store.sync("AAPL", "2024-01-06", "2024-01-07", fetch) == 0
+    assert len(fetch.calls) == 1
+
+
+def test_coverage_stops_at_yesterday_and_today_is_refetched(store):
+    # FixedDate makes 2024-03-13 today
+    assert store.sync("AAPL", "2024-03-01", "2024-03-13", FakeFetcher(version=0)) == business_days("2024-03-01", "2024-03-13")
+    assert store.coverage("AAPL") == [(date(2024, 3, 1), date(2024, 3, 12))]
+
+    refetch = FakeFetcher(version=100)
+    assert store.sync("AAPL", "2024-03-01", "2024-03-13", refetch) == 1
+    assert refetch.calls == [("AAPL", "2024-03-13", "2024-03-13")]
+    # The refetched bar replaced the one stored while the day was forming
+    series = store.get_series("AAPL")
+    assert series.close[-1] == 13 + 100
+    assert series.close[-2] == 12
+
+
+def test_merge_prefers_fetched_bars_on_duplicate_dates(store):
+    store.sync("AAPL", "2024-01-01", "2024-01-10", FakeFetcher(version=0))
+    store._merge("AAPL", FakeFetcher(version=50)("AAPL", "2024-01-08", "2024-01-12"))
+
+    series = store.get_series("AAPL")
+    closes = dict(zip(series.time.astype(str), series.close))
+    assert len(series) == business_days("2024-01-01", "2024-01-12")
+    assert closes["2024-01-05"] == 5
+    assert closes["2024-01-08"] == 8 + 50
+    assert closes["2024-01-12"] == 12 + 50
+
+
+def test_sync_many_counts_bars_per_ticker(store):
+    fetch = FakeFetcher()
+    store.sync("AAPL", "2024-01-01", "2024-01-15", fetch)
+    counts = store.sync_many(["AAPL", "MSFT"], "2024-01-01", "2024-01-31", fetch, max_workers=2)
+    assert counts == {
+        "AAPL": business_days("2024-01-16", "2024-01-31"),
+        "MSFT": business_days("2024-01-01", "2024-01-31"),
+    }
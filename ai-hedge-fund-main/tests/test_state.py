@@ -0,0 +1,58 @@
+import json
+
+from langchain_core.messages import HumanMessage
+
+from agents.state import AgentSignal, agent_message_update, get_agent_message
+
+
+class CountingSignal(AgentSignal):
+    renders = 0
+
+    def to_dict(self):
+        CountingSignal.renders += 1
+        return super().to_dict()
+
+
+def test_signal_json_is_built_once():
+    CountingSignal.renders = 0
+    signal = CountingSignal(signal="bullish", confidence=0.75, metrics={"adx": 31.5})
+    assert signal.to_json() is signal.to_json()
+    assert CountingSignal.renders == 1
+    assert json.loads(signal.to_json()) == {
+        "signal": "bullish", "confidence": "75%", "metrics": {"adx": 31.5}
+    }
+
+
+def test_signal_dict_nests_components():
+    signal = AgentSignal(
+        signal="neutral",
+        confidence=0.5,
+        components={"trend_following": AgentSignal(signal="bearish", confidence=0.2)},
+        reasoning="mixed",
+    )
+    assert signal.to_dict() == {
+        "signal": "neutral",
+        "confidence": "50%",
+        "strategy_signals": {"trend_following": {"signal": "bearish", "confidence": "20%"}},
+        "reasoning": "mixed",
+    }
+    # The cached rendering is not part of equality
+    signal.to_json()
+    assert signal == AgentSignal(
+        signal="neutral",
+        confidence=0.5,
+        components={"trend_following": AgentSignal(signal="bearish", confidence=0.2)},
+        reasoning="mixed",
+    )
+
+
+def test_agent_message_update_publishes_under_the_agent_name():
+    signal = AgentSignal(signal="bullish", confidence=0.75)
+    message = HumanMessage(content=signal.to_json(), name="technical_analyst")
+    update = agent_message_update(message)
+    assert update == {"messages": [message], "agent_messages": {"technical_analyst": message}}
+
+    state = {"messages": update["messages"], "agent_messages": update["agent_messages"]}
+    assert get_agent_message(state, "technical_analyst") is message
+    assert get_agent_message(state, "sentiment_agent") is None
+    assert get_agent_message({"messages": []}, "technical_analyst") is None
@@ -0,0 +1,175 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from agents.streaming import (
+    ADXState,
+    ATRState,
+    EMAState,
+    MACDState,
+    ReturnsState,
+    RollingStats,
+    RSIState,
+    StreamingTechnicals,
+)
+from agents.technicals import (
+    STRATEGIES,
+    IndicatorEngine,
+    calculate_adx,
+    calculate_atr,
+    calculate_ema,
+    calculate_hurst_exponent,
+    calculate_macd,
+    calculate_rsi,
+    evaluate_features,
+    evaluate_strategy,
+    latest_features,
+    required_history,
+)
+
+
+def random_prices(seed, n=400, level=100.0, drift=0.0):
+    rng = np.random.default_rng(seed)
+    close = level * np.exp(np.cumsum(rng.normal(drift, 0.02, n)))
+    spread = np.abs(rng.normal(0, 0.01, n)) * close
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close + spread,
+            "low": close - spread,
+            "close": close,
+            "volume": rng.integers(1_000, 1_000_000, n).astype(float),
+        },
+        index=pd.bdate_range("2020-01-01", periods=n, name="Date"),
+    )
+
+
+PRICE_SERIES = {
+    "random": random_prices(0),
+    "trending": random_prices(1, n=1000, level=10.0, drift=0.01),
+    "high_level": random_prices(2, n=600, level=1e5),
+}
+
+
+def streamed(update, values):
+    return np.array([update(value) for value in values], dtype=float)
+
+
+def assert_matches(actual, expected, rtol=1e-9, atol=1e-9):
+    expected = np.asarray(expected, dtype=float)
+    assert np.array_equal(np.isnan(actual), np.isnan(expected))
+    np.testing.assert_allclose(actual, expected, rtol=rtol, atol=atol, equal_nan=True)
+
+
+@pytest.fixture(params=sorted(PRICE_SERIES))
+def prices_df(request):
+    return PRICE_SERIES[request.param]
+
+
+@pytest.mark.parametrize("span", [8, 21, 55])
+def test_ema_matches_batch(prices_df, span):
+    state = EMAState(span)
+    assert_matches(streamed(state.update, prices_df["close"]), calculate_ema(prices_df, span))
+
+
+def test_macd_matches_batch(prices_df):
+    state = MACDState()
+    values = [state.update(close) for close in prices_df["close"]]
+    macd_line, signal_line = calculate_macd(prices_df)
+    assert_matches(np.array([v[0] for v in values]), macd_line)
+    assert_matches(np.array([v[1] for v in values]), signal_line)
+
+
+@pytest.mark.parametrize("period", [14, 28])
+def test_rsi_matches_batch(prices_df, period):
+    state = RSIState(period)
+    assert_matches(streamed(state.update, prices_df["close"]), calculate_rsi(prices_df, period), rtol=1e-7)
+
+
+def test_atr_matches_batch(prices_df):
+    state = ATRState(14)
+    values = [state.update(h, l, c) for h, l, c in prices_df[["high", "low", "close"]].itertuples(index=False)]
+    assert_matches(np.array(values), calculate_atr(prices_df, 14), rtol=1e-7)
+
+
+def test_adx_matches_batch(prices_df):
+    state = ADXState(14)
+    values = np.array([state.update(h, l, c) for h, l, c in prices_df[["high", "low", "close"]].itertuples(index=False)])
+    expected = calculate_adx(prices_df, 14)
+    assert_matches(values[:, 0], expected["adx"], rtol=1e-7)
+    assert_matches(values[:, 1], expected["+di"], rtol=1e-7)
+    assert_matches(values[:, 2], expected["-di"], rtol=1e-7)
+
+
+def test_returns_match_pct_change(prices_df):
+    state = ReturnsState()
+    assert_matches(streamed(state.update, prices_df["close"]), prices_df["close"].pct_change())
+
+
+@pytest.mark.parametrize("stat", ["sum", "mean", "std", "skew", "kurt"])
+@pytest.mark.parametrize("window", [21, 63, 126])
+def test_rolling_stats_match_pandas_on_returns(prices_df, stat, window):
+    returns = prices_df["close"].pct_change()
+    stats = RollingStats(window)
+    values = [getattr(stats.update(value), stat) for value in returns]
+    assert_matches(np.array(values), getattr(returns.rolling(window), stat)(), rtol=1e-6, atol=1e-9)
+
+
+@pytest.mark.parametrize("stat", ["mean", "std", "skew", "kurt"])
+def test_rolling_stats_stay_precise_on_drifting_prices(stat):
+    # Prices rise a hundredfold, so sums kept around the first values would
+    # lose precision without the periodic rebase
+    close = PRICE_SERIES["trending"]["close"]
+    assert close.iloc[-1] / close.iloc[0] > 100
+    stats = RollingStats(50)
+    values = [getattr(stats.update(value), stat) for value in close]
+    assert_matches(np.array(values), getattr(close.rolling(50), stat)(), rtol=1e-6, atol=1e-9)
+
+
+def test_rolling_stats_skip_windows_with_missing_values():
+    values = [1.0, 2.0, math.nan, 4.0, 5.0, 6.0, 7.0]
+    stats = RollingStats(3)
+    means = [stats.update(value).mean for value in values]
+    assert_matches(np.array(means), pd.Series(values).rolling(3).mean())
+
+
+def stream_features(prices_df, bars, hurst_window):
+    technicals = StreamingTechnicals(hurst_window=hurst_window)
+    for row in prices_df.iloc[:bars].itertuples():
+        technicals.update(row.open, row.high, row.low, row.close, row.volume)
+    return technicals.features()
+
+
+@pytest.mark.parametrize("bars", [5, 60, 127, 250, 400])
+def test_streaming_technicals_match_batch_features(bars):
+    prices_df = PRICE_SERIES["random"]
+    hurst_window = required_history()
+    streamed_features = stream_features(prices_df, bars, hurst_window)
+    indicators = IndicatorEngine(prices_df.iloc[:bars])
+    for name, (features, _, _, _) in STRATEGIES.items():
+        expected = latest_features(features(indicators))
+        if "hurst_exponent" in expected:
+            closes = prices_df["close"].iloc[max(0, bars - hurst_window):bars]
+            expected["hurst_exponent"] = calculate_hurst_exponent(closes)
+        assert expected.keys() == streamed_features[name].keys()
+        for feature, value in expected.items():
+            assert_matches(
+                np.array([streamed_features[name][feature]], dtype=float), [value],
+                rtol=1e-7, atol=1e-9
+            )
+
+
+def test_streamed_features_give_the_batch_strategy_signals():
+    # With exactly one lookback window of bars both paths see the same input
+    bars = required_history()
+    for seed in range(5):
+        prices_df = random_prices(seed, n=bars)
+        streamed_features = stream_features(prices_df, bars, bars)
+        indicators = IndicatorEngine(prices_df)
+        for name in STRATEGIES:
+            expected = evaluate_strategy(name, indicators)
+            actual = evaluate_features(name, streamed_features[name])
+            assert actual.signal == expected.signal
+            assert actual.confidence == pytest.approx(expected.confidence, rel=1e-7)
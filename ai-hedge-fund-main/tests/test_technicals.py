@@ -0,0 +1,220 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from agents.market_data import market_data_agent
+from agents.technicals import (
+    REPORT_NAMES,
+    SIGNAL_LABELS,
+    STRATEGIES,
+    STRATEGY_WARMUP,
+    IndicatorEngine,
+    calculate_obv,
+    latest_features,
+    required_history,
+    signal_history,
+    technical_analyst_agent,
+)
+from backtester import Backtester
+from main import initial_state
+from tools.api import prices_to_df
+
+SAMPLE_DATA = Path(__file__).resolve().parents[1] / "sample_data.json"
+
+
+def random_prices(seed, n=300, flat_share=0.0, nan_volume_share=0.0):
+    """Random-walk OHLCV frame, optionally with unchanged closes and missing volume"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    close = np.round(close, 1)
+    flat = rng.random(n) < flat_share
+    for i in np.flatnonzero(flat)[np.flatnonzero(flat) > 0]:
+        close[i] = close[i - 1]
+    volume = rng.integers(1_000, 1_000_000, n).astype(float)
+    volume[rng.random(n) < nan_volume_share] = np.nan
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "volume": volume,
+        },
+        index=pd.bdate_range("2020-01-01", periods=n, name="Date"),
+    )
+
+
+def loop_obv(prices_df):
+    """The original row-by-row OBV implementation"""
+    obv = [0]
+    for i in range(1, len(prices_df)):
+        if prices_df['close'].iloc[i] > prices_df['close'].iloc[i - 1]:
+            obv.append(obv[-1] + prices_df['volume'].iloc[i])
+        elif prices_df['close'].iloc[i] < prices_df['close'].iloc[i - 1]:
+            obv.append(obv[-1] - prices_df['volume'].iloc[i])
+        else:
+            obv.append(obv[-1])
+    return pd.Series(obv, index=prices_df.index, name='OBV', dtype=float)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_obv_matches_loop_on_random_prices(seed):
+    prices_df = random_prices(seed)
+    pd.testing.assert_series_equal(calculate_obv(prices_df), loop_obv(prices_df))
+
+
+def test_obv_matches_loop_with_flat_days():
+    prices_df = random_prices(7, flat_share=0.3)
+    assert (prices_df['close'].diff() == 0).sum() > 50
+    pd.testing.assert_series_equal(calculate_obv(prices_df), loop_obv(prices_df))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_obv_matches_loop_with_missing_volume(seed):
+    prices_df = random_prices(seed, flat_share=0.3, nan_volume_share=0.05)
+    pd.testing.assert_series_equal(calculate_obv(prices_df), loop_obv(prices_df))
+
+
+def test_obv_ignores_missing_volume_on_unchanged_close():
+    prices_df = random_prices(3, n=5)
+    prices_df['close'] = [10.0, 11.0, 11.0, 10.0, 12.0]
+    prices_df['volume'] = [100.0, 200.0, np.nan, 300.0, 400.0]
+    assert calculate_obv(prices_df).tolist() == [0.0, 200.0, 200.0, -100.0, 300.0]
+
+
+def test_obv_matches_loop_on_sample_data():
+    with open(SAMPLE_DATA) as f:
+        prices_df = prices_to_df(json.load(f)["prices"])
+    pd.testing.assert_series_equal(calculate_obv(prices_df), loop_obv(prices_df))
+
+
+def test_obv_does_not_modify_input():
+    prices_df = random_prices(1)
+    columns = list(prices_df.columns)
+    calculate_obv(prices_df)
+    assert list(prices_df.columns) == columns
+
+
+def nan_features(prices_df, strategies=STRATEGIES):
+    """Names of the features that are NaN on the last bar"""
+    return {
+        f"{name}.{feature}"
+        for name in strategies
+        for feature, value in latest_features(STRATEGIES[name][0](IndicatorEngine(prices_df))).items()
+        if np.isnan(float(value))
+    }
+
+
+def test_required_history_is_the_first_bar_without_nan_features():
+    prices_df = random_prices(0)
+    assert not nan_features(prices_df.iloc[:required_history()])
+    assert nan_features(prices_df.iloc[:required_history() - 1])
+
+
+# The trend features are EWM-based and have values from the first bar
+@pytest.mark.parametrize("name", [name for name in STRATEGIES if name != "trend"])
+def test_strategy_warmup_is_the_first_bar_without_nan_features(name):
+    prices_df = random_prices(1)
+    warmup = STRATEGY_WARMUP[name]
+    assert not nan_features(prices_df.iloc[:warmup], [name])
+    assert nan_features(prices_df.iloc[:warmup - 1], [name])
+
+
+def to_records(prices_df):
+    records = prices_df.reset_index().rename(columns={"Date": "time"})
+    records["time"] = records["time"].dt.strftime("%Y-%m-%d")
+    return records.to_dict("records")
+
+
+def assert_agent_matches_history_row(technical_signal, row):
+    assert technical_signal.signal == SIGNAL_LABELS[int(row["signal"])]
+    assert technical_signal.confidence == pytest.approx(row["confidence"], rel=1e-9)
+    for name in STRATEGIES:
+        component = technical_signal.components[REPORT_NAMES[name]]
+        assert component.signal == SIGNAL_LABELS[int(row[f"{name}_signal"])]
+        assert component.confidence == pytest.approx(row[f"{name}_confidence"], rel=1e-9)
+
+
+def assert_same_hurst_window(technical_signal, prices_df, bar):
+    # The stat-arb signal rarely fires, so compare the Hurst input itself
+    expected = IndicatorEngine(prices_df).rolling_hurst_exponent(required_history()).iloc[bar]
+    metrics = technical_signal.components[REPORT_NAMES["stat_arb"]].metrics
+    assert metrics["hurst_exponent"] == pytest.approx(expected, rel=1e-9)
+
+
+SIGNAL_HISTORY_PRICES = random_prices(7, n=400)
+SIGNAL_HISTORY_BARS = [required_history() - 1, 180, 260, 399]
+
+
+@pytest.mark.parametrize("bar", SIGNAL_HISTORY_BARS)
+def test_signal_history_matches_agent_on_its_input_window(bar):
+    # The agent gets required_history() bars; so does each history row
+    window = SIGNAL_HISTORY_PRICES.iloc[bar + 1 - required_history():bar + 1]
+    state = {"messages": [], "data": {"prices": to_records(window)}, "metadata": {"show_reasoning": False}}
+    technical_signal = technical_analyst_agent(state)["data"]["technical_signal"]
+    history = signal_history(IndicatorEngine(window))
+    assert_agent_matches_history_row(technical_signal, history.iloc[-1])
+    assert_same_hurst_window(technical_signal, SIGNAL_HISTORY_PRICES, bar)
+
+
+def test_signal_history_matches_agent_in_a_backtest():
+    prices = to_records(SIGNAL_HISTORY_PRICES)
+    history = signal_history(IndicatorEngine(SIGNAL_HISTORY_PRICES))
+    backtester = Backtester(
+        agent=None, ticker="TEST", start_date=None, end_date=None,
+        initial_capital=100000, verbose=False,
+        manual_data={"prices": prices, "financial_metrics": {}, "insider_trades": [], "market_cap": 0}
+    )
+    # The same inputs Backtester.decide hands to the graph
+    for bar in SIGNAL_HISTORY_BARS:
+        current_date = SIGNAL_HISTORY_PRICES.index[bar]
+        manual_data = backtester.manual_data.replace(
+            technical_features=backtester.technical_features(current_date)
+        )
+        state = initial_state(
+            "TEST", backtester.lookback_start(current_date), current_date.strftime("%Y-%m-%d"),
+            backtester.portfolio, manual_data
+        )
+        state["data"].update(market_data_agent(state)["data"])
+        technical_signal = technical_analyst_agent(state)["data"]["technical_signal"]
+        assert_agent_matches_history_row(technical_signal, history.loc[current_date])
+        assert_same_hurst_window(technical_signal, SIGNAL_HISTORY_PRICES, bar)
+
+
+def run_technical_analyst(start_date, end_date, manual_data):
+    state = initial_state("TEST", start_date, end_date, {"cash": 100000, "stock": 0}, manual_data)
+    state["data"].update(market_data_agent(state)["data"])
+    return technical_analyst_agent(state)["data"]["technical_signal"]
+
+
+def test_live_and_backtest_technical_signals_agree():
+    manual_data = {
+        "prices": to_records(SIGNAL_HISTORY_PRICES),
+        "financial_metrics": {}, "insider_trades": [], "market_cap": 0,
+    }
+    backtester = Backtester(
+        agent=None, ticker="TEST", start_date=None, end_date=None,
+        initial_capital=100000, verbose=False, manual_data=manual_data
+    )
+    for bar in SIGNAL_HISTORY_BARS:
+        current_date = SIGNAL_HISTORY_PRICES.index[bar]
+        end_date = current_date.strftime("%Y-%m-%d")
+        # A live run hands the graph the raw data; a backtest its streamed features
+        live = run_technical_analyst(None, end_date, manual_data)
+        backtest = run_technical_analyst(
+            backtester.lookback_start(current_date), end_date,
+            backtester.manual_data.replace(technical_features=backtester.technical_features(current_date))
+        )
+        assert live == backtest
+
+    # Seeded on the last required_history() bars only, ADX comes out differently
+    window = SIGNAL_HISTORY_PRICES.iloc[-required_history():]
+    state = {"messages": [], "data": {"prices": to_records(window)}, "metadata": {"show_reasoning": False}}
+    windowed = technical_analyst_agent(state)["data"]["technical_signal"]
+    trend = REPORT_NAMES["trend"]
+    assert windowed.components[trend].metrics["adx"] != pytest.approx(
+        live.components[trend].metrics["adx"], rel=1e-9
+    )
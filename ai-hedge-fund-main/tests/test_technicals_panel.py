@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from agents.technicals import REPORT_NAMES, STRATEGIES, calculate_obv, technical_analyst_agent
+from agents.technicals_panel import (
+    PanelIndicatorEngine,
+    align_to_last_bar,
+    calculate_panel_signals,
+    prices_to_panel,
+)
+from tools.api import prices_to_df
+
+
+def random_price_records(seed, n, end="2024-06-28", gap_share=0.0):
+    """Daily bars ending on `end`, with a share of the business days missing"""
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range(end=end, periods=n)
+    if gap_share:
+        keep = rng.random(n) >= gap_share
+        keep[-1] = True
+        days = days[keep]
+    n = len(days)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.002 * (seed - 3), 0.02, n)))
+    high = close * (1 + rng.uniform(0, 0.02, n))
+    low = close * (1 - rng.uniform(0, 0.02, n))
+    volume = rng.integers(100_000, 1_000_000, n)
+    return [
+        {"time": day.strftime("%Y-%m-%d"), "open": float(c), "high": float(h),
+         "low": float(lo), "close": float(c), "volume": int(v)}
+        for day, c, h, lo, v in zip(days, close, high, low, volume)
+    ]
+
+
+# Tickers of different lengths, several with dates the others have
+PRICES_BY_TICKER = {
+    "FULL": random_price_records(0, 400),
+    "SHORT": random_price_records(1, 90),
+    "GAPPY": random_price_records(2, 400, gap_share=0.1),
+    "SPARSE": random_price_records(3, 500, gap_share=0.4),
+    "STALE": random_price_records(4, 300, end="2024-05-31", gap_share=0.05),
+}
+
+
+@pytest.fixture(scope="module")
+def panel_table():
+    return calculate_panel_signals(prices_to_panel(PRICES_BY_TICKER))
+
+
+def agent_signal(prices):
+    state = {"messages": [], "data": {"prices": prices}, "metadata": {"show_reasoning": False}}
+    return technical_analyst_agent(state)["data"]["technical_signal"]
+
+
+@pytest.mark.parametrize("ticker", sorted(PRICES_BY_TICKER))
+def test_panel_matches_single_ticker_agent(panel_table, ticker):
+    expected = agent_signal(PRICES_BY_TICKER[ticker])
+    row = panel_table.loc[ticker]
+
+    assert row["signal"] == expected.signal
+    assert row["confidence"] == pytest.approx(expected.confidence, rel=1e-9)
+    for name in STRATEGIES:
+        component = expected.components[REPORT_NAMES[name]]
+        assert row[f"{name}_signal"] == component.signal
+        assert row[f"{name}_confidence"] == pytest.approx(component.confidence, rel=1e-9)
+        for metric, value in component.metrics.items():
+            assert row[metric] == pytest.approx(value, rel=1e-8, nan_ok=True)
+
+
+def test_panel_has_union_of_dates_with_gaps():
+    panel = prices_to_panel(PRICES_BY_TICKER)
+    # The gapped tickers really are missing dates inside their history
+    for ticker in ("GAPPY", "SPARSE"):
+        close = panel["close"][ticker]
+        first = close.first_valid_index()
+        assert close.loc[first:].isna().any()
+
+
+def test_aligned_panel_holds_each_ticker_on_its_own_bars():
+    aligned = align_to_last_bar(prices_to_panel(PRICES_BY_TICKER))
+    for ticker, prices in PRICES_BY_TICKER.items():
+        expected = prices_to_df(prices)["close"].to_numpy()
+        column = aligned["close"][ticker].to_numpy()
+        assert np.isnan(column[:len(column) - len(expected)]).all()
+        np.testing.assert_array_equal(column[len(column) - len(expected):], expected)
+
+
+def test_panel_obv_matches_calculate_obv():
+    obv = PanelIndicatorEngine(prices_to_panel(PRICES_BY_TICKER)).obv()
+    for ticker, prices in PRICES_BY_TICKER.items():
+        expected = calculate_obv(prices_to_df(prices)).to_numpy()
+        np.testing.assert_allclose(obv[ticker].to_numpy()[-len(expected):], expected)
+
+
+def test_panel_weights_default_and_override():
+    panel = prices_to_panel(PRICES_BY_TICKER)
+    default = calculate_panel_signals(panel)
+    trend_only = calculate_panel_signals(
+        panel, weights={name: float(name == "trend") for name in STRATEGIES}
+    )
+    pd.testing.assert_frame_equal(default, calculate_panel_signals(panel, weights=None))
+    # With all the weight on one strategy the overall signal is that strategy's
+    assert trend_only["signal"].equals(trend_only["trend_signal"].rename("signal"))